@@ -1,9 +1,13 @@
 # app.py
 import streamlit as st
 import os
-from modules.curate import curate_articles
-from modules.scoring import run_scoring
-from modules.generator import generate_newsletter
+import time
+
+# The pipeline modules (HTTP, feed parsing, Gemini, Jinja) are imported
+# where they're first used, so the page paints before they load.
+
+# Curated + scored articles are reused for this long (one time bucket)
+ARTICLES_TTL = int(os.getenv("APP_ARTICLES_TTL", 15 * 60))
 
 
 # -----------------------------------------------------
@@ -16,6 +20,52 @@ st.set_page_config(
 )
 
 
+# Compile every template once per server process (not per rerun)
+@st.cache_resource
+def warm_templates():
+    from modules.generator import precompile_templates
+    return precompile_templates()
+
+
+# -----------------------------------------------------
+# Cached pipeline stages
+# -----------------------------------------------------
+# Keyed by feed set + time bucket: clicks within the same bucket reuse
+# the curated articles; a new bucket (or Refresh) curates again.
+@st.cache_data(show_spinner=False, max_entries=4)
+def load_articles(feeds, bucket):
+    from modules.curate import curate_articles
+    from modules.scoring import run_scoring
+
+    items = run_scoring(curate_articles(feeds=list(feeds)))
+    return {"items": items, "fetched_at": time.time()}
+
+
+# Summaries depend on tone / length / selection, not on the template,
+# so switching templates only re-renders.
+@st.cache_data(show_spinner=False, max_entries=32)
+def load_sections(feeds, bucket, category, tone, length, top_n):
+    from modules.generator import build_sections
+
+    items = load_articles(feeds, bucket)["items"]
+
+    if category != "All":
+        items = [a for a in items if a.get("category") == category]
+
+    if not items:
+        return None
+
+    return build_sections(items, tone=tone, length=length, top_n=top_n)
+
+
+def format_age(seconds):
+    if seconds < 60:
+        return "just now"
+    if seconds < 3600:
+        return f"{int(seconds // 60)} min ago"
+    return f"{seconds / 3600:.1f} h ago"
+
+
 # -----------------------------------------------------
 # Sidebar Controls
 # -----------------------------------------------------
@@ -47,8 +97,29 @@ top_n = st.sidebar.slider(
     5, 20, 10
 )
 
+stream_mode = st.sidebar.checkbox(
+    "Show sections as they finish",
+    value=False,
+    help="Streams articles through scraping, scoring and summarizing; "
+         "takes the first matching articles instead of the global top-N."
+)
+
 generate_btn = st.sidebar.button("🚀 Generate Newsletter")
 
+refresh_btn = st.sidebar.button(
+    "🔄 Refresh articles",
+    help="Fetch feeds again instead of reusing the cached articles."
+)
+
+if refresh_btn:
+    load_articles.clear()
+    load_sections.clear()
+
+# Once generated, setting changes re-render from the caches without
+# another click
+if generate_btn or refresh_btn:
+    st.session_state["generated"] = True
+
 
 # -----------------------------------------------------
 # Main Page Header
@@ -56,43 +127,83 @@ generate_btn = st.sidebar.button("🚀 Generate Newsletter")
 st.title("📰 AI-Powered Newsletter Generator")
 st.write("Generate professional newsletters in seconds using AI.")
 
+warm_templates()
+
 
 # -----------------------------------------------------
 # Trigger Only When Button Is Clicked
 # -----------------------------------------------------
-if generate_btn:
+if generate_btn and stream_mode:
+    from modules.pipeline import stream_newsletter
 
-    with st.spinner("Collecting and processing articles..."):
+    # -------------------------------------------------
+    # Streaming mode: re-render the preview per article
+    # -------------------------------------------------
+    st.subheader("📄 Newsletter Preview")
+    preview = st.empty()
+    html = None
 
-        # Step 1 – Curate
-        items = curate_articles()
+    with st.spinner("Streaming articles..."):
+        for html in stream_newsletter(
+            template_name=template,
+            tone=tone,
+            length=length,
+            top_n=top_n,
+            category=None if selected_category == "All" else selected_category
+        ):
+            with preview.container():
+                st.components.v1.html(html, height=900, scrolling=True)
+
+    if html is None:
+        st.error(f"No articles found for category: {selected_category}")
+        st.stop()
 
-        # Step 2 – Score
-        scored_items = run_scoring(items)
+    os.makedirs("output", exist_ok=True)
+    with open("output/newsletter_ui.html", "w", encoding="utf-8") as f:
+        f.write(html)
 
-        # ⭐ NEW — Apply category filter
-        if selected_category != "All":
-            scored_items = [a for a in scored_items if a.get("category") == selected_category]
+    st.success("Newsletter generated successfully!")
+
+    st.download_button(
+        label="📥 Download Newsletter HTML",
+        data=html,
+        file_name="newsletter.html",
+        mime="text/html"
+    )
+
+elif st.session_state.get("generated") and not stream_mode:
+    from modules.curate import DEFAULT_FEEDS
+    from modules.generator import render_newsletter
+
+    feeds = tuple(DEFAULT_FEEDS)
+    bucket = int(time.time() // ARTICLES_TTL)
+
+    with st.spinner("Collecting and processing articles..."):
+
+        # Steps 1–2 – Curate + Score (cached per feed set / time bucket)
+        fetched_at = load_articles(feeds, bucket)["fetched_at"]
+
+        # Step 3 – Summarize + group (cached per tone / length / selection)
+        sections = load_sections(feeds, bucket, selected_category, tone, length, top_n)
 
         # If nothing matches, show message
-        if len(scored_items) == 0:
+        if sections is None:
             st.error(f"No articles found for category: {selected_category}")
             st.stop()
 
-        # Step 3 – Generate Newsletter
-        html = generate_newsletter(
-            scored_items,
-            template_name=template,
-            tone=tone,
-            length=length,
-            top_n=top_n
-        )
+        # Step 4 – Render (cheap, so never cached)
+        html = render_newsletter(sections, template, tone, length)
 
         # Save a copy to output folder
         os.makedirs("output", exist_ok=True)
         with open("output/newsletter_ui.html", "w", encoding="utf-8") as f:
             f.write(html)
 
+    st.caption(
+        f"Articles fetched {format_age(time.time() - fetched_at)} · "
+        f"refreshed every {ARTICLES_TTL // 60} min or with 🔄 Refresh articles"
+    )
+
     st.success("Newsletter generated successfully!")
 
     # -------------------------------------------------
@@ -0,0 +1,106 @@
+# benchmarks/bench_archive.py
+"""
+"Did we already cover this?" against an archive of past newsletters:
+rescanning the saved output/*.html files vs the FTS5 archive index.
+
+Builds --issues newsletters of --per-issue synthetic articles, renders
+each to HTML in a temp folder and adds it to a throwaway ArchiveIndex
+(timing the incremental per-issue update), then checks --lookups
+candidate articles (half of them covered) both ways and times a few
+full-text searches.
+
+    python -m benchmarks.bench_archive --issues 1000 --per-issue 10
+"""
+
+import argparse
+import glob
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.corpus import _paragraph, _sentence
+from modules.archive_index import ArchiveIndex
+from modules.article import Article
+from modules.generator import group_sections, render_newsletter
+
+QUERIES = ["market", "launch model", "security breach", "quarterly earnings growth"]
+
+
+def make_article(rng: random.Random, n: int) -> Article:
+    # The corpus vocabulary is small; a few made-up names keep
+    # unrelated titles from looking like the same story
+    names = " ".join(f"x{rng.getrandbits(24):06x}" for _ in range(3))
+    link = f"https://site{n % 40}.example.com/article/{n}"
+    return Article(
+        title=f"{_sentence(rng, 5)[:-1]} {names}",
+        link=link,
+        rss_url=link,
+        content=" ".join(_paragraph(rng) for _ in range(3)),
+        summary=_paragraph(rng)[:200],
+        ai_summary="• " + _sentence(rng, 14),
+        category=rng.choice(["AI", "Tech", "Finance", "Business"]),
+        score=round(rng.uniform(0, 5), 2),
+    )
+
+
+def html_covered(folder: str, link: str) -> bool:
+    for path in glob.glob(os.path.join(folder, "*.html")):
+        with open(path, "r", encoding="utf-8") as f:
+            if link in f.read():
+                return True
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--issues", type=int, default=1000)
+    parser.add_argument("--per-issue", type=int, default=10)
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    folder = tempfile.mkdtemp(prefix="newsletter-archive-")
+    index = ArchiveIndex(os.path.join(folder, "archive.sqlite3"))
+
+    archived, add_time = [], 0.0
+    for issue in range(args.issues):
+        articles = [make_article(rng, issue * args.per_issue + i) for i in range(args.per_issue)]
+        html = render_newsletter(group_sections(articles, [a["ai_summary"] for a in articles]))
+        path = os.path.join(folder, f"newsletter-{issue:05d}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(html)
+
+        t0 = time.perf_counter()
+        index.add_newsletter(articles, path=path)
+        add_time += time.perf_counter() - t0
+        archived.extend(articles)
+
+    html_mb = sum(os.path.getsize(p) for p in glob.glob(os.path.join(folder, "*.html"))) / 1e6
+    print(f"{args.issues} newsletters, {len(archived)} articles, {html_mb:.1f} MB of HTML")
+    print(f"index update     {add_time / args.issues * 1000:8.2f} ms / newsletter")
+
+    # Half already covered, half new
+    lookups = [rng.choice(archived) for _ in range(args.lookups // 2)]
+    lookups += [make_article(rng, 10 ** 9 + i) for i in range(args.lookups - len(lookups))]
+
+    t0 = time.perf_counter()
+    scan_hits = sum(html_covered(folder, a["link"]) for a in lookups)
+    scan = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    index_hits = sum(index.covered(a, days=3650) for a in lookups)
+    indexed = time.perf_counter() - t0
+
+    print(f"rescan HTML      {scan / len(lookups) * 1000:8.2f} ms / lookup  ({scan_hits} covered)")
+    print(f"index covered()  {indexed / len(lookups) * 1000:8.2f} ms / lookup  ({index_hits} covered)"
+          f"  speedup {scan / indexed:6.0f}x")
+
+    for query in QUERIES:
+        t0 = time.perf_counter()
+        hits = index.search(query, limit=20)
+        print(f"search {query!r:<28} {(time.perf_counter() - t0) * 1000:7.2f} ms  {len(hits)} hits")
+
+
+if __name__ == "__main__":
+    main()
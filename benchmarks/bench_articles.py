@@ -0,0 +1,133 @@
+# benchmarks/bench_articles.py
+"""
+Memory and time for 10k articles as plain dicts vs Article records.
+
+Records are decoded from JSON rows the way ArticleStore loads them
+(separate strings per row for URLs, text and category), then go
+through the in-memory stages: finalize_item, run_scoring, the
+exact-duplicate keys and a top-N newsletter with a zero-latency
+FakeGeminiWrapper. Reports the memory the records hold after loading,
+the tracemalloc peak over the whole run, and time per stage.
+
+    python -m benchmarks.bench_articles --articles 10000
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+os.environ.setdefault("NEWSLETTER_CACHE_DIR", tempfile.mkdtemp(prefix="newsletter-bench-"))
+os.environ["GEMINI_RPM"] = "0"
+os.environ["GEMINI_TPM"] = "0"
+
+from benchmarks.corpus import FEED_EPOCH, _paragraph, _sentence
+from benchmarks.fake_llm import FakeGeminiWrapper
+from modules.article_store import ArticleStore
+from modules.curate import dedup_key, finalize_item
+from modules.generator import generate_newsletter, precompile_templates
+from modules.scoring import run_scoring
+from modules.summary import get_summary_cache
+
+CATEGORIES = ["Technology", "Business", "Science", "Markets", "General"]
+FEEDS = [f"https://feeds.example.com/{i}/rss" for i in range(50)]
+
+
+def build_rows(count: int, seed: int = 11):
+    """
+    JSON rows like ArticleStore's; half the items have no full text,
+    so content repeats the summary (the RSS fallback).
+    """
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        link = f"https://site{i % 40}.example.com/article/{i}"
+        summary = _paragraph(rng)[:300]
+        content = summary if i % 2 else " ".join(_paragraph(rng) for _ in range(4))
+        rows.append(json.dumps({
+            "title": f"{_sentence(rng, 9)[:-1]} ({i})",
+            "link": link,
+            "rss_url": link,
+            "scraped_url": link,
+            "published": (FEED_EPOCH - timedelta(minutes=rng.randint(0, 72 * 60))).replace(tzinfo=None).isoformat(),
+            "summary": summary,
+            "content": content,
+            "category": rng.choice(CATEGORIES),
+            "source": rng.choice(FEEDS),
+            "score": 0.0,
+            "ai_summary": None,
+        }))
+    return rows
+
+
+def decode_dict(row: str) -> dict:
+    # ArticleStore._decode before Article records
+    item = json.loads(row)
+    item["published"] = datetime.fromisoformat(item["published"])
+    return item
+
+
+def run(rows, decode, top_n: int) -> dict:
+    llm = FakeGeminiWrapper(latency=0, jitter=0)
+    get_summary_cache().clear()
+    times = {}
+
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    items = [decode(row) for row in rows]
+    times["load"] = time.perf_counter() - t0
+    held = tracemalloc.get_traced_memory()[0]
+
+    t0 = time.perf_counter()
+    for item in items:
+        finalize_item(item, item.get("content"))
+    times["finalize"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    run_scoring(items)
+    times["scoring"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    keys = {dedup_key(item) for item in items}
+    times["dedup_keys"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    generate_newsletter(items, top_n=top_n, llm=llm)
+    times["newsletter"] = time.perf_counter() - t0
+
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {"held": held, "peak": peak, "times": times, "total": sum(times.values()), "keys": len(keys)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=10_000)
+    parser.add_argument("--top-n", type=int, default=10)
+    args = parser.parse_args()
+
+    rows = build_rows(args.articles)
+    print(f"{len(rows)} articles, {sum(len(r) for r in rows) / 1e6:.1f} MB of JSON")
+
+    # Warm-up: templates, scoring matcher, NumPy
+    precompile_templates()
+    run(rows[:300], ArticleStore._decode, args.top_n)
+
+    baseline = None
+    for label, decode in (("dict", decode_dict), ("Article", ArticleStore._decode)):
+        r = run(rows, decode, args.top_n)
+        baseline = baseline or r
+        stages = "  ".join(f"{k}={v * 1000:.0f}ms" for k, v in r["times"].items())
+        print(
+            f"{label:<8} held {r['held'] / 1e6:6.1f} MB ({r['held'] / baseline['held']:4.0%})  "
+            f"peak {r['peak'] / 1e6:6.1f} MB  total {r['total'] * 1000:6.0f} ms  {stages}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# benchmarks/bench_compress.py
+"""
+Prompt tokens and wall time per newsletter: first-N-characters
+truncation vs extractive pre-compression at a few token budgets.
+
+Articles are the extracted text of the recorded HTML corpus (or your
+own saved pages with --corpus); the LLM is FakeGeminiWrapper with a
+per-request latency plus a per-1k-prompt-token cost, so shorter
+prompts show up as lower latency the way they do against Gemini.
+
+    python -m benchmarks.bench_compress --articles 10 --budgets 0 200 350 600
+"""
+
+import argparse
+import os
+import time
+
+# No quota limits for the fake client
+os.environ["GEMINI_RPM"] = "0"
+os.environ["GEMINI_TPM"] = "0"
+
+from benchmarks.corpus import load_html_corpus
+from benchmarks.fake_llm import FakeGeminiWrapper
+from modules import summary
+from modules.compress import estimate_tokens
+from modules.web_scraper import extract_article_text
+
+
+def load_articles(count: int, corpus_dir: str = None):
+    texts = [
+        (name, text) for name, text in
+        ((name, extract_article_text(html)) for name, html in load_html_corpus(corpus_dir))
+        if text
+    ]
+    return [
+        {"title": f"{texts[i % len(texts)][0]} {i}", "content": texts[i % len(texts)][1]}
+        for i in range(count)
+    ]
+
+
+def run(articles, budget: int, args) -> dict:
+    summary.CONTENT_TOKEN_BUDGET = budget
+    summary.prompt_content.cache_clear()
+    llm = FakeGeminiWrapper(latency=args.llm_latency, per_1k_tokens=args.per_1k_tokens)
+
+    t0 = time.perf_counter()
+    texts = [summary.prompt_content(a["content"], a["title"]) for a in articles]
+    prep = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    summary.summarize_articles(articles, llm=llm, batch=args.batch, use_cache=False)
+    wall = time.perf_counter() - t0
+
+    return {
+        "content_tokens": sum(estimate_tokens(t) for t in texts),
+        "prompt_tokens": llm.prompt_chars // summary.CHARS_PER_TOKEN,
+        "prep_ms": prep * 1000,
+        "wall": wall,
+        "calls": llm.calls,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=10, help="articles per newsletter")
+    parser.add_argument("--budgets", type=int, nargs="+", default=[0, 200, 350, 600],
+                        help="content token budgets (0 = truncate to MAX_CONTENT_CHARS)")
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--per-1k-tokens", type=float, default=0.4, help="fake LLM seconds per 1k prompt tokens")
+    parser.add_argument("--batch", action="store_true")
+    parser.add_argument("--corpus", default=None, help="folder of saved article pages")
+    args = parser.parse_args()
+
+    articles = load_articles(args.articles, args.corpus)
+    print(f"{len(articles)} articles, source text {sum(estimate_tokens(a['content']) for a in articles)} tokens")
+
+    baseline = None
+    for budget in args.budgets:
+        r = run(articles, budget, args)
+        baseline = baseline or r
+        label = "truncate" if budget <= 0 else f"budget={budget}"
+        print(
+            f"{label:<12} content={r['content_tokens']:6d} tok  prompts={r['prompt_tokens']:6d} tok "
+            f"({r['prompt_tokens'] / baseline['prompt_tokens']:4.0%})  prep={r['prep_ms']:6.1f}ms  "
+            f"wall={r['wall']:5.2f}s  calls={r['calls']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
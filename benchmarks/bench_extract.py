@@ -0,0 +1,65 @@
+# benchmarks/bench_extract.py
+"""
+Article text extraction: BeautifulSoup full tree vs streaming extractor.
+
+Reports parse time (median of --repeat runs) and peak traced memory
+per page of the recorded HTML corpus.
+
+    python -m benchmarks.bench_extract
+    python -m benchmarks.bench_extract --corpus path/to/saved/pages
+"""
+
+import argparse
+import statistics
+import time
+import tracemalloc
+
+from benchmarks.corpus import load_html_corpus
+from modules.web_scraper import extract_article_text, extract_article_text_soup
+
+
+def measure(fn, html: str, repeat: int):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(html)
+        times.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    fn(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return statistics.median(times), peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", default=None, help="folder of saved .html pages")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = load_html_corpus(args.corpus)
+
+    print(f"{'page':<16}{'size':>9}  {'soup ms':>9}{'fast ms':>9}{'speedup':>9}  {'soup peak':>10}{'fast peak':>10}  same")
+    totals = [0.0, 0.0]
+
+    for name, html in corpus:
+        soup_t, soup_mem, soup_text = measure(extract_article_text_soup, html, args.repeat)
+        fast_t, fast_mem, fast_text = measure(extract_article_text, html, args.repeat)
+        totals[0] += soup_t
+        totals[1] += fast_t
+
+        # the fast path joins inline tags with spaces ("<b>x</b>y" -> "x y")
+        same = soup_text.split() == fast_text.split() or soup_text.replace(" ", "") == fast_text.replace(" ", "")
+
+        print(
+            f"{name:<16}{len(html) / 1024:>8.0f}K  {soup_t * 1000:>9.1f}{fast_t * 1000:>9.1f}"
+            f"{soup_t / fast_t:>8.1f}x  {soup_mem / 1024:>9.0f}K{fast_mem / 1024:>9.0f}K  {'yes' if same else 'NO'}"
+        )
+
+    print(f"{'total':<16}{'':>9}  {totals[0] * 1000:>9.1f}{totals[1] * 1000:>9.1f}{totals[0] / totals[1]:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# benchmarks/bench_feed_stream.py
+"""
+Time and peak memory to pull the newest items out of one large feed:
+feedparser on the whole document vs the streaming reader, which stops
+once it has max_items entries (or hits already-seen ones).
+
+The feed is a synthetic RSS archive (benchmarks.corpus.make_feed), fed
+to both readers in CHUNK_SIZE pieces the way http_client.iter_body
+delivers them.
+
+    python -m benchmarks.bench_feed_stream --entries 10000 --max-items 8
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from datetime import timedelta
+
+from benchmarks.corpus import FEED_EPOCH, make_feed
+from modules.feed_stream import parse_feed_stream
+from modules.http_client import CHUNK_SIZE
+from modules.rss_ingest import parse_feed_bytes
+
+
+def build_feed(entries: int) -> bytes:
+    xml = make_feed(random.Random(7), 0, entries).replace("__BASE__", "http://127.0.0.1")
+    return xml.encode("utf-8")
+
+
+def chunks(body: bytes):
+    for i in range(0, len(body), CHUNK_SIZE):
+        yield body[i:i + CHUNK_SIZE]
+
+
+def measure(fn, repeat: int):
+    fn()    # warm-up (imports, regex compilation)
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=10_000)
+    parser.add_argument("--max-items", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    body = build_feed(args.entries)
+    print(f"{args.entries} entries, {len(body) / 1e6:.1f} MB, max_items={args.max_items}")
+
+    # make_feed dates are random; treat everything older than the
+    # newest few hours as already seen
+    newer_than = (FEED_EPOCH - timedelta(hours=1)).replace(tzinfo=None)
+
+    runs = [
+        ("feedparser", lambda: parse_feed_bytes(body, {}, args.max_items)),
+        ("stream", lambda: parse_feed_stream(chunks(body), args.max_items)),
+        ("stream+seen", lambda: parse_feed_stream(chunks(body), args.max_items, newer_than)),
+    ]
+
+    baseline = None
+    for label, fn in runs:
+        items, elapsed, peak = measure(fn, args.repeat)
+        baseline = baseline or elapsed
+        print(
+            f"{label:<12} {elapsed * 1000:8.1f} ms  peak {peak / 1e6:6.1f} MB  "
+            f"items={len(items):<3} speedup {baseline / elapsed:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
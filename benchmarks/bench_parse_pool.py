@@ -0,0 +1,83 @@
+# benchmarks/bench_parse_pool.py
+"""
+Parse throughput vs worker processes on the recorded corpus.
+
+Each page (or feed) is sent to the pool as raw bytes and only the
+extracted text (or normalized items) comes back, exactly as the
+scraper / feed fetcher do with PARSE_WORKERS set. workers=1 is the
+in-process baseline.
+
+    python -m benchmarks.bench_parse_pool --pages 600 --workers 1 2 4 8
+    python -m benchmarks.bench_parse_pool --kind rss
+    SCRAPER_EXTRACTOR=soup python -m benchmarks.bench_parse_pool
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.corpus import build_feed_corpus, load_html_corpus
+from modules.parse_pool import map_parse
+from modules.rss_ingest import parse_feed_bytes
+from modules.web_scraper import EXTRACTOR, extract_article_bytes
+
+
+def html_jobs(pages: int, corpus_dir: str = None):
+    corpus = [html.encode("utf-8") for _, html in load_html_corpus(corpus_dir)]
+    return extract_article_bytes, [(corpus[i % len(corpus)], "utf-8") for i in range(pages)]
+
+
+def rss_jobs(feeds: int, items: int = 50):
+    corpus = build_feed_corpus(min(feeds, 50), items)
+    docs = [xml.replace("__BASE__", "http://127.0.0.1").encode("utf-8") for xml in corpus.values()]
+    return parse_feed_bytes, [(docs[i % len(docs)], {}, items) for i in range(feeds)]
+
+
+def run(fn, jobs, workers: int) -> float:
+    if workers <= 1:
+        t0 = time.perf_counter()
+        [fn(*job) for job in jobs]
+        return time.perf_counter() - t0
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Start the workers (and their imports) before timing
+        map_parse(fn, jobs[:workers], pool=pool, workers=workers)
+        t0 = time.perf_counter()
+        map_parse(fn, jobs, pool=pool, workers=workers)
+        return time.perf_counter() - t0
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    default_workers = sorted({1, 2, 4, cpus} | ({8} if cpus >= 8 else set()))
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--kind", choices=["html", "rss"], default="html")
+    parser.add_argument("--pages", type=int, default=600, help="documents to parse")
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers)
+    parser.add_argument("--corpus", default=None, help="folder of saved HTML pages")
+    args = parser.parse_args()
+
+    if args.kind == "html":
+        fn, jobs = html_jobs(args.pages, args.corpus)
+        label = f"html pages (extractor={EXTRACTOR})"
+    else:
+        fn, jobs = rss_jobs(args.pages)
+        label = "rss feeds"
+
+    mb = sum(len(job[0]) for job in jobs) / 1e6
+    print(f"{len(jobs)} {label}, {mb:.1f} MB, {cpus} CPU(s)")
+
+    baseline = None
+    for workers in args.workers:
+        elapsed = run(fn, jobs, workers)
+        baseline = baseline or elapsed
+        print(
+            f"workers={workers:<3} {elapsed:7.2f}s  {len(jobs) / elapsed:8.1f} docs/s  "
+            f"{mb / elapsed:6.1f} MB/s  speedup {baseline / elapsed:4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+# benchmarks/bench_pipeline.py
+"""
+End-to-end benchmark: curate -> run_scoring -> generate_newsletter,
+fully offline.
+
+Recorded RSS fixtures and synthetic article pages are served by local
+stub servers (one per "site", with a fixed network delay), and the LLM
+is FakeGeminiWrapper with a configurable latency. Each size runs with
+cold caches in a throwaway cache dir and reports wall time, per-stage
+time (from METRICS) and peak Python memory (tracemalloc).
+
+    python -m benchmarks.bench_pipeline --sizes 10 100 1000 --out results.json
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Must be set before the modules read them at import time: throwaway
+# caches, no real quota limits (the fake LLM has no quota), no NewsAPI
+CACHE_ROOT = tempfile.mkdtemp(prefix="newsletter-bench-")
+os.environ["NEWSLETTER_CACHE_DIR"] = CACHE_ROOT
+os.environ["GEMINI_RPM"] = "0"
+os.environ["GEMINI_TPM"] = "0"
+os.environ["NEWSAPI_KEY"] = ""
+
+from benchmarks.corpus import build_feed_corpus, load_html_corpus
+from benchmarks.fake_llm import FakeGeminiWrapper
+from benchmarks.stub_server import base_url, start_servers, stop_servers
+from modules.curate import curate_articles
+from modules.dedup import NearDuplicateIndex
+from modules.generator import generate_newsletter, precompile_templates
+from modules.http_client import get_session
+from modules.metrics import METRICS
+from modules.scoring import run_scoring
+from modules.summary import get_summary_cache
+from modules.web_scraper import get_scrape_cache
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ITEMS_PER_FEED = 8   # fetch_multiple_feeds default per-feed cap
+
+
+def stage_times() -> dict:
+    """
+    {stage: {count, total, mean, max}} from the stage_seconds histograms.
+    """
+    stages = {}
+    for h in METRICS.to_dict()["histograms"]:
+        if h["name"] == "stage_seconds":
+            stages[h["labels"].get("stage", "?")] = {
+                "count": h["count"],
+                "total": round(h["sum"], 4),
+                "mean": round(h["mean"], 4),
+                "max": round(h["max"] or 0.0, 4),
+            }
+    return stages
+
+
+def counter_totals() -> dict:
+    totals = {}
+    for c in METRICS.to_dict()["counters"]:
+        totals[c["name"]] = totals.get(c["name"], 0) + c["value"]
+    return totals
+
+
+def run_size(size: int, args, servers, pages) -> dict:
+    feeds_needed = math.ceil(size / ITEMS_PER_FEED)
+    feed_xml = build_feed_corpus(feeds_needed, ITEMS_PER_FEED)
+
+    # Re-point the stub servers at this size's feeds
+    names = list(feed_xml)
+    for srv in servers:
+        srv.RequestHandlerClass.feeds = feed_xml
+    feed_urls = [
+        f"{base_url(servers[i % len(servers)])}/feed/{name}" for i, name in enumerate(names)
+    ]
+
+    get_scrape_cache().clear()
+    get_summary_cache().clear()
+    METRICS.reset()
+    llm = FakeGeminiWrapper(latency=args.llm_latency, jitter=args.llm_jitter)
+
+    if args.trace_memory:
+        tracemalloc.start()
+
+    t0 = time.perf_counter()
+    items = curate_articles(feeds=feed_urls, max_items=size, scrape_deadline=args.scrape_deadline)
+    items = run_scoring(items)
+    html = generate_newsletter(
+        items,
+        top_n=min(size, args.top_n) if args.top_n else size,
+        batch=args.batch,
+        llm=llm,
+    )
+    wall = time.perf_counter() - t0
+
+    peak = None
+    if args.trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "articles": size,
+        "curated": len(items),
+        "feeds": feeds_needed,
+        "wall_seconds": round(wall, 4),
+        "peak_traced_bytes": peak,
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None,
+        "html_bytes": len(html.encode("utf-8")),
+        "llm_calls": llm.calls,
+        "llm_prompt_chars": llm.prompt_chars,
+        "stages": stage_times(),
+        "counters": counter_totals(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--hosts", type=int, default=8)
+    parser.add_argument("--net-delay", type=float, default=0.05, help="stub server delay per request (s)")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="fake LLM seconds per request")
+    parser.add_argument("--llm-jitter", type=float, default=0.1)
+    parser.add_argument("--top-n", type=int, default=0, help="articles to summarize (0 = all)")
+    parser.add_argument("--batch", action="store_true", help="batched LLM requests")
+    parser.add_argument("--scrape-deadline", type=float, default=600.0)
+    parser.add_argument("--no-trace-memory", dest="trace_memory", action="store_false",
+                        help="skip tracemalloc (it slows Python-heavy stages down)")
+    parser.add_argument("--corpus", default=None, help="folder of saved article pages")
+    parser.add_argument("--out", default=None, help="write JSON results here")
+    args = parser.parse_args()
+
+    pages = [html.encode("utf-8") for _, html in load_html_corpus(args.corpus)]
+    servers = start_servers(args.hosts, args.net_delay, pages, feeds={})
+
+    # The modules import their heavy dependencies on first use; load
+    # them here so the first size isn't charged for it
+    import feedparser  # noqa: F401
+    get_session()
+    precompile_templates()
+    NearDuplicateIndex()
+
+    results = []
+    try:
+        for size in args.sizes:
+            result = run_size(size, args, servers, pages)
+            results.append(result)
+            stages = result["stages"]
+            peak = result["peak_traced_bytes"]
+            print(
+                f"{size:>5} articles: wall={result['wall_seconds']:7.2f}s "
+                f"curate={stages.get('curate', {}).get('total', 0):6.2f}s "
+                f"scoring={stages.get('scoring', {}).get('total', 0):6.2f}s "
+                f"summarize={stages.get('summarize', {}).get('total', 0):6.2f}s "
+                f"render={stages.get('render', {}).get('total', 0):6.2f}s "
+                f"peak={peak / 1e6 if peak else float('nan'):7.1f}MB "
+                f"llm_calls={result['llm_calls']}"
+            )
+    finally:
+        stop_servers(servers)
+
+    report = {
+        "benchmark": "pipeline",
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "params": {k: v for k, v in vars(args).items() if k != "out"},
+        "results": results,
+    }
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
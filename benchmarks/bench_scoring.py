@@ -0,0 +1,94 @@
+# benchmarks/bench_scoring.py
+"""
+Keyword scoring: legacy substring scan vs the compiled KeywordMatcher.
+
+Legacy cost grows with (number of keywords x text length); the matcher
+tokenizes once and does set lookups, so its cost stays roughly flat as
+the keyword lists grow. --extra-keywords adds synthetic keywords to
+every category to show that.
+
+    python -m benchmarks.bench_scoring --articles 5000
+    python -m benchmarks.bench_scoring --extra-keywords 50
+"""
+
+import argparse
+import random
+import time
+
+from modules.scoring import CATEGORY_KEYWORDS, KeywordMatcher
+
+FILLER = (
+    "the said was remodel company reported quarterly results while analysts "
+    "expected more details about the plan and the team shipped an update"
+).split()
+
+
+def make_keywords(extra: int = 0):
+    """
+    CATEGORY_KEYWORDS plus `extra` synthetic keywords per category.
+    """
+    return {
+        cat: kws + [f"{cat.lower()}term{i}" for i in range(extra)]
+        for cat, kws in CATEGORY_KEYWORDS.items()
+    }
+
+
+def make_articles(count: int, words: int = 600, seed: int = 7, keyword_map=None):
+    rng = random.Random(seed)
+    keyword_map = keyword_map or CATEGORY_KEYWORDS
+    keywords = [kw for kws in keyword_map.values() for kw in kws]
+    articles = []
+    for i in range(count):
+        body = [rng.choice(keywords) if rng.random() < 0.03 else rng.choice(FILLER) for _ in range(words)]
+        articles.append({"title": f"Story {i} " + rng.choice(keywords), "content": " ".join(body)})
+    return articles
+
+
+def legacy_analyze(item, keyword_map):
+    """
+    The pre-matcher implementation: two lowercase + substring passes.
+    """
+    text = (item.get("title", "") + " " + item.get("content", "")).lower()
+    category = "General"
+    for cat, keywords in keyword_map.items():
+        if any(kw in text for kw in keywords):
+            category = cat
+            break
+
+    text = (item.get("title", "") + " " + item.get("content", "")).lower()
+    hits = sum(1 for kws in keyword_map.values() for kw in kws if kw in text)
+    return category, hits
+
+
+def bench(fn, articles):
+    t0 = time.perf_counter()
+    results = [fn(a) for a in articles]
+    return time.perf_counter() - t0, results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=5000)
+    parser.add_argument("--words", type=int, default=600)
+    parser.add_argument("--extra-keywords", type=int, default=0)
+    args = parser.parse_args()
+
+    keyword_map = make_keywords(args.extra_keywords)
+    matcher = KeywordMatcher(keyword_map)
+    articles = make_articles(args.articles, args.words, keyword_map=keyword_map)
+
+    legacy_time, legacy = bench(lambda a: legacy_analyze(a, keyword_map), articles)
+    compiled_time, compiled = bench(lambda a: matcher.analyze(a["title"] + " " + a["content"]), articles)
+
+    changed = sum(1 for a, b in zip(legacy, compiled) if a[0] != b[0])
+    n_keywords = sum(len(kws) for kws in keyword_map.values())
+
+    print(f"articles={args.articles} words/article={args.words} keywords={n_keywords}")
+    print(f"legacy substring : {legacy_time:6.3f}s ({legacy_time / len(articles) * 1e6:7.1f} µs/article)")
+    print(f"compiled matcher : {compiled_time:6.3f}s ({compiled_time / len(articles) * 1e6:7.1f} µs/article)")
+    print(f"speedup          : {legacy_time / compiled_time:6.2f}x")
+    print(f"category changed by word boundaries: {changed} / {len(articles)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# benchmarks/bench_scrape.py
+"""
+Sequential vs concurrent scraping against local stub HTTP servers.
+
+Each stub server plays one "site" and answers every request after a
+fixed delay, so the numbers reflect network wait rather than parsing.
+
+    python -m benchmarks.bench_scrape --articles 30 --hosts 4 --delay 0.5
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+# Keep the scrape cache away from the real one
+os.environ.setdefault("NEWSLETTER_CACHE_DIR", tempfile.mkdtemp(prefix="newsletter-bench-"))
+
+from benchmarks.stub_server import base_url, start_servers, stop_servers
+from modules.web_scraper import fetch_article_text, fetch_many_article_texts, get_scrape_cache
+
+
+ARTICLE_HTML = (
+    "<html><head><title>Stub</title></head><body>"
+    "<nav>Home | News</nav><article>"
+    + "".join(f"<p>Paragraph {i} of a stub article about markets and AI.</p>" for i in range(20))
+    + "</article><footer>footer</footer></body></html>"
+).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=30)
+    parser.add_argument("--hosts", type=int, default=4)
+    parser.add_argument("--delay", type=float, default=0.5)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--per-host", type=int, default=2)
+    args = parser.parse_args()
+
+    servers = start_servers(args.hosts, args.delay, [ARTICLE_HTML])
+    urls = [
+        f"{base_url(servers[i % len(servers)])}/article/{i}"
+        for i in range(args.articles)
+    ]
+
+    t0 = time.perf_counter()
+    seq = [fetch_article_text(u, use_cache=False) for u in urls]
+    seq_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    conc = fetch_many_article_texts(
+        urls, max_workers=args.workers, per_host=args.per_host, use_cache=False
+    )
+    conc_time = time.perf_counter() - t0
+
+    # Same URLs through the scrape cache: first pass fills it, second reads it
+    get_scrape_cache().clear()
+    fetch_many_article_texts(urls, max_workers=args.workers, per_host=args.per_host)
+    t0 = time.perf_counter()
+    fetch_many_article_texts(urls, max_workers=args.workers, per_host=args.per_host)
+    warm_time = time.perf_counter() - t0
+
+    ok_seq = sum(1 for t in seq if t)
+    ok_conc = sum(1 for t in conc.values() if t)
+
+    print(f"articles={args.articles} hosts={args.hosts} delay={args.delay}s")
+    print(f"sequential : {seq_time:6.2f}s ({ok_seq} ok)")
+    print(f"concurrent : {conc_time:6.2f}s ({ok_conc} ok, workers={args.workers}, per_host={args.per_host})")
+    print(f"speedup    : {seq_time / conc_time:6.1f}x")
+    print(f"warm cache : {warm_time:6.2f}s ({get_scrape_cache().stats()})")
+
+    stop_servers(servers)
+
+
+if __name__ == "__main__":
+    main()
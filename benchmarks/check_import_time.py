@@ -0,0 +1,99 @@
+# benchmarks/check_import_time.py
+"""
+Import-time budget check (python -X importtime based).
+
+Every scheduled run and Streamlit cold start pays for module imports,
+so the pipeline modules defer their heavy dependencies (Gemini SDK,
+requests, feedparser, bs4, jinja2, numpy) to first use. This imports
+each module in a fresh interpreter, takes the best of a few runs, and
+fails if it goes over its budget or pulls in a deferred dependency.
+
+    python -m benchmarks.check_import_time            # exit 1 on regression
+    python -m benchmarks.check_import_time --scale 2  # slow CI machine
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, Set, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time per module, in milliseconds
+BUDGETS_MS = {
+    "modules.utils": 40,
+    "modules.summary": 60,
+    "modules.web_scraper": 60,
+    "modules.curate": 120,
+    "modules.generator": 60,
+    "main": 200,
+}
+
+# Top-level packages none of the modules above may import eagerly
+DEFERRED = {"google", "requests", "urllib3", "feedparser", "bs4", "jinja2", "numpy", "scipy"}
+
+
+def import_profile(module: str) -> Tuple[float, Set[str]]:
+    """
+    (cumulative ms for `module`, top-level packages it imported).
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    total_us = None
+    packages = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            _, cumulative, name = line.split("|")
+            cumulative_us = int(cumulative)
+        except ValueError:
+            continue  # header line
+        name = name.strip()
+        packages.add(name.split(".")[0])
+        if name == module:
+            total_us = cumulative_us
+
+    return (total_us or 0) / 1000, packages
+
+
+def check(budgets: Dict[str, float], runs: int = 3, scale: float = 1.0) -> bool:
+    ok = True
+    for module, budget in budgets.items():
+        profiles = [import_profile(module) for _ in range(runs)]
+        best = min(ms for ms, _ in profiles)
+        eager = sorted(DEFERRED & profiles[0][1])
+        limit = budget * scale
+
+        status = "ok"
+        if best > limit:
+            status = "OVER BUDGET"
+            ok = False
+        if eager:
+            status = f"eager import of {', '.join(eager)}"
+            ok = False
+
+        print(f"{module:<22} {best:7.1f}ms / {limit:6.1f}ms  {status}")
+
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3, help="take the best of N fresh interpreters")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget (slow machines)")
+    args = parser.parse_args()
+
+    sys.exit(0 if check(BUDGETS_MS, runs=args.runs, scale=args.scale) else 1)
+
+
+if __name__ == "__main__":
+    main()
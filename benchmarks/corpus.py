@@ -0,0 +1,169 @@
+# benchmarks/corpus.py
+"""
+Offline benchmark fixtures.
+
+Builds a deterministic corpus of news-site-like HTML pages (scripts,
+navigation, comments, related links around the article body) under
+benchmarks/fixtures/html/. Point the benchmarks at a folder of real
+saved pages instead with --corpus DIR.
+
+Also records RSS 2.0 feeds under benchmarks/fixtures/rss/ whose links
+use a __BASE__ placeholder the stub server fills in at serve time.
+"""
+
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import Dict, List, Tuple
+from xml.sax.saxutils import escape
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+HTML_DIR = os.path.join(FIXTURES_DIR, "html")
+RSS_DIR = os.path.join(FIXTURES_DIR, "rss")
+
+# Fixed "now" for recorded feeds so fixtures are byte-identical across runs
+FEED_EPOCH = datetime(2025, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+WORDS = (
+    "market economy model launch company investors analysts growth quarter "
+    "software cloud developers research study health results policy league "
+    "match season startup funding users data privacy chip device battery"
+).split()
+
+# (name, article paragraphs, boilerplate scale)
+PAGE_SPECS = [
+    ("short_blog", 6, 1),
+    ("news_article", 14, 4),
+    ("longform", 60, 4),
+    ("heavy_portal", 18, 20),
+    ("container_only", 12, 3),
+    ("no_article", 8, 2),
+]
+
+
+def _sentence(rng: random.Random, words: int = 14) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text.capitalize() + "."
+
+
+def _paragraph(rng: random.Random) -> str:
+    return " ".join(_sentence(rng, rng.randint(8, 20)) for _ in range(rng.randint(2, 5)))
+
+
+def make_page(rng: random.Random, paragraphs: int, boilerplate: int, layout: str = "article") -> str:
+    script = "<script>" + "var cfg = {" + ",".join(f'k{i}: "{"x" * 40}"' for i in range(200 * boilerplate)) + "};</script>"
+    style = "<style>" + "".join(f".c{i} {{ margin: {i}px; }}" for i in range(100 * boilerplate)) + "</style>"
+    nav = "<nav><ul>" + "".join(f'<li><a href="/s/{i}">Section {i}</a></li>' for i in range(30 * boilerplate)) + "</ul></nav>"
+    related = "<aside>" + "".join(f"<div class=\"card\"><p>{_sentence(rng)}</p></div>" for i in range(10 * boilerplate)) + "</aside>"
+    comments = "<section class=\"comments\">" + "".join(
+        f"<div class=\"comment\"><span>user{i}</span><p>{_sentence(rng)}</p></div>" for i in range(25 * boilerplate)
+    ) + "</section>"
+    body = "".join(f"<p>{_paragraph(rng)}</p>" for _ in range(paragraphs))
+
+    if layout == "article":
+        main = f"<article><h1>{_sentence(rng, 8)}</h1><div class=\"byline\">By Staff</div>{body}</article>"
+    elif layout == "container":
+        main = f"<div class=\"wrapper\"><div class=\"post-content\">{body}</div></div>"
+    else:
+        main = f"<div class=\"main\">{body}</div>"
+
+    return (
+        f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>Page</title>{style}{script}</head>"
+        f"<body><header><p>Subscribe today</p>{nav}</header>{main}{related}{comments}"
+        f"<footer><p>Copyright</p></footer>{script}</body></html>"
+    )
+
+
+def build_html_corpus(directory: str = HTML_DIR, seed: int = 11) -> List[str]:
+    """
+    Writes the synthetic pages (once) and returns their paths.
+    """
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    paths = []
+
+    for name, paragraphs, boilerplate in PAGE_SPECS:
+        layout = "container" if name == "container_only" else "plain" if name == "no_article" else "article"
+        page = make_page(rng, paragraphs, boilerplate, layout)
+        path = os.path.join(directory, f"{name}.html")
+        if not os.path.exists(path):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(page)
+        paths.append(path)
+
+    return paths
+
+
+def load_html_corpus(directory: str = None) -> List[Tuple[str, str]]:
+    """
+    [(name, html)] from `directory`, or the synthetic corpus by default.
+    """
+    if directory:
+        paths = sorted(
+            os.path.join(directory, n) for n in os.listdir(directory)
+            if n.endswith((".html", ".htm"))
+        )
+    else:
+        paths = build_html_corpus()
+
+    corpus = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            corpus.append((os.path.splitext(os.path.basename(path))[0], f.read()))
+    return corpus
+
+
+# ----------------------------
+# RSS fixtures
+# ----------------------------
+def make_feed(rng: random.Random, feed_no: int, items: int) -> str:
+    """
+    One RSS 2.0 document; every title/description is distinct enough
+    that near-duplicate detection keeps them all.
+    """
+    entries = []
+    for i in range(items):
+        published = FEED_EPOCH - timedelta(minutes=rng.randint(0, 48 * 60))
+        title = f"{_sentence(rng, 9)[:-1]} ({feed_no}-{i})"
+        entries.append(
+            "<item>"
+            f"<title>{escape(title)}</title>"
+            f"<link>__BASE__/article/{feed_no}/{i}</link>"
+            f"<guid isPermaLink=\"false\">bench-{feed_no}-{i}</guid>"
+            f"<pubDate>{format_datetime(published)}</pubDate>"
+            f"<description>{escape(_paragraph(rng))}</description>"
+            "</item>"
+        )
+
+    return (
+        "<?xml version=\"1.0\" encoding=\"utf-8\"?>"
+        "<rss version=\"2.0\"><channel>"
+        f"<title>Bench feed {feed_no}</title><link>__BASE__/</link>"
+        f"<description>Synthetic feed {feed_no}</description>"
+        + "".join(entries)
+        + "</channel></rss>"
+    )
+
+
+def build_feed_corpus(feeds: int, items: int, directory: str = RSS_DIR, seed: int = 23) -> Dict[str, str]:
+    """
+    Writes feed_<n>_<items>.xml (once) and returns {file name: xml}.
+    """
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    corpus = {}
+
+    for n in range(feeds):
+        name = f"feed_{n:03d}_{items}.xml"
+        path = os.path.join(directory, name)
+        xml = make_feed(rng, n, items)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                xml = f.read()
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(xml)
+        corpus[name] = xml
+
+    return corpus
@@ -0,0 +1,71 @@
+# benchmarks/fake_llm.py
+"""
+Offline stand-in for GeminiWrapper.
+
+Same interface (model_name, temperature, invoke(prompt) -> str), sleeps
+for a configurable latency per request and answers with bullets in the
+shape summarize_article / summarize_batch expect, so the summarize
+stage can be benchmarked without an API key or quota.
+"""
+
+import random
+import re
+import threading
+import time
+
+from modules.utils import DEFAULT_MODEL, DEFAULT_TEMPERATURE
+
+# Matches the article headers build_batch_prompt writes
+ARTICLE_HEADER_RE = re.compile(r"^### ARTICLE (\d+) ###", re.MULTILINE)
+
+
+class FakeGeminiWrapper:
+    def __init__(
+        self,
+        latency: float = 0.5,
+        jitter: float = 0.0,
+        per_1k_tokens: float = 0.0,
+        model=DEFAULT_MODEL,
+        temperature=DEFAULT_TEMPERATURE,
+        seed: int = 7
+    ):
+        """
+        latency:        base seconds per request
+        jitter:         +/- uniform seconds added to each request
+        per_1k_tokens:  extra seconds per 1k prompt tokens (~4 chars each)
+        """
+        self.model_name = model
+        self.temperature = temperature
+        self.latency = latency
+        self.jitter = jitter
+        self.per_1k_tokens = per_1k_tokens
+        self.calls = 0
+        self.prompt_chars = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt: str) -> str:
+        with self._lock:
+            self.calls += 1
+            self.prompt_chars += len(prompt)
+            delay = self.latency + self._rng.uniform(-self.jitter, self.jitter)
+
+        delay += self.per_1k_tokens * len(prompt) / 4000
+        time.sleep(max(0.0, delay))
+
+        ids = ARTICLE_HEADER_RE.findall(prompt)
+        if not ids:
+            return self._bullets("article")
+
+        # Batched prompt: answer with the same delimiters it was sent
+        return "\n".join(
+            f"=== ARTICLE {i} ===\n{self._bullets(f'article {i}')}" for i in ids
+        )
+
+    @staticmethod
+    def _bullets(label: str) -> str:
+        return (
+            f"- Key point about {label}.\n"
+            f"- Why {label} matters to readers.\n"
+            f"- What to watch next for {label}."
+        )
@@ -0,0 +1,97 @@
+# benchmarks/stub_server.py
+"""
+Local stub "sites" for the benchmarks.
+
+Each server plays one host and answers after a fixed delay:
+
+    /feed/<name>.xml   -> recorded RSS fixture (__BASE__ replaced by
+                          this server's http://127.0.0.1:<port>)
+    anything else      -> one of the article pages, picked by path
+
+so runs are offline and repeatable, and the numbers reflect network
+wait plus our own parsing rather than the real internet.
+
+With etags=True feeds carry an ETag (CRC of the body) and a matching
+If-None-Match gets a 304, like a real feed server.
+"""
+
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+BASE_PLACEHOLDER = "__BASE__"
+
+
+def make_handler(delay: float, pages: List[bytes], feeds: Dict[str, str] = None, etags: bool = False):
+    class StubHandler(BaseHTTPRequestHandler):
+        # Class attributes so a benchmark can swap fixtures between runs
+        # (server.RequestHandlerClass.feeds = {...})
+        def do_GET(self):
+            time.sleep(self.delay)
+            self.server.hits += 1
+
+            if self.path.startswith("/feed/"):
+                name = self.path[len("/feed/"):]
+                xml = self.feeds.get(name)
+                if xml is None:
+                    self.send_error(404)
+                    return
+                base = f"http://127.0.0.1:{self.server.server_address[1]}"
+                body = xml.replace(BASE_PLACEHOLDER, base).encode("utf-8")
+                content_type = "application/rss+xml; charset=utf-8"
+
+                etag = f'"{zlib.crc32(body):08x}"' if self.etags else None
+                if etag and self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+            else:
+                etag = None
+                body = self.pages[zlib.crc32(self.path.encode("utf-8")) % len(self.pages)]
+                content_type = "text/html; charset=utf-8"
+
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            if etag:
+                self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    StubHandler.delay = delay
+    StubHandler.pages = pages
+    StubHandler.feeds = feeds or {}
+    StubHandler.etags = etags
+    return StubHandler
+
+
+def start_servers(count: int, delay: float, pages: List[bytes], feeds: Dict[str, str] = None,
+                  etags: bool = False):
+    """
+    Starts `count` stub servers in background threads. Each serves the
+    same pages/feeds; server.hits counts the requests it answered.
+    """
+    servers = []
+    for _ in range(count):
+        srv = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(delay, pages, feeds, etags))
+        srv.daemon_threads = True
+        srv.hits = 0
+        threading.Thread(target=srv.serve_forever, daemon=True).start()
+        servers.append(srv)
+    return servers
+
+
+def base_url(server) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def stop_servers(servers):
+    for srv in servers:
+        srv.shutdown()
+        srv.server_close()
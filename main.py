@@ -1,23 +1,79 @@
 # main.py
 
 import os
+import json
+import time
+import argparse
+from modules.archive_index import get_archive
 from modules.curate import curate_articles
 from modules.scoring import run_scoring
-from modules.generator import generate_newsletter
+from modules.generator import generate_newsletter, select_top
+from modules.pipeline import stream_newsletter
+from modules.incremental import generate_incremental, WINDOW_HOURS
+from modules.fanout import generate_fanout, segment_slug
+from modules.scheduler import FeedScheduler
+from modules.metrics import METRICS, profile_run, write_metrics
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate the AI newsletter.")
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="stream articles through scrape/score/summarize instead of running stages one by one"
+    )
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="only process new/changed articles and rebuild from the local article store"
+    )
+    parser.add_argument(
+        "--window-hours", type=float, default=WINDOW_HOURS,
+        help="incremental mode: how far back stored articles are included"
+    )
+    parser.add_argument(
+        "--daemon", action="store_true",
+        help="keep running: poll each feed at its own adaptive interval and write a newsletter "
+             "whenever enough new high-scoring articles have arrived"
+    )
+    parser.add_argument(
+        "--segments", metavar="PATH",
+        help="fan-out: JSON list of segments, one newsletter each from a single curate/score pass"
+    )
+    parser.add_argument(
+        "--search", metavar="TEXT",
+        help="search the archive of past newsletter articles instead of generating one"
+    )
+    parser.add_argument(
+        "--days", type=float, default=None,
+        help="--search: only articles covered in the last N days"
+    )
+    parser.add_argument(
+        "--metrics-out", metavar="PATH",
+        help="write run metrics (.json, or .prom for Prometheus text)"
+    )
+    parser.add_argument(
+        "--profile", metavar="PATH",
+        help="dump a cProfile of the run (inspect with python -m pstats PATH)"
+    )
+    return parser.parse_args()
 
 
 def main():
+    args = parse_args()
 
-    print("\n=== STEP 1: CURATING (RSS + NewsAPI + Scraping) ===")
-    items = curate_articles()
-    print(f"✓ Collected total items: {len(items)}")
+    with profile_run(args.profile):
+        run(args)
 
-    print("\n=== STEP 2: SCORING ARTICLES ===")
-    scored_items = run_scoring(items, user_topics=[])
-    print("✓ Scoring completed")
+    print("\n=== STAGE TIMINGS ===")
+    print(METRICS.report() or "  (nothing recorded)")
+
+    if args.metrics_out:
+        write_metrics(args.metrics_out)
+        print(f"✓ Metrics written to: {args.metrics_out}")
+    if args.profile:
+        print(f"✓ Profile written to: {args.profile}")
 
-    print("\n=== STEP 3: GENERATING NEWSLETTER ===")
 
+def run(args):
     # --------------------------------------
     # Choose template (Pick ONE)
     # Options:
@@ -31,6 +87,83 @@ def main():
     tone = "professional"      # "casual", "formal", "friendly"
     length = "short"           # "short", "medium", "long"
 
+    if args.search:
+        archive = get_archive()
+        if archive is not None:
+            print_search_results(archive.search(args.search, days=args.days))
+        return
+
+    if args.stream:
+        print("\n=== STREAMING: CURATE → SCRAPE → SCORE → SUMMARIZE ===")
+        html = None
+        for count, html in enumerate(
+            stream_newsletter(template_name=template_to_use, tone=tone, length=length, top_n=10),
+            start=1
+        ):
+            print(f"✓ Article {count} summarized")
+
+        if html is None:
+            print("\n❌ No articles came through the pipeline")
+            return
+
+        save_output(html)
+        return
+
+    if args.daemon:
+        print("\n=== DAEMON: ADAPTIVE FEED POLLING (Ctrl+C to stop) ===")
+        scheduler = FeedScheduler(
+            template_name=template_to_use, tone=tone, length=length, top_n=10, archive=get_archive()
+        )
+        try:
+            scheduler.run(on_newsletter=save_daemon_output)
+        except KeyboardInterrupt:
+            print("\n✓ Scheduler stopped")
+        return
+
+    if args.segments:
+        print("\n=== FAN-OUT: CURATE + SCORE ONCE → ONE NEWSLETTER PER SEGMENT ===")
+        with open(args.segments, "r", encoding="utf-8") as f:
+            segments = json.load(f)
+
+        try:
+            outputs = generate_fanout(segments)
+        except Exception as e:
+            print("\n❌ ERROR while generating newsletters:")
+            print(e)
+            return
+
+        save_segment_outputs(outputs)
+        return
+
+    if args.incremental:
+        print("\n=== INCREMENTAL: NEW/CHANGED ARTICLES → ARTICLE STORE → NEWSLETTER ===")
+        try:
+            html = generate_incremental(
+                template_name=template_to_use,
+                tone=tone,
+                length=length,
+                top_n=10,
+                window_hours=args.window_hours,
+                archive=get_archive()
+            )
+        except Exception as e:
+            print("\n❌ ERROR while generating newsletter:")
+            print(e)
+            return
+
+        save_output(html)
+        return
+
+    print("\n=== STEP 1: CURATING (RSS + NewsAPI + Scraping) ===")
+    items = curate_articles()
+    print(f"✓ Collected total items: {len(items)}")
+
+    print("\n=== STEP 2: SCORING ARTICLES ===")
+    scored_items = run_scoring(items, user_topics=[])
+    print("✓ Scoring completed")
+
+    print("\n=== STEP 3: GENERATING NEWSLETTER ===")
+
     try:
         html = generate_newsletter(
             scored_items,
@@ -45,6 +178,10 @@ def main():
         print(e)
         return
 
+    archive_output(select_top(scored_items, 10), save_output(html))
+
+
+def save_output(html):
     print("\n=== STEP 4: SAVING OUTPUT ===")
     outdir = "output"
     os.makedirs(outdir, exist_ok=True)
@@ -55,6 +192,58 @@ def main():
 
     print(f"✓ Saved newsletter to: {output_path}")
     print("\n🎉 DONE — Your newsletter is ready!")
+    return output_path
+
+
+def archive_output(articles, output_path):
+    """
+    Adds the newsletter's articles to the searchable archive
+    (cache/archive.sqlite3).
+    """
+    archive = get_archive()
+    if archive is None:
+        return
+    try:
+        archive.add_newsletter(articles, path=output_path)
+        print(f"✓ Archived {len(articles)} article(s)")
+    except Exception as e:
+        print("Archive index error:", e)
+
+
+def print_search_results(results):
+    if not results:
+        print("No archived articles match.")
+        return
+
+    for hit in results:
+        covered = time.strftime("%Y-%m-%d", time.localtime(hit["covered_at"]))
+        print(f"\n[{covered}] {hit['title']}  ({hit['category']}, score {hit['score']})")
+        print(f"  {hit['link'] or '-'}  →  {hit['newsletter'] or '-'}")
+        print(f"  {hit['snippet']}")
+
+
+def save_daemon_output(html):
+    outdir = "output"
+    os.makedirs(outdir, exist_ok=True)
+
+    output_path = os.path.join(outdir, time.strftime("newsletter-%Y%m%d-%H%M%S.html"))
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(html)
+
+    print(f"✓ Saved newsletter to: {output_path}")
+
+
+def save_segment_outputs(outputs):
+    outdir = os.path.join("output", "segments")
+    os.makedirs(outdir, exist_ok=True)
+
+    for name, html in outputs.items():
+        output_path = os.path.join(outdir, segment_slug(name) + ".html")
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(html)
+        print(f"✓ Saved {name}: {output_path}")
+
+    print(f"\n🎉 DONE — {len(outputs)} newsletters ready!")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,301 @@
+# modules/archive_index.py
+"""
+Full-text index of past newsletters and the articles they covered.
+
+Every saved newsletter adds its articles (title, scraped text, AI
+summary, category, score) to a SQLite FTS5 index in
+cache/archive.sqlite3, one small transaction per issue, so the archive
+stays searchable without keeping or rescanning output/*.html:
+
+- search("chip export rules", days=30) -> ranked hits with snippets
+- covered(item, days=7) -> was this story (same link, or a title that
+  mostly matches a covered title) in a newsletter recently?
+
+curate_articles uses covered() to drop repeat stories before they are
+scraped and summarized again. get_archive() returns the shared index,
+or None when this SQLite build has no FTS5 (the check is then off).
+"""
+
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from modules.cache import cache_path
+from modules.compress import content_words
+
+# Stories in a newsletter this recently count as covered (0 = off)
+COVERED_DAYS = float(os.getenv("ARCHIVE_COVERED_DAYS", 7))
+
+# Title word-set overlap (Jaccard) that counts as the same story
+COVERED_TITLE_OVERLAP = 0.6
+COVERED_MIN_TITLE_WORDS = 3     # shorter titles only match by link
+
+# Stored text per article (the index is over this)
+MAX_CONTENT_CHARS = 20_000
+
+# bm25 column weights: title, content, summary, category
+RANK_WEIGHTS = (10.0, 1.0, 3.0, 2.0)
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _quote(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+class ArchiveIndex:
+    """
+    SQLite FTS5 index over archived newsletter articles, keyed by
+    link (or title when there is no link). The FTS table is an
+    external-content index kept in sync by triggers, so re-covering a
+    story updates its row instead of duplicating it.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or cache_path("archive.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS newsletters (
+                id         INTEGER PRIMARY KEY,
+                path       TEXT,
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS articles (
+                id            INTEGER PRIMARY KEY,
+                key           TEXT NOT NULL UNIQUE,
+                link          TEXT,
+                title         TEXT NOT NULL,
+                content       TEXT NOT NULL,
+                summary       TEXT NOT NULL,
+                category      TEXT,
+                score         REAL,
+                published     REAL,
+                newsletter_id INTEGER REFERENCES newsletters(id),
+                covered_at    REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_archive_covered ON articles(covered_at);
+
+            CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                title, content, summary, category,
+                content='articles', content_rowid='id', tokenize='porter unicode61'
+            );
+            CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+                INSERT INTO articles_fts(rowid, title, content, summary, category)
+                VALUES (new.id, new.title, new.content, new.summary, new.category);
+            END;
+            CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+                INSERT INTO articles_fts(articles_fts, rowid, title, content, summary, category)
+                VALUES ('delete', old.id, old.title, old.content, old.summary, old.category);
+            END;
+            CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
+                INSERT INTO articles_fts(articles_fts, rowid, title, content, summary, category)
+                VALUES ('delete', old.id, old.title, old.content, old.summary, old.category);
+                INSERT INTO articles_fts(rowid, title, content, summary, category)
+                VALUES (new.id, new.title, new.content, new.summary, new.category);
+            END;
+            """
+        )
+        self._conn.commit()
+
+    # ----------------------------
+    # Incremental updates
+    # ----------------------------
+    @staticmethod
+    def article_key(item: Dict) -> str:
+        # Same key as curate.dedup_key
+        return item.get("link") or (item.get("title") or "")[:100]
+
+    def add_newsletter(self, articles: List[Dict], path: str = None, created_at: float = None) -> int:
+        """
+        Records one newsletter issue and indexes its articles (new
+        stories are added, re-covered ones updated). Returns the
+        newsletter id.
+        """
+        created_at = created_at or time.time()
+        rows = []
+        for it in articles:
+            key = self.article_key(it)
+            if not key:
+                continue
+            pub = it.get("published")
+            rows.append((
+                key,
+                it.get("link"),
+                it.get("title") or "",
+                (it.get("content") or "")[:MAX_CONTENT_CHARS],
+                it.get("ai_summary") or it.get("summary") or "",
+                it.get("category"),
+                it.get("score"),
+                pub.timestamp() if isinstance(pub, datetime) else None,
+                created_at,
+            ))
+
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT INTO newsletters (path, created_at) VALUES (?, ?)", (path, created_at)
+            )
+            newsletter_id = cur.lastrowid
+            self._conn.executemany(
+                """
+                INSERT INTO articles (key, link, title, content, summary, category, score,
+                                      published, covered_at, newsletter_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    title = excluded.title,
+                    content = excluded.content,
+                    summary = excluded.summary,
+                    category = excluded.category,
+                    score = excluded.score,
+                    published = excluded.published,
+                    covered_at = excluded.covered_at,
+                    newsletter_id = excluded.newsletter_id
+                """,
+                [row + (newsletter_id,) for row in rows]
+            )
+            self._conn.commit()
+        return newsletter_id
+
+    # ----------------------------
+    # Queries
+    # ----------------------------
+    def search(
+        self,
+        text: str,
+        days: float = None,
+        category: str = None,
+        min_score: float = None,
+        limit: int = 20
+    ) -> List[Dict]:
+        """
+        Archived articles matching every word of `text` (stemmed),
+        best first: [{link, title, category, score, summary,
+        covered_at, newsletter, snippet}]. days / category / min_score
+        narrow the results.
+        """
+        terms = _TERM_RE.findall(text or "")
+        if not terms:
+            return []
+
+        sql = [
+            """
+            SELECT a.link, a.title, a.category, a.score, a.summary, a.covered_at, n.path,
+                   snippet(articles_fts, 1, '[', ']', '…', 16)
+            FROM articles_fts
+            JOIN articles a ON a.id = articles_fts.rowid
+            LEFT JOIN newsletters n ON n.id = a.newsletter_id
+            WHERE articles_fts MATCH ?
+            """
+        ]
+        params: List = [" ".join(_quote(t) for t in terms)]
+
+        if days is not None:
+            sql.append("AND a.covered_at >= ?")
+            params.append(time.time() - days * 86400)
+        if category:
+            sql.append("AND a.category = ?")
+            params.append(category)
+        if min_score is not None:
+            sql.append("AND a.score >= ?")
+            params.append(min_score)
+
+        sql.append(f"ORDER BY bm25(articles_fts, {', '.join(map(str, RANK_WEIGHTS))}) LIMIT ?")
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute("\n".join(sql), params).fetchall()
+
+        return [
+            {
+                "link": link,
+                "title": title,
+                "category": cat,
+                "score": score,
+                "summary": summary,
+                "covered_at": covered_at,
+                "newsletter": newsletter,
+                "snippet": snippet,
+            }
+            for link, title, cat, score, summary, covered_at, newsletter, snippet in rows
+        ]
+
+    def covered(self, item: Dict, days: float = COVERED_DAYS) -> bool:
+        """
+        True when the story was in a newsletter within the last `days`:
+        same link, or a title sharing COVERED_TITLE_OVERLAP of its
+        content words with a covered title (syndicated / re-posted
+        copies under another URL).
+        """
+        if not days or days <= 0:
+            return False
+        cutoff = time.time() - days * 86400
+
+        key = self.article_key(item)
+        with self._lock:
+            if key and self._conn.execute(
+                "SELECT 1 FROM articles WHERE key = ? AND covered_at >= ?", (key, cutoff)
+            ).fetchone():
+                return True
+
+        words = set(content_words(item.get("title") or ""))
+        if len(words) < COVERED_MIN_TITLE_WORDS:
+            return False
+
+        # A title with Jaccard >= COVERED_TITLE_OVERLAP shares at least
+        # `need` of these words, so it contains at least one of any
+        # len(words) - need + 1 of them: ask only for the longest
+        # (usually rarest) ones, and let the overlap check decide
+        need = math.ceil(COVERED_TITLE_OVERLAP * len(words))
+        probe = sorted(words, key=lambda w: (-len(w), w))[:len(words) - need + 1]
+        query = "title : (" + " OR ".join(_quote(w) for w in probe) + ")"
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT a.title FROM articles_fts
+                JOIN articles a ON a.id = articles_fts.rowid
+                WHERE articles_fts MATCH ? AND a.covered_at >= ?
+                ORDER BY bm25(articles_fts) LIMIT 10
+                """,
+                (query, cutoff)
+            ).fetchall()
+
+        for (title,) in rows:
+            other = set(content_words(title))
+            if other and len(words & other) / len(words | other) >= COVERED_TITLE_OVERLAP:
+                return True
+        return False
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+
+# ----------------------------------------------------
+# Shared index
+# ----------------------------------------------------
+_archive = None
+_archive_failed = False
+_archive_lock = threading.Lock()
+
+
+def get_archive() -> Optional[ArchiveIndex]:
+    """
+    Shared archive index, opened on first use. None when it can't be
+    opened (e.g. SQLite built without FTS5); the error is printed once.
+    """
+    global _archive, _archive_failed
+    with _archive_lock:
+        if _archive is None and not _archive_failed:
+            try:
+                _archive = ArchiveIndex()
+            except sqlite3.OperationalError as e:
+                _archive_failed = True
+                print("Archive index unavailable, covered-story check disabled:", e)
+        return _archive
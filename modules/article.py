@@ -0,0 +1,183 @@
+# modules/article.py
+"""
+Compact article record.
+
+Articles used to travel as plain dicts: one hash table per article,
+the same URL stored again under rss_url / scraped_url and the same
+text under content / summary once rows came back from JSON, and a
+separate "Technology" string per entry for every category.
+
+Article keeps the fields in __slots__ and still behaves like the
+dict every stage expects (item["score"] = ..., item.get("link"),
+"content" in item, dict(item)), so rss_ingest, curate, scoring,
+summary, generator and the Jinja templates work unchanged:
+
+- rss_url / scraped_url equal to link, and summary equal to content,
+  are stored as a marker pointing at the one shared slot; changing
+  link / content first gives the aliases their own copy of the old
+  value, so reads always match what a dict would return
+- category and source strings are interned
+- keys outside the known fields go to a small overflow dict
+"""
+
+import sys
+from collections.abc import MutableMapping
+from typing import Dict, Iterator
+
+FIELDS = ("title", "link", "rss_url", "scraped_url", "published", "summary",
+          "content", "category", "source", "entry_id", "score", "ai_summary")
+_FIELD_SET = frozenset(FIELDS)
+
+# Few distinct values, repeated across thousands of articles
+INTERNED = frozenset(("category", "source"))
+
+
+class _Same:
+    """
+    Marker for "same value as the shared slot" (pickles by name).
+    """
+
+    def __repr__(self):
+        return "SAME"
+
+    def __reduce__(self):
+        return "SAME"
+
+
+SAME = _Same()
+
+
+def _alias(slot: str, target: str):
+    """
+    Property for a field that usually repeats `target`: stores SAME
+    instead of a second reference / copy.
+    """
+
+    def fget(self):
+        value = getattr(self, slot)
+        return getattr(self, target) if value is SAME else value
+
+    def fset(self, value):
+        shared = getattr(self, target, None)
+        setattr(self, slot, SAME if shared is not None and value == shared else value)
+
+    def fdel(self):
+        delattr(self, slot)
+
+    return property(fget, fset, fdel)
+
+
+def _shared(slot: str, aliases):
+    """
+    Property for a field other fields may alias: before it changes,
+    aliases pointing at it get the old value.
+    """
+
+    def fget(self):
+        return getattr(self, slot)
+
+    def fset(self, value):
+        self._detach(slot, aliases)
+        setattr(self, slot, value)
+        # Aliases set first (e.g. rows decoded in field order)
+        for alias in aliases:
+            current = getattr(self, alias, None)
+            if current is not None and current is not SAME and current == value:
+                setattr(self, alias, SAME)
+
+    def fdel(self):
+        self._detach(slot, aliases)
+        delattr(self, slot)
+
+    return property(fget, fset, fdel)
+
+
+class Article(MutableMapping):
+    __slots__ = ("title", "_link", "_rss_url", "_scraped_url", "published", "_summary",
+                 "_text", "category", "source", "entry_id", "score", "ai_summary", "_extra")
+
+    link = _shared("_link", ("_rss_url", "_scraped_url"))
+    rss_url = _alias("_rss_url", "_link")
+    scraped_url = _alias("_scraped_url", "_link")
+    content = _shared("_text", ("_summary",))
+    summary = _alias("_summary", "_text")
+
+    def __init__(self, data: Dict = None, **fields):
+        self._extra = None
+        for mapping in (data or {}), fields:
+            for key, value in mapping.items():
+                self[key] = value
+
+    def _detach(self, slot: str, aliases):
+        if not hasattr(self, slot):
+            return
+        old = getattr(self, slot)
+        for alias in aliases:
+            if getattr(self, alias, None) is SAME:
+                setattr(self, alias, old)
+
+    # ----------------------------
+    # Dict interface
+    # ----------------------------
+    def __getitem__(self, key: str):
+        if key in _FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def get(self, key: str, default=None):
+        # Hot path for every stage; skips the KeyError round trip
+        if key in _FIELD_SET:
+            return getattr(self, key, default)
+        return self._extra.get(key, default) if self._extra else default
+
+    def __setitem__(self, key: str, value):
+        if key in _FIELD_SET:
+            if key in INTERNED and type(value) is str:
+                value = sys.intern(value)
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key: str):
+        if key not in self:
+            raise KeyError(key)
+        if key in _FIELD_SET:
+            delattr(self, key)
+        else:
+            del self._extra[key]
+
+    def __contains__(self, key) -> bool:
+        if key in _FIELD_SET:
+            return hasattr(self, key)
+        return bool(self._extra) and key in self._extra
+
+    def __iter__(self) -> Iterator[str]:
+        for key in FIELDS:
+            if hasattr(self, key):
+                yield key
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"Article({dict(self)!r})"
+
+    def __reduce__(self):
+        # Rebuilt through __setitem__, so sharing / interning survive
+        # the trip to parse-pool workers and st.cache_data
+        return self.__class__, (dict(self),)
+
+    def copy(self) -> "Article":
+        return self.__class__(self)
+
+    def to_dict(self) -> Dict:
+        return dict(self)
@@ -0,0 +1,141 @@
+# modules/article_store.py
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from modules.article import Article
+from modules.cache import cache_path, content_hash
+
+# Fields kept per article besides the bookkeeping columns
+STORED_FIELDS = ["title", "link", "rss_url", "scraped_url", "published", "summary",
+                 "content", "category", "source", "score", "ai_summary"]
+
+
+class ArticleStore:
+    """
+    Local SQLite store of processed articles, keyed by link.
+
+    Each row keeps the scraped text, category, score and last AI
+    summary, plus a hash of the RSS title + summary. An item whose
+    link and RSS hash are already stored is "unchanged" and does not
+    need to be scraped, scored or summarized again.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or cache_path("articles.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS articles (
+                link         TEXT PRIMARY KEY,
+                rss_hash     TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                data         TEXT NOT NULL,
+                published    REAL,
+                first_seen   REAL NOT NULL,
+                updated_at   REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_seen ON articles(first_seen)")
+        self._conn.commit()
+
+    # ----------------------------
+    # Change detection
+    # ----------------------------
+    @staticmethod
+    def rss_hash(item: Dict) -> str:
+        return content_hash(f"{item.get('title') or ''}\n{item.get('summary') or ''}")
+
+    def is_unchanged(self, item: Dict) -> bool:
+        link = item.get("link")
+        if not link:
+            return False
+        with self._lock:
+            row = self._conn.execute("SELECT rss_hash FROM articles WHERE link = ?", (link,)).fetchone()
+        return bool(row) and row[0] == self.rss_hash(item)
+
+    # ----------------------------
+    # Read / write
+    # ----------------------------
+    @staticmethod
+    def _encode(item: Dict) -> str:
+        data = {k: item.get(k) for k in STORED_FIELDS}
+        if isinstance(data["published"], datetime):
+            data["published"] = data["published"].isoformat()
+        return json.dumps(data)
+
+    @staticmethod
+    def _decode(data: str) -> Article:
+        item = Article(json.loads(data))
+        if item.get("published"):
+            try:
+                item["published"] = datetime.fromisoformat(item["published"])
+            except (TypeError, ValueError):
+                pass
+        return item
+
+    def upsert(self, items: List[Dict]):
+        now = time.time()
+        rows = []
+        for it in items:
+            if not it.get("link"):
+                continue
+            pub = it.get("published")
+            rows.append((
+                it["link"],
+                self.rss_hash(it),
+                content_hash(it.get("content") or ""),
+                self._encode(it),
+                pub.timestamp() if isinstance(pub, datetime) else None,
+                now,
+                now,
+            ))
+
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT INTO articles (link, rss_hash, content_hash, data, published, first_seen, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(link) DO UPDATE SET
+                    rss_hash = excluded.rss_hash,
+                    content_hash = excluded.content_hash,
+                    data = excluded.data,
+                    published = excluded.published,
+                    updated_at = excluded.updated_at
+                """,
+                rows
+            )
+            self._conn.commit()
+
+    def get(self, link: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM articles WHERE link = ?", (link,)).fetchone()
+        return self._decode(row[0]) if row else None
+
+    def recent(self, hours: float = 48) -> List[Dict]:
+        """
+        Articles first seen in the last `hours`, newest first.
+        """
+        return self.since(time.time() - hours * 3600)
+
+    def since(self, timestamp: float) -> List[Dict]:
+        """
+        Articles first seen at or after `timestamp` (epoch seconds),
+        newest first.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM articles WHERE first_seen >= ? ORDER BY first_seen DESC", (timestamp,)
+            ).fetchall()
+        return [self._decode(r[0]) for r in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
@@ -0,0 +1,131 @@
+# modules/batch_scoring.py
+"""
+Vectorized scoring for large article pools (optional: NumPy + SciPy).
+
+Keyword hits for all articles go into one sparse (articles x keywords)
+matrix; categories, keyword scores, recency and user-topic boosts are
+then array operations, and top-k uses argpartition instead of a full
+sort. Scores and categories match compute_simple_score().
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, List
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # optional dependency
+    np = None
+    sparse = None
+
+from modules.scoring import (
+    KEYWORD_MATCHER,
+    USER_CATEGORY_BOOST,
+    USER_TOPIC_BOOST,
+    topic_matcher,
+    _item_text,
+)
+
+
+def batch_scoring_available() -> bool:
+    return np is not None and sparse is not None
+
+
+def _hit_matrix(texts: List[str], matcher, vocab: Dict[str, int]):
+    """
+    Binary CSR matrix: row i has a 1 for every keyword found in texts[i].
+    """
+    rows, cols = [], []
+    for i, text in enumerate(texts):
+        for kw in matcher.match(text):
+            rows.append(i)
+            cols.append(vocab[kw])
+
+    data = np.ones(len(rows), dtype=np.float64)
+    return sparse.csr_matrix((data, (rows, cols)), shape=(len(texts), len(vocab)))
+
+
+def _published_timestamps(items: List[Dict]):
+    """
+    Naive (UTC) publish times as epoch seconds; NaN when unknown.
+    Aware datetimes drop their tzinfo, as compute_simple_score does.
+    """
+    ts = np.full(len(items), np.nan)
+    for i, it in enumerate(items):
+        pub = it.get("published")
+        if isinstance(pub, datetime):
+            ts[i] = pub.replace(tzinfo=timezone.utc).timestamp()
+    return ts
+
+
+def score_batch(items: List[Dict], user_topics: List[str] = None, top_k: int = None) -> List[Dict]:
+    """
+    Scores + categorizes items in place, reorders `items` best-first
+    and returns them (only the best top_k when given).
+    """
+    if not batch_scoring_available():
+        raise RuntimeError("score_batch needs numpy and scipy installed")
+    if not items:
+        return items
+
+    matcher = KEYWORD_MATCHER
+    texts = [_item_text(it) for it in items]
+
+    # --- keyword matrix (n x V) ---
+    keywords = list(matcher.keyword_categories)
+    vocab = {kw: j for j, kw in enumerate(keywords)}
+    X = _hit_matrix(texts, matcher, vocab)
+
+    # --- category membership (V x C) + per-keyword weights ---
+    cats = matcher.categories
+    cat_index = {c: k for k, c in enumerate(cats)}
+    member = np.zeros((len(keywords), len(cats)))
+    for kw, j in vocab.items():
+        for cat in matcher.keyword_categories[kw]:
+            member[j, cat_index[cat]] = 1.0
+    weights = np.array([matcher.keyword_weight[kw] for kw in keywords])
+
+    # first category (in CATEGORY_KEYWORDS order) with any hit
+    has_cat = np.asarray((X @ member) > 0)
+    first = has_cat.argmax(axis=1)
+    category = np.where(has_cat.any(axis=1), np.array(cats, dtype=object)[first], "General")
+
+    score = np.asarray(X @ weights).ravel()
+
+    # --- recency boost ---
+    now = datetime.utcnow().replace(tzinfo=timezone.utc).timestamp()
+    age_days = np.floor((now - _published_timestamps(items)) / 86400.0)
+    recency = np.clip(1.0 - age_days / 30.0, 0.0, None) * 2.0
+    score += np.nan_to_num(recency, nan=0.0)
+
+    # --- user-topic boosts ---
+    if user_topics:
+        tm = topic_matcher(tuple(user_topics))
+        topic_vocab = {t: j for j, t in enumerate(tm.keyword_categories)}
+        if topic_vocab:
+            T = _hit_matrix(texts, tm, topic_vocab)
+            score += USER_TOPIC_BOOST * np.asarray(T.sum(axis=1)).ravel()
+
+        wanted = {t.strip().lower() for t in user_topics if t}
+        score += USER_CATEGORY_BOOST * np.array([c.lower() in wanted for c in category])
+
+    score = np.round(score, 3)
+
+    for it, cat, sc in zip(items, category, score.tolist()):
+        it["category"] = cat
+        it["score"] = sc
+
+    # --- ranking: stable, best first (like list.sort(reverse=True)) ---
+    if top_k and top_k < len(items):
+        candidates = np.argpartition(-score, top_k - 1)[:top_k]
+        # argpartition breaks ties arbitrarily; keep the earliest items on ties
+        cutoff = score[candidates].min()
+        above = np.flatnonzero(score > cutoff)
+        ties = np.flatnonzero(score == cutoff)[: top_k - len(above)]
+        chosen = np.concatenate([above, ties])
+        order = chosen[np.argsort(-score[chosen], kind="stable")]
+        return [items[i] for i in order]
+
+    order = np.argsort(-score, kind="stable")
+    items[:] = [items[i] for i in order]
+    return items
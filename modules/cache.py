@@ -0,0 +1,144 @@
+# modules/cache.py
+
+import os
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from modules.metrics import METRICS
+
+# Root folder for all persistent caches / state files
+CACHE_DIR = os.getenv("NEWSLETTER_CACHE_DIR", "cache")
+
+
+def cache_path(name: str) -> str:
+    """
+    Returns the path of a file inside CACHE_DIR, creating the folder.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, name)
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# ----------------------------------------------------
+# Persistent key/value cache (SQLite)
+# ----------------------------------------------------
+class SQLiteCache:
+    """
+    Small persistent text cache:
+    - optional TTL in seconds (None = never expires)
+    - LRU eviction once stored values exceed max_bytes
+    - hit / miss / eviction counters via stats()
+
+    Safe to share between threads.
+    """
+
+    def __init__(self, name: str, ttl: Optional[float] = None, max_bytes: int = 50_000_000):
+        self.path = name if name == ":memory:" else cache_path(name)
+        self.name = os.path.splitext(os.path.basename(name))[0]
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache (
+                key          TEXT PRIMARY KEY,
+                value        TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                created_at   REAL NOT NULL,
+                accessed_at  REAL NOT NULL,
+                size         INTEGER NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache(accessed_at)")
+        self._conn.commit()
+
+    def get_entry(self, key: str) -> Optional[Dict]:
+        """
+        Returns {value, content_hash, created_at} or None.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, content_hash, created_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row and self.ttl is not None and now - row[2] > self.ttl:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+
+            if not row:
+                self.misses += 1
+                METRICS.inc("cache_lookups_total", cache=self.name, result="miss")
+                return None
+
+            self.hits += 1
+            METRICS.inc("cache_lookups_total", cache=self.name, result="hit")
+            self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+
+        return {"value": row[0], "content_hash": row[1], "created_at": row[2]}
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self.get_entry(key)
+        return entry["value"] if entry else None
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?, ?)",
+                (key, value, content_hash(value), now, now, size)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Drop least recently used rows until we are back under the cap
+        rows = self._conn.execute("SELECT key, size FROM cache ORDER BY accessed_at ASC").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+            METRICS.inc("cache_evictions_total", cache=self.name)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": entries,
+            "bytes": total,
+        }
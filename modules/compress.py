@@ -0,0 +1,128 @@
+# modules/compress.py
+"""
+Extractive pre-compression of article text before it goes to the LLM.
+
+Instead of the first N characters (often bylines, share prompts and
+boilerplate), the prompt gets the most informative sentences of the
+whole article that fit a token budget:
+
+- split into sentences, drop fragments and boilerplate-looking lines
+- drop near-duplicate sentences (word-set overlap)
+- score sentences by TF-IDF over the article's own sentences, plus a
+  small boost for title words and for the lead
+- pick the best sentences into the budget, keep them in article order
+"""
+
+import math
+import re
+from collections import Counter
+from typing import List, Set
+
+CHARS_PER_TOKEN = 4
+
+MIN_SENTENCE_WORDS = 5
+DUPLICATE_OVERLAP = 0.7     # word-set Jaccard that counts as a repeat
+TITLE_BOOST = 0.5           # per title word in the sentence (relative)
+LEAD_SENTENCES = 3          # the first few sentences get a small boost
+LEAD_BOOST = 0.2
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])[\"')\]]*\s+(?=[\"'(\[]?[A-Z0-9])|\n\s*\n")
+_WORD_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+# Lines that are page furniture rather than article text
+_BOILERPLATE_RE = re.compile(
+    r"^(advertisement|sign up|subscribe|read more|related:|share (this|on)|"
+    r"follow us|click here|all rights reserved|copyright|photo:|image:)",
+    re.IGNORECASE
+)
+
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been
+before being below between both but by can could did do does doing down during
+each few for from further had has have having he her here hers him his how i if
+in into is it its itself just me more most my no nor not now of off on once only
+or other our ours out over own said same she should so some such than that the
+their theirs them then there these they this those through to too under until up
+very was we were what when where which while who whom why will with would you
+your yours also says new one two
+""".split())
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in _SENTENCE_RE.split(text or "") if s and s.strip()]
+
+
+def content_words(text: str) -> List[str]:
+    return [w for w in _WORD_RE.findall(text.lower()) if w not in STOPWORDS and len(w) > 1]
+
+
+def _is_noise(sentence: str, words: List[str]) -> bool:
+    return len(sentence.split()) < MIN_SENTENCE_WORDS or not words or bool(_BOILERPLATE_RE.match(sentence))
+
+
+def _overlap(a: Set[str], b: Set[str]) -> float:
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def compress_text(text: str, token_budget: int, title: str = "") -> str:
+    """
+    The most informative sentences of `text` within token_budget
+    (estimated), in their original order. Text already within the
+    budget is returned unchanged.
+    """
+    text = (text or "").strip()
+    if estimate_tokens(text) <= token_budget:
+        return text
+
+    # Candidate sentences: no fragments / boilerplate / repeats
+    candidates = []
+    kept_sets: List[Set[str]] = []
+    for sentence in split_sentences(text):
+        words = content_words(sentence)
+        if _is_noise(sentence, words):
+            continue
+        word_set = set(words)
+        if any(_overlap(word_set, seen) >= DUPLICATE_OVERLAP for seen in kept_sets):
+            continue
+        kept_sets.append(word_set)
+        candidates.append((sentence, words))
+
+    if not candidates:
+        return text[:token_budget * CHARS_PER_TOKEN]
+
+    # TF-IDF with the article's sentences as the documents
+    n = len(candidates)
+    df = Counter(w for _, words in candidates for w in set(words))
+    idf = {w: math.log((1 + n) / (1 + d)) + 1.0 for w, d in df.items()}
+    title_words = set(content_words(title))
+
+    scored = []
+    for pos, (sentence, words) in enumerate(candidates):
+        tf = Counter(words)
+        weight = sum((1 + math.log(c)) * idf[w] for w, c in tf.items())
+        score = weight / math.sqrt(len(words))
+        score *= 1 + TITLE_BOOST * len(title_words & tf.keys()) / (len(title_words) or 1)
+        if pos < LEAD_SENTENCES:
+            score *= 1 + LEAD_BOOST
+        scored.append((score, pos))
+
+    # Best first into the budget; anything that doesn't fit is skipped
+    # so a shorter, lower-ranked sentence can still use the room
+    chosen, used = [], 0
+    for score, pos in sorted(scored, reverse=True):
+        cost = estimate_tokens(candidates[pos][0])
+        if used + cost > token_budget:
+            continue
+        chosen.append(pos)
+        used += cost
+
+    if not chosen:
+        # Every sentence is over budget on its own: cut the best one
+        best = max(scored)[1]
+        return candidates[best][0][:token_budget * CHARS_PER_TOKEN]
+
+    return " ".join(candidates[pos][0] for pos in sorted(chosen))
@@ -1,20 +1,34 @@
 # modules/curate.py
 import os
-import requests
-from typing import List, Dict, Set
+import json
+from typing import Callable, List, Dict, Set
 from datetime import datetime
 
+from modules.archive_index import COVERED_DAYS, ArchiveIndex, get_archive
+from modules.article import Article
 from modules.rss_ingest import fetch_multiple_feeds
-from modules.web_scraper import fetch_article_text
+from modules.feed_state import FeedStateStore
+from modules.http_client import fetch
+from modules.metrics import METRICS, timed
+from modules.dedup import NearDuplicateIndex, dedup_text
+from modules.web_scraper import fetch_many_article_texts, SCRAPE_DEADLINE
 
 
 # -------------------------------
-# Load NewsAPI Key
+# NewsAPI Key (read when first needed, not at import)
 # -------------------------------
-NEWSAPI_KEY = os.getenv("NEWSAPI_KEY")
+_newsapi_warned = False
 
-if not NEWSAPI_KEY:
-    print("Warning: NEWSAPI_KEY not found in .env — NewsAPI headlines will be skipped.")
+
+def newsapi_key() -> str:
+    global _newsapi_warned
+    key = os.getenv("NEWSAPI_KEY")
+
+    if not key and not _newsapi_warned:
+        _newsapi_warned = True
+        print("Warning: NEWSAPI_KEY not found in .env — NewsAPI headlines will be skipped.")
+
+    return key
 
 
 # -------------------------------
@@ -32,31 +46,33 @@ DEFAULT_FEEDS = [
 # Fetch from NewsAPI
 # -------------------------------
 def fetch_newsapi_headlines(country="us", page_size=10) -> List[Dict]:
-    if not NEWSAPI_KEY:
+    api_key = newsapi_key()
+    if not api_key:
         return []
 
     try:
         url = (
             "https://newsapi.org/v2/top-headlines"
-            f"?country={country}&pageSize={page_size}&apiKey={NEWSAPI_KEY}"
+            f"?country={country}&pageSize={page_size}&apiKey={api_key}"
         )
 
-        res = requests.get(url, timeout=8)
-        res.raise_for_status()
-        data = res.json()
+        res = fetch(url, timeout=8)
+        data = json.loads(res["body"])
 
         output = []
         for art in data.get("articles", []):
-            output.append({
-                "title": art.get("title"),
-                "link": art.get("url"),
-                "published": art.get("publishedAt"),
-                "summary": art.get("description") or "",
-            })
+            output.append(Article(
+                title=art.get("title"),
+                link=art.get("url"),
+                published=art.get("publishedAt"),
+                summary=art.get("description") or "",
+                source=(art.get("source") or {}).get("name") or "NewsAPI",
+            ))
 
         return output
 
     except Exception as e:
+        METRICS.inc("errors_total", stage="newsapi")
         print("NewsAPI fetch error:", e)
         return []
 
@@ -64,9 +80,16 @@ def fetch_newsapi_headlines(country="us", page_size=10) -> List[Dict]:
 # -------------------------------
 # Main Curation Pipeline
 # -------------------------------
+@timed("curate")
 def curate_articles(
     feeds: List[str] = None,
-    max_items: int = 30
+    max_items: int = 30,
+    scrape_deadline: float = SCRAPE_DEADLINE,
+    only_new: bool = False,
+    feed_state: FeedStateStore = None,
+    skip: Callable[[Dict], bool] = None,
+    archive: ArchiveIndex = None,
+    covered_days: float = COVERED_DAYS
 ) -> List[Dict]:
     """
     Returns curated list of articles:
@@ -79,68 +102,139 @@ def curate_articles(
         summary: str,
         content: str,
         category: str,
+        source: str,
         score: float
     }
+
+    Items are Article records (modules/article.py), which behave
+    like these dicts.
+
+    only_new=True sends conditional feed requests and keeps only
+    entries not seen on a previous run (see FeedStateStore); pass
+    feed_state to use a specific store instead. Entries count as seen
+    once this run has looked at them (kept or deliberately dropped);
+    entries cut by max_items come back next time, and until then the
+    feed's requests are not conditional.
+
+    skip(item) -> True leaves an item out before scraping (e.g. it is
+    already stored and unchanged); skipped items don't count toward
+    max_items.
+
+    Stories a newsletter already covered in the last covered_days
+    (see ArchiveIndex; 0 = keep them) are dropped the same way.
     """
 
     feeds = feeds or DEFAULT_FEEDS
     collected: List[Dict] = []
 
     # 1. RSS Feeds
-    collected.extend(fetch_multiple_feeds(feeds))
+    state = feed_state or (FeedStateStore() if only_new else None)
+    collected.extend(fetch_multiple_feeds(feeds, state=state))
 
     # 2. NewsAPI
     collected.extend(fetch_newsapi_headlines())
 
     # ----------------------------------
-    # Deduplicate by link or title
+    # Deduplicate by link or title, then drop near-duplicates
+    # (syndicated copies) and stories a recent newsletter already
+    # covered, before they cost a scrape or LLM call
     # ----------------------------------
     seen: Set[str] = set()
+    near_dups = NearDuplicateIndex()
     cleaned: List[Dict] = []
+    examined: List[Dict] = []
+    dropped = 0
+    covered = 0
+
+    if covered_days and archive is None:
+        archive = get_archive()
+        if archive is None:
+            covered_days = 0
 
     for item in collected:
-        link = item.get("link") or ""
-        title = item.get("title") or ""
+        if len(cleaned) >= max_items:
+            break
 
-        key = link if link else title[:100]
+        examined.append(item)
+        key = dedup_key(item)
 
         if key in seen:
             continue
 
         seen.add(key)
+
+        if near_dups.add(dedup_text(item)):
+            dropped += 1
+            continue
+
+        if skip and skip(item):
+            continue
+
+        if covered_days and archive.covered(item, covered_days):
+            covered += 1
+            continue
+
         cleaned.append(item)
 
-        if len(cleaned) >= max_items:
-            break
+    if dropped:
+        METRICS.inc("near_duplicates_dropped_total", dropped)
+        print(f"Dropped {dropped} near-duplicate article(s)")
+
+    if covered:
+        METRICS.inc("covered_dropped_total", covered)
+        print(f"Dropped {covered} article(s) already covered in the last {covered_days:g} day(s)")
 
     # ----------------------------------
     # Scrape full content & add URLs
     # ----------------------------------
+    # Scrape all links concurrently; anything that fails or misses
+    # the deadline comes back as None and falls back to the summary
+    texts = fetch_many_article_texts(
+        [item.get("link") for item in cleaned],
+        deadline=scrape_deadline
+    )
+
     for item in cleaned:
         link = item.get("link")
+        finalize_item(item, texts.get(link) if link else None)
+
+    if state is not None:
+        state.mark_seen(examined)
+        state.save()
+
+    return cleaned
 
-        # RSS URL always stored
-        item["rss_url"] = link
 
-        # Scrape article text
-        text = None
-        if link:
-            try:
-                text = fetch_article_text(link)
-            except Exception as e:
-                print(f"Scrape failed: {link}", e)
+def dedup_key(item: Dict) -> str:
+    """
+    Exact-duplicate key: the link, or the title when there is no link.
+    """
+    link = item.get("link") or ""
+    title = item.get("title") or ""
+    return link if link else title[:100]
+
+
+def finalize_item(item: Dict, text: str = None) -> Dict:
+    """
+    Fills content / URLs / placeholders once scraping is done.
+    `text` is the scraped article text (None falls back to the summary).
+    """
+    link = item.get("link")
 
-        item["content"] = text or item.get("summary") or ""
+    # RSS URL always stored
+    item["rss_url"] = link
 
-        # fallback title
-        if not item.get("title"):
-            item["title"] = item["content"][:60] + "..."
+    item["content"] = text or item.get("summary") or ""
 
-        # scraped_url is same as link for now (can change later)
-        item["scraped_url"] = link
+    # fallback title
+    if not item.get("title"):
+        item["title"] = item["content"][:60] + "..."
 
-        # Placeholders
-        item["category"] = "Uncategorized"
-        item["score"] = 0.0
+    # scraped_url is same as link for now (can change later)
+    item["scraped_url"] = link
 
-    return cleaned
+    # Placeholders
+    item["category"] = "Uncategorized"
+    item["score"] = 0.0
+
+    return item
@@ -0,0 +1,126 @@
+# modules/dedup.py
+"""
+Near-duplicate detection with MinHash + LSH banding.
+
+Syndicated stories show up on several feeds / NewsAPI with slightly
+different titles and summaries. Each item's title + summary is turned
+into word shingles, summarized by a MinHash signature, and bucketed by
+band; only items sharing a bucket are compared, so the cost grows
+roughly linearly with the number of items instead of quadratically.
+"""
+
+import re
+import random
+import hashlib
+from typing import Dict, List, Tuple
+
+NUM_PERM = 64           # signature length
+BANDS = 16              # LSH bands (NUM_PERM / BANDS rows each)
+SHINGLE_SIZE = 3        # words per shingle
+THRESHOLD = 0.6         # estimated Jaccard similarity that counts as a duplicate
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def _numpy():
+    """
+    numpy if installed (optional: speeds up signatures). Imported when
+    the first index is built rather than when this module is.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _hash_masks(num_perm: int, seed: int = 1) -> List[int]:
+    """
+    One random 64-bit XOR mask per "permutation". Shingle hashes are
+    already uniformly random, so x ^ mask reorders them independently
+    per mask at a fraction of the cost of (a * x + b) % p.
+    """
+    rng = random.Random(seed)
+    return [rng.getrandbits(64) for _ in range(num_perm)]
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    """
+    Hashed word n-grams of the text (HTML tags stripped, lowercased).
+    """
+    words = _WORD_RE.findall(_TAG_RE.sub(" ", text or "").lower())
+    if len(words) < size:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+    return {
+        int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "big")
+        for g in grams
+    }
+
+
+class NearDuplicateIndex:
+    """
+    Incremental MinHash/LSH index: add() returns True when the text
+    is a near-duplicate of something already added (and then does
+    not store it), so the first copy of a story wins.
+    """
+
+    def __init__(self, threshold: float = THRESHOLD, num_perm: int = NUM_PERM, bands: int = BANDS):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._masks = _hash_masks(num_perm)
+        np = self._np = _numpy()
+        self._np_masks = np.array(self._masks, dtype=np.uint64)[:, None] if np is not None else None
+        self._signatures: List[Tuple[int, ...]] = []
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+
+    def signature(self, shingle_set: set) -> Tuple[int, ...]:
+        if self._np_masks is not None:
+            np = self._np
+            values = np.fromiter(shingle_set, dtype=np.uint64, count=len(shingle_set))
+            return tuple((values[None, :] ^ self._np_masks).min(axis=1).tolist())
+        return tuple(min(x ^ m for x in shingle_set) for m in self._masks)
+
+    @staticmethod
+    def similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+        """
+        Estimated Jaccard similarity of two signatures.
+        """
+        return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+    def _bands(self, sig: Tuple[int, ...]):
+        for band in range(self.bands):
+            yield band, sig[band * self.rows:(band + 1) * self.rows]
+
+    def add(self, text: str) -> bool:
+        shingle_set = shingles(text)
+        if not shingle_set:
+            return False
+
+        sig = self.signature(shingle_set)
+
+        candidates = set()
+        for key in self._bands(sig):
+            candidates.update(self._buckets.get(key, ()))
+
+        for idx in candidates:
+            if self.similarity(sig, self._signatures[idx]) >= self.threshold:
+                return True
+
+        idx = len(self._signatures)
+        self._signatures.append(sig)
+        for key in self._bands(sig):
+            self._buckets.setdefault(key, []).append(idx)
+        return False
+
+
+def dedup_text(item: Dict) -> str:
+    return f"{item.get('title') or ''} {item.get('summary') or ''}"
+
@@ -0,0 +1,208 @@
+# modules/fanout.py
+"""
+Multi-audience fan-out: one ingestion pass, many newsletters.
+
+Articles are curated and scored once. Each segment (a subscriber
+group) picks its own top_n from that shared pool using its topics and
+categories. Summary requests are deduplicated across segments by
+(article, tone, length), so LLM cost grows with the number of distinct
+summaries rather than the number of segments. The renders are spread
+over worker processes.
+
+A segment is a plain dict (missing keys fall back to SEGMENT_DEFAULTS):
+
+    {
+        "name": "ai-casual",
+        "topics": ["ai", "chips"],      # boost, like run_scoring(user_topics=...)
+        "categories": ["AI", "Tech"],   # only these categories (empty = all)
+        "template": "tech",
+        "tone": "casual",
+        "length": "short",
+        "top_n": 8
+    }
+
+Segment names key the results and name the saved files, so they must
+stay distinct after segment_slug(); generate_fanout raises ValueError
+otherwise.
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+from modules.curate import curate_articles, dedup_key
+from modules.generator import group_sections, render_newsletter
+from modules.metrics import METRICS, timed
+from modules.scoring import run_scoring, user_topic_boost
+from modules.summary import summarize_articles
+
+SEGMENT_DEFAULTS = {
+    "topics": [],
+    "categories": [],
+    "template": "professional",
+    "tone": "professional",
+    "length": "short",
+    "top_n": 8,
+}
+
+# Shared pool: large enough that segments with different topics still
+# find their own articles
+POOL_SIZE = 60
+
+RENDER_WORKERS = int(os.getenv("FANOUT_RENDER_WORKERS", os.cpu_count() or 1))
+
+# Below this many newsletters, starting worker processes costs more
+# than rendering them in-process
+PROCESS_RENDER_MIN = 8
+
+
+_SLUG_RE = re.compile(r"[^\w.-]+")
+
+
+def segment_slug(name: str) -> str:
+    """
+    File-name form of a segment name.
+    """
+    return _SLUG_RE.sub("_", name)
+
+
+def normalize_segment(segment: Dict, index: int = 0) -> Dict:
+    seg = {**SEGMENT_DEFAULTS, **segment}
+    seg["name"] = str(seg.get("name") or f"segment-{index + 1}")
+    return seg
+
+
+def normalize_segments(segments: List[Dict]) -> List[Dict]:
+    """
+    normalize_segment() for each segment; raises ValueError when two
+    names are the same, also after segment_slug() and ignoring case
+    (their newsletters would overwrite each other).
+    """
+    normalized = [normalize_segment(seg, i) for i, seg in enumerate(segments)]
+    names: Dict[str, str] = {}
+    for seg in normalized:
+        slug = segment_slug(seg["name"]).lower()
+        if slug in names:
+            raise ValueError(
+                f"segment names {names[slug]!r} and {seg['name']!r} clash "
+                f"(both saved as {segment_slug(seg['name'])}.html)"
+            )
+        names[slug] = seg["name"]
+    return normalized
+
+
+# ----------------------------
+# Per-segment selection
+# ----------------------------
+def select_for_segment(items: List[Dict], segment: Dict) -> List[Dict]:
+    """
+    The segment's top_n from the shared, already scored pool. Segment
+    scores are computed on the side; the shared items aren't modified.
+    """
+    categories = {c.lower() for c in segment["categories"] if c}
+    topics = segment["topics"]
+
+    ranked = []
+    for item in items:
+        category = item.get("category", "General")
+        if categories and category.lower() not in categories:
+            continue
+        ranked.append((item.get("score", 0.0) + user_topic_boost(item, category, topics), item))
+
+    # Stable sort: ties keep the pool order
+    ranked.sort(key=lambda x: x[0], reverse=True)
+    return [item for _, item in ranked[:segment["top_n"]]]
+
+
+# ----------------------------
+# Deduplicated summaries
+# ----------------------------
+@timed("fanout_summarize")
+def summarize_unique(
+    selections: List[List[Dict]],
+    segments: List[Dict],
+    batch: bool = False,
+    llm=None
+) -> Dict[Tuple[str, str, str], str]:
+    """
+    One summary per distinct (article, tone, length) across all
+    segments: {(dedup_key(article), tone, length): summary}.
+    """
+    wanted: Dict[Tuple[str, str], Dict[str, Dict]] = {}
+    requested = 0
+
+    for seg, selected in zip(segments, selections):
+        group = wanted.setdefault((seg["tone"], seg["length"]), {})
+        for item in selected:
+            requested += 1
+            group.setdefault(dedup_key(item), item)
+
+    summaries = {}
+    for (tone, length), by_key in wanted.items():
+        keys = list(by_key)
+        texts = summarize_articles(
+            [by_key[k] for k in keys], tone=tone, length=length, llm=llm, batch=batch
+        )
+        for key, text in zip(keys, texts):
+            summaries[(key, tone, length)] = text
+
+    METRICS.inc("fanout_summaries_requested_total", requested)
+    METRICS.inc("fanout_summaries_unique_total", len(summaries))
+    return summaries
+
+
+# ----------------------------
+# Parallel rendering
+# ----------------------------
+def _render_job(job: Tuple[Dict, str, str, str]) -> str:
+    sections, template_name, tone, length = job
+    return render_newsletter(sections, template_name, tone, length)
+
+
+@timed("fanout_render")
+def render_all(jobs: List[Tuple[Dict, str, str, str]], workers: int = RENDER_WORKERS) -> List[str]:
+    """
+    Renders (sections, template_name, tone, length) jobs, in order.
+    Only the small sections dicts and the HTML cross process boundaries.
+    """
+    if workers <= 1 or len(jobs) < PROCESS_RENDER_MIN:
+        return [_render_job(job) for job in jobs]
+
+    workers = min(workers, len(jobs))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_render_job, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+
+# ----------------------------
+# Fan-out
+# ----------------------------
+@timed("fanout")
+def generate_fanout(
+    segments: List[Dict],
+    items: List[Dict] = None,
+    feeds: List[str] = None,
+    pool_size: int = POOL_SIZE,
+    batch: bool = False,
+    llm=None,
+    render_workers: int = RENDER_WORKERS
+) -> Dict[str, str]:
+    """
+    {segment name: html} for every segment from a single curate +
+    score pass (pass already scored `items` to skip curation).
+    """
+    segments = normalize_segments(segments)
+
+    if items is None:
+        items = run_scoring(curate_articles(feeds=feeds, max_items=pool_size))
+
+    selections = [select_for_segment(items, seg) for seg in segments]
+    summaries = summarize_unique(selections, segments, batch=batch, llm=llm)
+
+    jobs = []
+    for seg, selected in zip(segments, selections):
+        texts = [summaries[(dedup_key(item), seg["tone"], seg["length"])] for item in selected]
+        jobs.append((group_sections(selected, texts), seg["template"], seg["tone"], seg["length"]))
+
+    rendered = render_all(jobs, workers=render_workers)
+    return {seg["name"]: html for seg, html in zip(segments, rendered)}
@@ -0,0 +1,174 @@
+# modules/feed_state.py
+
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from modules.cache import cache_path
+
+# How many entry IDs to remember per feed
+MAX_SEEN_IDS = 500
+
+
+def _epoch(published) -> Optional[float]:
+    # Feed dates are naive UTC
+    if not isinstance(published, datetime):
+        return None
+    return published.replace(tzinfo=timezone.utc).timestamp()
+
+
+class FeedStateStore:
+    """
+    Persistent per-feed state used for conditional GETs:
+
+    {
+        feed_url: {
+            etag: str,
+            modified: str,
+            seen_ids: [str, ...],
+            pending: {entry_id: published},   # returned, not used yet
+            last_published: float,   # newest entry seen (epoch seconds)
+            checked_at: float
+        }
+    }
+
+    Entry IDs returned by filter_new() stay pending until mark_seen()
+    is called for the items the run actually used, so entries cut by
+    max_items, or lost to a crash, come back next run.
+
+    The same goes for a response's ETag / Last-Modified: hold_validators()
+    keeps them in memory and mark_seen() stores them once the feed has
+    no pending entries left. While entries are pending the feed is
+    fetched unconditionally, so a 304 can't hide them.
+    """
+
+    def __init__(self, path: str = None, filter_seen: bool = True):
+        self.path = path or cache_path("feed_state.json")
+        # False = conditional GETs only, keep returning every entry
+        self.filter_seen = filter_seen
+        self._lock = threading.Lock()
+        self._data: Dict[str, Dict] = {}
+        # feed_url -> (etag, modified) of a response not yet consumed
+        self._held: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._data = json.load(f)
+            except Exception as e:
+                print(f"[FEED STATE] Could not read {self.path}: {e}")
+                self._data = {}
+
+    def _feed(self, feed_url: str) -> Dict:
+        return self._data.setdefault(feed_url, {"seen_ids": []})
+
+    def conditional_args(self, feed_url: str) -> Dict:
+        """
+        etag / modified kwargs for feedparser.parse(); none while
+        entries from an earlier fetch are still pending.
+        """
+        with self._lock:
+            state = self._data.get(feed_url, {})
+            args = {}
+            if state.get("pending"):
+                return args
+            if state.get("etag"):
+                args["etag"] = state["etag"]
+            if state.get("modified"):
+                args["modified"] = state["modified"]
+            return args
+
+    def hold_validators(self, feed_url: str, etag: str = None, modified: str = None):
+        """
+        Validators of a fetched response; mark_seen() stores them once
+        its entries have been used.
+        """
+        with self._lock:
+            self._held[feed_url] = (etag, modified)
+            self._feed(feed_url)["checked_at"] = time.time()
+
+    def touch(self, feed_url: str):
+        with self._lock:
+            self._feed(feed_url)["checked_at"] = time.time()
+
+    def filter_new(self, feed_url: str, entries: Iterable[Tuple[str, Optional[datetime]]]) -> List[str]:
+        """
+        Returns the IDs of the (entry_id, published) entries not seen
+        before (all of them when filter_seen is False). They replace
+        the feed's pending entries until mark_seen() is called.
+        """
+        with self._lock:
+            state = self._feed(feed_url)
+            seen = set(state["seen_ids"]) if self.filter_seen else set()
+            new = {eid: _epoch(published) for eid, published in entries if eid not in seen}
+            # Entries that dropped out of the feed stop being pending
+            state["pending"] = new
+            return list(new)
+
+    def seen_ids(self, feed_url: str) -> Set[str]:
+        with self._lock:
+            return set(self._data.get(feed_url, {}).get("seen_ids", []))
+
+    def pending_ids(self, feed_url: str) -> Set[str]:
+        with self._lock:
+            return set(self._data.get(feed_url, {}).get("pending") or ())
+
+    def mark_seen(self, items: Iterable[Dict]):
+        """
+        Remembers the feed entries behind `items` (by their "source"
+        feed and "entry_id"). last_published moves up to the newest
+        kept entry, but never past a pending one, so the streaming
+        reader doesn't stop before entries the run left out.
+
+        Held validators are stored for feeds with nothing pending.
+        """
+        by_feed: Dict[str, List[Dict]] = {}
+        for item in items:
+            if item.get("source") and item.get("entry_id"):
+                by_feed.setdefault(item["source"], []).append(item)
+
+        with self._lock:
+            for feed_url, kept in by_feed.items():
+                state = self._feed(feed_url)
+                pending = state.get("pending") or {}
+
+                ids = [it["entry_id"] for it in kept]
+                for eid in ids:
+                    pending.pop(eid, None)
+                seen = set(state["seen_ids"])
+                state["seen_ids"] = (state["seen_ids"] + [i for i in ids if i not in seen])[-MAX_SEEN_IDS:]
+
+                stamps = [_epoch(it.get("published")) for it in kept]
+                stamps = [s for s in stamps if s is not None]
+                if not stamps:
+                    continue
+                newest = max(stamps)
+                waiting = [s for s in pending.values() if s is not None]
+                if waiting:
+                    newest = min(newest, min(waiting))
+                state["last_published"] = max(newest, state.get("last_published") or 0.0)
+
+            for feed_url, (etag, modified) in list(self._held.items()):
+                state = self._feed(feed_url)
+                if state.get("pending"):
+                    continue
+                state["etag"], state["modified"] = etag, modified
+                del self._held[feed_url]
+
+    def last_published(self, feed_url: str) -> Optional[datetime]:
+        """
+        Publish time (naive UTC) of the newest entry seen, if any.
+        """
+        with self._lock:
+            ts = self._data.get(feed_url, {}).get("last_published")
+        return datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None) if ts else None
+
+    def save(self):
+        with self._lock:
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._data, f)
+            os.replace(tmp, self.path)
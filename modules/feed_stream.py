@@ -0,0 +1,187 @@
+# modules/feed_stream.py
+"""
+Streaming RSS / Atom reader with bounded memory.
+
+feedparser builds every entry of a document before we look at the
+first one, so a 10k-entry archive feed costs 10k entries of CPU and
+memory even when we keep eight. This reader pushes the raw bytes into
+an incremental XML parser, normalizes each <item> / <entry> as soon
+as it closes, frees it, and stops pulling bytes once it has
+max_items entries, or once it runs into entries older than what was
+already seen.
+
+Items have the same shape as rss_ingest.parse_feed_bytes. Anything
+that is not well-formed XML (HTML entities without a DTD, broken
+markup) raises FeedStreamError so the caller can fall back to
+feedparser, which is more forgiving.
+"""
+
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from modules.article import Article
+
+ATOM = "http://www.w3.org/2005/Atom"
+CONTENT = "http://purl.org/rss/1.0/modules/content/"
+DC = "http://purl.org/dc/elements/1.1/"
+
+ENTRY_TAGS = {"item", "entry"}
+
+# Entries are assumed newest-first; stop after this many in a row that
+# are older than the last-seen timestamp and already seen (tolerates a
+# few out-of-order entries)
+STALE_RUN = 3
+
+
+class FeedStreamError(Exception):
+    pass
+
+
+def _split(tag: str) -> Tuple[str, str]:
+    if tag.startswith("{"):
+        ns, local = tag[1:].split("}", 1)
+        return ns, local
+    return "", tag
+
+
+def _text(elem) -> str:
+    if elem.get("type") == "xhtml":
+        return "".join(ET.tostring(child, encoding="unicode") for child in elem).strip()
+    return (elem.text or "").strip()
+
+
+def parse_date(value: str) -> Optional[datetime]:
+    """
+    RFC 822 (RSS) or ISO 8601 (Atom) date -> naive UTC datetime.
+    """
+    value = (value or "").strip()
+    if not value:
+        return None
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if dt.tzinfo:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def normalize_entry(elem) -> Tuple[str, Dict, Optional[datetime]]:
+    """
+    (entry_id, item, updated) for one <item> / <entry> element.
+    `updated` (published, else updated) is only used for cut-offs.
+    """
+    fields: Dict[str, str] = {}
+    link = ""
+    category = None
+
+    for child in elem:
+        ns, local = _split(child.tag)
+
+        if local == "link":
+            if ns == ATOM or child.get("href"):
+                if child.get("rel", "alternate") == "alternate" and not link:
+                    link = child.get("href", "")
+            elif not link:
+                link = _text(child)
+        elif local == "category" and category is None:
+            category = child.get("term") or _text(child) or None
+        elif ns == CONTENT and local == "encoded":
+            fields.setdefault("content", _text(child))
+        elif ns == DC and local == "date":
+            fields.setdefault("updated", _text(child))
+        elif local in ("title", "guid", "id", "pubDate", "published", "updated",
+                       "description", "summary", "content"):
+            fields.setdefault(local, _text(child))
+
+    # Same fields / fallbacks as rss_ingest.parse_feed_bytes
+    published = parse_date(fields.get("pubDate") or fields.get("published"))
+    summary_text = fields.get("summary") or fields.get("description") or ""
+    content = fields.get("content") or summary_text
+    title = fields.get("title") or "No Title"
+
+    item = Article(
+        title=title,
+        link=link,
+        rss_url=link,
+        published=published,
+        summary=summary_text or content[:200],
+        content=content,
+        category=category or "General",
+        score=0.0
+    )
+
+    entry_id = fields.get("guid") or fields.get("id") or link or fields.get("title", "")
+    return entry_id, item, published or parse_date(fields.get("updated"))
+
+
+def iter_feed_entries(chunks: Iterable[bytes]) -> Iterator[Tuple[str, Dict, Optional[datetime]]]:
+    """
+    Yields normalized entries while the document is still arriving.
+    Stop iterating to stop reading `chunks`.
+    """
+    parser = ET.XMLPullParser(events=("end",))
+    saw_root = False
+
+    try:
+        for chunk in chunks:
+            parser.feed(chunk)
+            for _, elem in parser.read_events():
+                saw_root = True
+                if _split(elem.tag)[1] in ENTRY_TAGS:
+                    yield normalize_entry(elem)
+                    elem.clear()
+        parser.close()
+        for _, elem in parser.read_events():
+            if _split(elem.tag)[1] in ENTRY_TAGS:
+                yield normalize_entry(elem)
+    except ET.ParseError as e:
+        raise FeedStreamError(str(e)) from e
+
+    if not saw_root:
+        raise FeedStreamError("empty document")
+
+
+def parse_feed_stream(
+    chunks: Iterable[bytes],
+    max_items: int = 10,
+    newer_than: datetime = None,
+    seen_ids: Set[str] = None,
+    pending_ids: Set[str] = None
+) -> List[Tuple[str, Dict]]:
+    """
+    [(entry_id, item)] for up to max_items entries. With newer_than
+    (naive UTC), entries older than it (and, given seen_ids, already
+    seen) are skipped, and reading stops after STALE_RUN of them in a
+    row, but not before every entry in pending_ids (returned by an
+    earlier run and not used yet) has been read. An old entry that
+    was never seen is still returned, so a feed that is not
+    newest-first can't lose it.
+    """
+    items = []
+    stale = 0
+    waiting = set(pending_ids or ())
+    entries = iter_feed_entries(chunks)
+
+    try:
+        for entry_id, item, updated in entries:
+            waiting.discard(entry_id)
+            if (newer_than is not None and updated is not None and updated < newer_than
+                    and (seen_ids is None or entry_id in seen_ids)):
+                stale += 1
+                if stale >= STALE_RUN and not waiting:
+                    break
+                continue
+            stale = 0
+            items.append((entry_id, item))
+            if len(items) >= max_items:
+                break
+    finally:
+        entries.close()
+
+    return items
@@ -1,14 +1,90 @@
 # modules/generator.py
-from jinja2 import Environment, FileSystemLoader
-from modules.summary import summarize_article
+import os
+import threading
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple
 
+from modules.cache import cache_path
+from modules.summary import summarize_articles
+from modules.metrics import timed
 
+# jinja2 is imported with the shared Environment
+if TYPE_CHECKING:
+    from jinja2 import Environment
+
+# Absolute, so rendering doesn't depend on the working directory
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates")
+
+# Dev mode re-reads edited templates on every render; otherwise each
+# template is compiled once per process (and once per machine via the
+# bytecode cache)
+TEMPLATE_DEV_MODE = os.getenv("NEWSLETTER_TEMPLATE_DEV", "").lower() in ("1", "true", "yes")
+
+NEWSLETTER_TITLE = "AI-Powered Daily Newsletter"
+
+# (template_name, tone, length)
+Variant = Tuple[str, str, str]
+
+
+# ----------------------------
+# Template environment
+# ----------------------------
+_env = None
+_env_lock = threading.Lock()
+
+
+def get_template_env() -> "Environment":
+    """
+    One shared Jinja Environment per process: compiled templates stay
+    in memory, and their bytecode is cached under cache/jinja/.
+    """
+    global _env
+    with _env_lock:
+        if _env is None:
+            from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+            bytecode_dir = cache_path("jinja")
+            os.makedirs(bytecode_dir, exist_ok=True)
+            _env = Environment(
+                loader=FileSystemLoader(TEMPLATES_DIR),
+                bytecode_cache=FileSystemBytecodeCache(bytecode_dir),
+                auto_reload=TEMPLATE_DEV_MODE,
+            )
+        return _env
+
+
+def template_names() -> List[str]:
+    """
+    Available template names (file names in templates/ without .html).
+    """
+    return sorted(
+        os.path.splitext(name)[0]
+        for name in get_template_env().list_templates(extensions=["html"])
+    )
+
+
+def precompile_templates(names: Iterable[str] = None) -> List[str]:
+    """
+    Loads (compiles) every template up front so the first render of
+    each one doesn't pay for parsing. Returns the names loaded.
+    """
+    env = get_template_env()
+    names = list(names) if names is not None else template_names()
+    for name in names:
+        env.get_template(f"{name}.html")
+    return names
+
+
+# ----------------------------
+# Newsletter generation
+# ----------------------------
 def generate_newsletter(
         items,
         template_name="professional",     # default is your new UI
         tone="professional",
         length="short",
-        top_n=8
+        top_n=8,
+        batch=False,
+        llm=None
     ):
     """
     Generates a complete HTML newsletter with:
@@ -16,48 +92,117 @@ def generate_newsletter(
     - Personalized tone & summary length
     - Supports rss_url + scraped_url
     - Professional templates
+
+    batch=True packs several articles into each LLM request
+    instead of one request per article. llm overrides the shared
+    Gemini client (any object with invoke(prompt) -> str).
     """
+    sections = build_sections(items, tone=tone, length=length, top_n=top_n, batch=batch, llm=llm)
+    return render_newsletter(sections, template_name, tone, length)
 
-    # Load templates folder
-    env = Environment(loader=FileSystemLoader("templates"))
-    template = env.get_template(f"{template_name}.html")
 
-    # Select top-N by score (handled in scoring later)
-    selected = sorted(items, key=lambda x: x.get("score", 0), reverse=True)[:top_n]
+def generate_variants(
+        items,
+        variants: Iterable[Variant],
+        top_n=8,
+        batch=False,
+        llm=None
+    ) -> Dict[Variant, str]:
+    """
+    Several newsletters from one set of items:
+    {(template_name, tone, length): html}.
+
+    Summaries and grouping are computed once per (tone, length) and
+    reused for every template that shares them.
+    """
+    by_style: Dict[Tuple[str, str], List[str]] = {}
+    for template_name, tone, length in variants:
+        by_style.setdefault((tone, length), []).append(template_name)
+
+    rendered = {}
+    for (tone, length), names in by_style.items():
+        sections = build_sections(items, tone=tone, length=length, top_n=top_n, batch=batch, llm=llm)
+        for name, html in render_variants(sections, names, tone, length).items():
+            rendered[(name, tone, length)] = html
 
-    # Group by category
+    return rendered
+
+
+def build_sections(items, tone="professional", length="short", top_n=8, batch=False, llm=None):
+    """
+    Summarizes the top-N items and groups them as
+    {category: [entry, ...]}, ready for render_newsletter.
+    """
+    selected = select_top(items, top_n)
+
+    # generate personalized summaries (cached / batched)
+    summaries = summarize_articles(selected, tone=tone, length=length, llm=llm, batch=batch)
+
+    for article, summary in zip(selected, summaries):
+        article["ai_summary"] = summary
+
+    return group_sections(selected, summaries)
+
+
+def select_top(items, top_n=8):
+    """
+    The top-N items by score: the articles a newsletter will contain.
+    """
+    return sorted(items, key=lambda x: x.get("score", 0), reverse=True)[:top_n]
+
+
+def group_sections(articles, summaries):
+    """
+    {category: [entry, ...]} in the order the articles are given.
+    """
     sections = {}
-    for article in selected:
+    for article, summary in zip(articles, summaries):
         category = article.get("category", "General")
 
         if category not in sections:
             sections[category] = []
 
-        # generate personalized summary
-        summary = summarize_article(
-            title=article.get("title", ""),
-            content=article.get("content", ""),
-            tone=tone,
-            length=length
-        )
+        sections[category].append(build_entry(article, summary))
+
+    return sections
 
-        # URL method C → rss_url OR scraped_url
-        url = article.get("rss_url") or article.get("scraped_url") or "#"
 
-        sections[category].append({
-            "title": article.get("title"),
-            "summary": summary,
-            "url": url,
-            "cta": "Read Full Article →"
-        })
+def build_entry(article, summary):
+    """
+    Template-ready entry for one summarized article.
+    """
+    # URL method C → rss_url OR scraped_url
+    url = article.get("rss_url") or article.get("scraped_url") or "#"
+
+    return {
+        "title": article.get("title"),
+        "summary": summary,
+        "url": url,
+        "cta": "Read Full Article →"
+    }
+
+
+@timed("render")
+def render_newsletter(sections, template_name="professional", tone="professional", length="short"):
+    """
+    Renders {category: [entry, ...]} with the chosen template.
+    """
+    template = get_template_env().get_template(f"{template_name}.html")
 
     # Render final HTML template
     html = template.render(
         sections=sections,
-        newsletter_title="AI-Powered Daily Newsletter",
+        newsletter_title=NEWSLETTER_TITLE,
         tone=tone,
         length=length,
         manage_link="#"  # placeholder link for settings
     )
 
     return html
+
+
+def render_variants(sections, template_names: Iterable[str], tone="professional", length="short") -> Dict[str, str]:
+    """
+    Renders the same sections with several templates: {name: html}.
+    """
+    return {name: render_newsletter(sections, name, tone, length) for name in template_names}
@@ -0,0 +1,162 @@
+# modules/http_client.py
+"""
+Shared HTTP layer for RSS, NewsAPI and the scraper.
+
+- one requests.Session with keep-alive connection pools per host
+- bodies are streamed and capped at max_bytes
+- text encoding comes from the Content-Type header, then a BOM or
+  <meta charset>, then UTF-8 (never the slow apparent_encoding guess)
+"""
+
+import os
+import re
+import codecs
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, Tuple
+
+from modules.metrics import METRICS
+
+# requests is imported with the first session (~0.1s of import time)
+if TYPE_CHECKING:
+    import requests
+
+POOL_CONNECTIONS = 32    # hosts with pooled connections
+POOL_MAXSIZE = 8         # keep-alive connections per host
+CHUNK_SIZE = 64 * 1024
+MAX_BODY_BYTES = int(os.getenv("HTTP_MAX_BODY_BYTES", 2_000_000))
+
+_CHARSET_RE = re.compile(r"charset\s*=\s*[\"']?\s*([\w.:-]+)", re.IGNORECASE)
+_META_CHARSET_RE = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?\s*([\w.:-]+)", re.IGNORECASE)
+_XML_ENCODING_RE = re.compile(rb"<\?xml[^>]+encoding\s*=\s*[\"']([\w.:-]+)", re.IGNORECASE)
+
+_BOMS = [
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+
+# ----------------------------------------------------
+# Shared session
+# ----------------------------------------------------
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> "requests.Session":
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+@contextmanager
+def open_stream(url: str, headers: Dict = None, timeout: float = 12):
+    """
+    Streamed GET on the shared session; the body is not read yet.
+    Always closes the response (an unread body just drops that
+    connection instead of returning it to the pool).
+    """
+    r = get_session().get(url, headers=headers, timeout=timeout, stream=True)
+    METRICS.inc("http_requests_total", status=r.status_code)
+    try:
+        yield r
+    finally:
+        r.close()
+
+
+def iter_body(r: "requests.Response", max_bytes: int = MAX_BODY_BYTES) -> Iterator[bytes]:
+    """
+    Yields raw body chunks, stopping after max_bytes.
+    """
+    read = 0
+    for chunk in r.iter_content(CHUNK_SIZE):
+        if not chunk:
+            continue
+        if read + len(chunk) > max_bytes:
+            chunk = chunk[:max_bytes - read]
+        read += len(chunk)
+        METRICS.inc("http_bytes_total", len(chunk))
+        yield chunk
+        if read >= max_bytes:
+            break
+
+
+def read_body(r: "requests.Response", max_bytes: int = MAX_BODY_BYTES) -> Tuple[bytes, bool]:
+    """
+    (body, truncated) for a streamed response.
+    """
+    body = b"".join(iter_body(r, max_bytes + 1))
+    truncated = len(body) > max_bytes
+    return body[:max_bytes], truncated
+
+
+# ----------------------------------------------------
+# Encoding detection
+# ----------------------------------------------------
+def _valid_codec(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def header_encoding(headers) -> Optional[str]:
+    match = _CHARSET_RE.search(headers.get("Content-Type", "") if headers else "")
+    return _valid_codec(match.group(1)) if match else None
+
+
+def sniff_encoding(head: bytes) -> Optional[str]:
+    """
+    Encoding from a BOM, <meta charset> or <?xml encoding?> in the
+    first bytes of a document.
+    """
+    for bom, name in _BOMS:
+        if head.startswith(bom):
+            return name
+    head = head[:4096]
+    match = _META_CHARSET_RE.search(head) or _XML_ENCODING_RE.search(head)
+    return _valid_codec(match.group(1).decode("ascii", "ignore")) if match else None
+
+
+def iter_text(r: "requests.Response", max_bytes: int = MAX_BODY_BYTES) -> Iterator[str]:
+    """
+    Yields decoded text chunks of a streamed response.
+    """
+    chunks = iter_body(r, max_bytes)
+    first = next(chunks, b"")
+
+    encoding = header_encoding(r.headers) or sniff_encoding(first) or "utf-8"
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+
+    yield decoder.decode(first)
+    for chunk in chunks:
+        yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+
+def fetch(url: str, headers: Dict = None, timeout: float = 12,
+          max_bytes: int = MAX_BODY_BYTES) -> Dict:
+    """
+    GET with a capped body:
+    { status, headers, body (bytes), truncated, url }
+    4xx / 5xx raise requests.HTTPError; 304 comes back with an empty body.
+    """
+    with open_stream(url, headers=headers, timeout=timeout) as r:
+        if r.status_code == 304:
+            return {"status": 304, "headers": r.headers, "body": b"", "truncated": False, "url": r.url}
+
+        r.raise_for_status()
+        body, truncated = read_body(r, max_bytes)
+        return {"status": r.status_code, "headers": r.headers, "body": body, "truncated": truncated, "url": r.url}
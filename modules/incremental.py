@@ -0,0 +1,96 @@
+# modules/incremental.py
+"""
+Incremental newsletter runs.
+
+Only articles that are new or whose RSS title/summary changed are
+scraped, scored and stored; the newsletter is then rebuilt from the
+article store, where unchanged stories keep their scraped text,
+category and score (and their summaries come from the summary cache).
+"""
+
+from typing import Dict, List
+
+from modules.archive_index import COVERED_DAYS, ArchiveIndex
+from modules.article_store import ArticleStore
+from modules.cache import cache_path
+from modules.curate import curate_articles
+from modules.feed_state import FeedStateStore
+from modules.scoring import run_scoring
+from modules.generator import generate_newsletter, select_top
+from modules.metrics import METRICS
+
+# Stories older than this drop out of the rebuilt newsletter
+WINDOW_HOURS = 48
+
+# Own feed state: validators saved here must not turn the requests of
+# only_new runs or the daemon (cache/feed_state.json) into 304s for
+# entries they never processed
+FEED_STATE_FILE = "feed_state_incremental.json"
+
+
+def refresh_store(
+    store: ArticleStore,
+    feeds: List[str] = None,
+    max_items: int = 30,
+    user_topics: List[str] = None
+) -> List[Dict]:
+    """
+    Curates, scrapes and scores only new / changed articles and writes
+    them to the store. Returns the processed items.
+    """
+    # Conditional GETs, but keep every entry: the store decides what changed
+    feed_state = FeedStateStore(cache_path(FEED_STATE_FILE), filter_seen=False)
+
+    items = curate_articles(
+        feeds,
+        max_items=max_items,
+        feed_state=feed_state,
+        skip=store.is_unchanged
+    )
+    items = run_scoring(items, user_topics=user_topics)
+    store.upsert(items)
+    return items
+
+
+def generate_incremental(
+    store: ArticleStore = None,
+    feeds: List[str] = None,
+    template_name: str = "professional",
+    tone: str = "professional",
+    length: str = "short",
+    top_n: int = 10,
+    window_hours: float = WINDOW_HOURS,
+    user_topics: List[str] = None,
+    archive: ArchiveIndex = None,
+    covered_days: float = COVERED_DAYS
+) -> str:
+    """
+    One incremental run: refresh the store, rebuild the newsletter
+    from stored articles, and keep the new AI summaries. With an
+    archive, stored stories a newsletter covered in the last
+    covered_days are left out, and the newsletter's articles are
+    indexed.
+    """
+    store = store or ArticleStore()
+
+    fresh = refresh_store(store, feeds, user_topics=user_topics)
+    pool = store.recent(window_hours)
+    print(f"✓ {len(fresh)} new/changed article(s), {len(pool)} in the last {window_hours:g}h")
+
+    # The store keeps stories across runs; don't repeat the ones
+    # an earlier newsletter already ran
+    if archive is not None and covered_days:
+        kept = [a for a in pool if not archive.covered(a, covered_days)]
+        if len(kept) < len(pool):
+            METRICS.inc("covered_dropped_total", len(pool) - len(kept))
+            print(f"Dropped {len(pool) - len(kept)} article(s) already covered in the last {covered_days:g} day(s)")
+        pool = kept
+
+    html = generate_newsletter(pool, template_name=template_name, tone=tone, length=length, top_n=top_n)
+
+    # generate_newsletter records each selected article's ai_summary
+    store.upsert([a for a in pool if a.get("ai_summary")])
+
+    if archive is not None:
+        archive.add_newsletter(select_top(pool, top_n))
+    return html
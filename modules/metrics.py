@@ -0,0 +1,205 @@
+# modules/metrics.py
+"""
+Lightweight pipeline instrumentation.
+
+- counters:   METRICS.inc("http_bytes_total", n, kind="article")
+- histograms: METRICS.observe("stage_seconds", 0.42, stage="scrape")
+- timing:     @timed("scrape") on a function, or `with METRICS.timer("render"):`
+
+Stage timers: curate, scrape_all, scoring, summarize, render
+(fan-out: fanout, fanout_summarize, fanout_render).
+Per-item timers: rss_feed, scrape, summarize_item, llm_request.
+
+Export with to_json() / to_prometheus(), or write_metrics(path) which
+picks the format from the file extension. profile_run(path) wraps a
+run in cProfile and dumps the stats file.
+"""
+
+import cProfile
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+# Latency buckets in seconds
+DEFAULT_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+
+LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict) -> LabelKey:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Histogram:
+    def __init__(self, buckets: List[float] = None):
+        self.buckets = buckets or DEFAULT_BUCKETS
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def to_dict(self) -> Dict:
+        cumulative, running = {}, 0
+        for bound, n in zip(self.buckets, self.counts):
+            running += n
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = self.count
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "min": self.min,
+            "max": self.max,
+            "buckets": cumulative,
+        }
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[LabelKey, float] = {}
+        self.histograms: Dict[LabelKey, Histogram] = {}
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            if key not in self.histograms:
+                self.histograms[key] = Histogram()
+            self.histograms[key].observe(value)
+
+    @contextmanager
+    def timer(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("stage_seconds", time.perf_counter() - start, stage=stage)
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    # ----------------------------
+    # Export
+    # ----------------------------
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self.counters.items())
+                ],
+                "histograms": [
+                    {"name": name, "labels": dict(labels), **h.to_dict()}
+                    for (name, labels), h in sorted(self.histograms.items())
+                ],
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self, prefix: str = "newsletter_") -> str:
+        def fmt(labels, extra=None):
+            pairs = list(labels) + (extra or [])
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+        lines = []
+        with self._lock:
+            for name in sorted({n for n, _ in self.counters}):
+                lines.append(f"# TYPE {prefix}{name} counter")
+                for (n, labels), value in sorted(self.counters.items()):
+                    if n == name:
+                        lines.append(f"{prefix}{name}{fmt(labels)} {value}")
+
+            for name in sorted({n for n, _ in self.histograms}):
+                lines.append(f"# TYPE {prefix}{name} histogram")
+                for (n, labels), h in sorted(self.histograms.items()):
+                    if n != name:
+                        continue
+                    for bound, total in h.to_dict()["buckets"].items():
+                        lines.append(f"{prefix}{name}_bucket{fmt(labels, [('le', bound)])} {total}")
+                    lines.append(f"{prefix}{name}_sum{fmt(labels)} {h.sum}")
+                    lines.append(f"{prefix}{name}_count{fmt(labels)} {h.count}")
+
+        return "\n".join(lines) + "\n"
+
+    def report(self) -> str:
+        """
+        Short human-readable per-stage summary.
+        """
+        rows = []
+        with self._lock:
+            for (name, labels), h in sorted(self.histograms.items()):
+                if name == "stage_seconds":
+                    stage = dict(labels).get("stage", "?")
+                    rows.append(
+                        f"  {stage:<12} n={h.count:<5} total={h.sum:8.2f}s "
+                        f"mean={h.sum / h.count * 1000:8.1f}ms max={h.max * 1000:8.1f}ms"
+                    )
+        return "\n".join(rows)
+
+
+METRICS = Metrics()
+
+
+def timed(stage: str):
+    """
+    Decorator: records each call's latency under stage_seconds{stage}.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with METRICS.timer(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def write_metrics(path: str):
+    """
+    Writes METRICS to `path` (.prom / .txt = Prometheus text, else JSON).
+    """
+    text = METRICS.to_prometheus() if path.endswith((".prom", ".txt")) else METRICS.to_json()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+@contextmanager
+def profile_run(path: str = None):
+    """
+    cProfile the block and dump stats to `path` (no-op without a path).
+    Inspect with: python -m pstats <path>
+    """
+    if not path:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
@@ -0,0 +1,105 @@
+# modules/parse_pool.py
+"""
+Process pool for CPU-bound parsing (article HTML, RSS/Atom XML).
+
+HTML and feed parsing hold the GIL, so with concurrent fetching the
+parse still runs on one core. With PARSE_WORKERS > 1, fetch threads
+hand the raw bytes to worker processes and get back only the small
+result (article text, normalized feed items); parse trees never cross
+the process boundary.
+
+    run_parse(fn, *args)             one job (blocks the calling thread)
+    map_parse(fn, [args, ...])       many jobs, submitted in chunks
+
+The scraper and feed reader submit one run_parse job per document from
+the fetch thread that downloaded it, so parsing overlaps the other
+downloads instead of waiting for a whole batch of bodies. map_parse is
+for callers that already hold many documents (bench_parse_pool uses it
+to measure throughput per worker count).
+
+fn must be a module-level function. PARSE_WORKERS=0 (the default)
+parses in the calling thread.
+"""
+
+import atexit
+import math
+import os
+import threading
+from typing import TYPE_CHECKING, Callable, Iterable, List, Optional, Tuple
+
+# multiprocessing is imported with the first pool
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", 0))
+
+# Chunks per worker for map_parse: big enough to amortize pickling and
+# IPC per task, small enough to keep workers evenly loaded
+CHUNKS_PER_WORKER = 4
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_parse_pool() -> Optional["ProcessPoolExecutor"]:
+    """
+    The shared parse pool, or None when parsing runs in-process.
+    """
+    global _pool
+    if PARSE_WORKERS <= 1:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+            _pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+            atexit.register(shutdown_parse_pool)
+        return _pool
+
+
+def shutdown_parse_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def chunk_size(jobs: int, workers: int) -> int:
+    return max(1, math.ceil(jobs / (workers * CHUNKS_PER_WORKER)))
+
+
+def _apply(job: Tuple[Callable, tuple]):
+    fn, args = job
+    return fn(*args)
+
+
+def run_parse(fn: Callable, *args):
+    """
+    fn(*args) on the parse pool (in-process without one). A worker
+    that died takes the pool down with it; the pool is dropped so
+    the next call starts a fresh one, and this job runs in-process.
+    """
+    pool = get_parse_pool()
+    if pool is None:
+        return fn(*args)
+
+    from concurrent.futures.process import BrokenProcessPool
+    try:
+        return pool.submit(fn, *args).result()
+    except BrokenProcessPool:
+        shutdown_parse_pool()
+        return fn(*args)
+
+
+def map_parse(fn: Callable, arg_lists: Iterable[tuple], pool: "ProcessPoolExecutor" = None, workers: int = None) -> List:
+    """
+    [fn(*args) for args in arg_lists], in order, submitted to the pool
+    in chunks rather than one task per job.
+    """
+    jobs = [(fn, tuple(args)) for args in arg_lists]
+    pool = pool or get_parse_pool()
+    if pool is None or not jobs:
+        return [_apply(job) for job in jobs]
+
+    workers = workers or PARSE_WORKERS
+    return list(pool.map(_apply, jobs, chunksize=chunk_size(len(jobs), workers)))
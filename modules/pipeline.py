@@ -0,0 +1,217 @@
+# modules/pipeline.py
+"""
+Streaming pipeline: feeds -> scrape -> score -> summarize.
+
+Each stage runs on its own thread(s) and hands articles to the next
+stage through a bounded queue, so an article is summarized as soon as
+it has been scraped and scored instead of waiting for every feed.
+Full queues block the stage upstream (backpressure).
+"""
+
+import queue
+import threading
+from typing import Callable, Dict, Iterator, List
+
+from modules.curate import DEFAULT_FEEDS, fetch_newsapi_headlines, dedup_key, finalize_item
+from modules.rss_ingest import iter_multiple_feeds
+from modules.dedup import NearDuplicateIndex, dedup_text
+from modules.web_scraper import fetch_article_text, HostLimiter, MAX_WORKERS
+from modules.scoring import compute_simple_score
+from modules.summary import summarize_article, SUMMARY_WORKERS
+from modules.generator import build_entry, render_newsletter
+from modules.utils import get_llm
+from modules.metrics import METRICS
+
+# End-of-stream marker passed between stages
+_DONE = object()
+
+QUEUE_SIZE = 8
+
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    """
+    Blocking put that gives up once the pipeline is stopped.
+    """
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _start_stage(fn: Callable, inbox: queue.Queue, outbox: queue.Queue,
+                 workers: int, stop: threading.Event, name: str):
+    """
+    Runs fn(item) on `workers` threads. Non-None results go to outbox;
+    the last worker to see the end marker forwards it downstream.
+    """
+    remaining = [workers]
+    lock = threading.Lock()
+
+    def loop():
+        while not stop.is_set():
+            try:
+                item = inbox.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            if item is _DONE:
+                # let sibling workers see the marker too
+                _put(inbox, _DONE, stop)
+                break
+
+            try:
+                result = fn(item)
+            except Exception as e:
+                METRICS.inc("errors_total", stage=name)
+                print(f"[PIPELINE] {name} failed:", e)
+                result = None
+
+            if result is not None:
+                _put(outbox, result, stop)
+
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            _put(outbox, _DONE, stop)
+
+    for i in range(workers):
+        threading.Thread(target=loop, name=f"{name}-{i}", daemon=True).start()
+
+
+def stream_articles(
+    feeds: List[str] = None,
+    max_items: int = 30,
+    top_n: int = 10,
+    tone: str = "professional",
+    length: str = "short",
+    category: str = None,
+    min_score: float = 0.0,
+    queue_size: int = QUEUE_SIZE
+) -> Iterator[Dict]:
+    """
+    Yields articles as soon as they are summarized. Each article is a
+    curated + scored item with an extra "ai_summary" key.
+
+    Unlike generate_newsletter there is no global top-N: the first
+    top_n articles that reach min_score (and match `category`, if
+    given) are summarized, and the pipeline stops after that.
+    """
+    feeds = feeds or DEFAULT_FEEDS
+    stop = threading.Event()
+
+    raw_q: queue.Queue = queue.Queue(maxsize=queue_size)
+    scraped_q: queue.Queue = queue.Queue(maxsize=queue_size)
+    scored_q: queue.Queue = queue.Queue(maxsize=queue_size)
+    out_q: queue.Queue = queue.Queue(maxsize=queue_size)
+
+    # --- Stage 1: feeds + NewsAPI, deduplicated ---
+    def source():
+        seen = set()
+        near_dups = NearDuplicateIndex()
+        count = 0
+
+        def sources():
+            yield from iter_multiple_feeds(feeds)
+            yield from fetch_newsapi_headlines()
+
+        try:
+            for item in sources():
+                key = dedup_key(item)
+                if key in seen:
+                    continue
+                seen.add(key)
+
+                if near_dups.add(dedup_text(item)):
+                    continue
+
+                if not _put(raw_q, item, stop):
+                    return
+                count += 1
+                if count >= max_items:
+                    break
+        finally:
+            _put(raw_q, _DONE, stop)
+
+    # --- Stage 2: scrape (per-host limited) ---
+    hosts = HostLimiter()
+
+    def scrape(item):
+        link = item.get("link")
+        text = None
+        if link:
+            with hosts.slot(link):
+                text = fetch_article_text(link)
+        return finalize_item(item, text)
+
+    # --- Stage 3: score / filter ---
+    def score(item):
+        item["score"] = compute_simple_score(item)
+        if item["score"] < min_score:
+            return None
+        if category and item.get("category") != category:
+            return None
+        return item
+
+    # --- Stage 4: summarize the first top_n survivors ---
+    llm = get_llm()
+    claimed = [0]
+    claim_lock = threading.Lock()
+
+    def summarize(item):
+        with claim_lock:
+            if claimed[0] >= top_n:
+                return None
+            claimed[0] += 1
+
+        item["ai_summary"] = summarize_article(
+            title=item.get("title", ""),
+            content=item.get("content", ""),
+            tone=tone,
+            length=length,
+            llm=llm
+        )
+        return item
+
+    threading.Thread(target=source, name="pipeline-source", daemon=True).start()
+    _start_stage(scrape, raw_q, scraped_q, MAX_WORKERS, stop, "scrape")
+    _start_stage(score, scraped_q, scored_q, 1, stop, "score")
+    _start_stage(summarize, scored_q, out_q, SUMMARY_WORKERS, stop, "summarize")
+
+    produced = 0
+    try:
+        while produced < top_n:
+            item = out_q.get()
+            if item is _DONE:
+                break
+            produced += 1
+            yield item
+    finally:
+        # Consumer is done (or gave up): unblock and stop every stage
+        stop.set()
+
+
+def stream_newsletter(
+    feeds: List[str] = None,
+    template_name: str = "professional",
+    tone: str = "professional",
+    length: str = "short",
+    top_n: int = 10,
+    category: str = None,
+    max_items: int = 30
+) -> Iterator[str]:
+    """
+    Yields the newsletter HTML re-rendered after every finished
+    article, so a UI can show sections while the rest are in flight.
+    The last value is the complete newsletter.
+    """
+    sections: Dict[str, List[Dict]] = {}
+
+    for article in stream_articles(feeds, max_items, top_n, tone, length, category):
+        sections.setdefault(article.get("category", "General"), []).append(
+            build_entry(article, article["ai_summary"])
+        )
+        yield render_newsletter(sections, template_name, tone, length)
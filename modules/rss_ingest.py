@@ -1,17 +1,155 @@
 # modules/rss_ingest.py
-import feedparser
-from typing import List, Dict
+import os
+from typing import Iterator, List, Dict, Set, Tuple
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from modules.article import Article
+from modules.feed_state import FeedStateStore
+from modules.feed_stream import FeedStreamError, parse_feed_stream
+from modules.http_client import iter_body, open_stream
+from modules.metrics import METRICS, timed
+from modules.parse_pool import run_parse
 
-def fetch_rss_feed(feed_url: str, max_items: int = 10) -> List[Dict]:
+# Feeds can be large archives; cap the download
+FEED_MAX_BYTES = 5_000_000
+
+# "stream" = incremental XML reader that stops once it has enough
+# entries (modules/feed_stream.py), falling back to feedparser for
+# documents it can't read; "feedparser" = always parse the whole
+# document with feedparser
+FEED_PARSER = os.getenv("FEED_PARSER", "stream")
+
+FEED_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; AI-Newsletter/1.0; +feedparser)",
+    "Accept": "application/rss+xml, application/atom+xml, application/xml;q=0.9, */*;q=0.8"
+}
+
+
+def entry_id(entry) -> str:
+    """
+    Stable identifier for a feed entry (guid, then link, then title).
+    """
+    return entry.get("id") or entry.get("link") or entry.get("title", "")
+
+
+@timed("rss_feed")
+def fetch_rss_feed(
+    feed_url: str,
+    max_items: int = 10,
+    state: FeedStateStore = None
+) -> List[Dict]:
     """
     Fetch a single RSS feed and return normalized items:
     {
         title, link, published, summary, content, category
     }
+
+    With a FeedStateStore the request is conditional (ETag /
+    Last-Modified) and a 304 response returns [] without parsing
+    anything; unless state.filter_seen is False, only entries not
+    seen before are returned, and the streaming reader stops at
+    entries older than the newest one kept on an earlier run. The
+    returned entries and the response's validators are only
+    remembered once the caller passes the items it used to
+    state.mark_seen.
+    """
+    headers = dict(FEED_HEADERS)
+    if state is not None:
+        validators = state.conditional_args(feed_url)
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("modified"):
+            headers["If-Modified-Since"] = validators["modified"]
+
+    filter_seen = state is not None and state.filter_seen
+    newer_than = state.last_published(feed_url) if filter_seen else None
+    seen_ids = state.seen_ids(feed_url) if filter_seen else None
+    pending_ids = state.pending_ids(feed_url) if filter_seen else None
+
+    with open_stream(feed_url, headers=headers, timeout=12) as r:
+        if r.status_code == 304:
+            if state is not None:
+                METRICS.inc("feeds_not_modified_total")
+                state.touch(feed_url)
+            return []
+
+        r.raise_for_status()
+        parsed = read_feed(r, max_items, newer_than, seen_ids, pending_ids)
+
+    # Held, not stored: validators saved before the caller used the
+    # entries would turn the next request into a 304 and the entries
+    # it left out (or lost to a crash) would never come back
+    if state is not None:
+        state.hold_validators(feed_url, r.headers.get("ETag"), r.headers.get("Last-Modified"))
+        new_ids = set(state.filter_new(feed_url, [(eid, item["published"]) for eid, item in parsed]))
+        parsed = [(eid, item) for eid, item in parsed if eid in new_ids]
+
+    for eid, item in parsed:
+        item["source"] = feed_url
+        item["entry_id"] = eid
+
+    return [item for _, item in parsed]
+
+
+def read_feed(
+    r,
+    max_items: int = 10,
+    newer_than: datetime = None,
+    seen_ids: Set[str] = None,
+    pending_ids: Set[str] = None
+) -> List[Tuple[str, Dict]]:
+    """
+    [(entry_id, item)] from a streamed feed response. The streaming
+    reader stops downloading once it has max_items entries; feedparser
+    (the fallback) gets the whole capped body, on the parse pool when
+    that is on.
     """
-    d = feedparser.parse(feed_url)
+    chunks = iter_body(r, FEED_MAX_BYTES)
+
+    if FEED_PARSER == "stream":
+        consumed = []
+
+        def recorded():
+            for chunk in chunks:
+                consumed.append(chunk)
+                yield chunk
+
+        try:
+            return parse_feed_stream(
+                recorded(), max_items=max_items, newer_than=newer_than,
+                seen_ids=seen_ids, pending_ids=pending_ids
+            )
+        except FeedStreamError:
+            METRICS.inc("feed_stream_fallbacks_total")
+            body = b"".join(consumed) + b"".join(chunks)
+    else:
+        body = b"".join(chunks)
+
+    # No second fetch inside feedparser
+    return run_parse(
+        parse_feed_bytes,
+        body,
+        {k.lower(): v for k, v in r.headers.items()},
+        max_items
+    )
+
+
+def parse_feed_bytes(body: bytes, response_headers: Dict = None, max_items: int = 10) -> List[Tuple[str, Dict]]:
+    """
+    [(entry_id, item)] for the first max_items entries of a raw feed
+    document. Only these plain dicts leave a parse worker, not the
+    feedparser result.
+    """
+    # Imported here so importing this module stays cheap
+    import feedparser
+    d = feedparser.parse(body, response_headers=response_headers or {})
+
+    # A document feedparser couldn't make anything of is an error, not
+    # an empty feed (the caller must not treat it as fetched)
+    if d.bozo and not d.entries:
+        raise ValueError(f"unparseable feed: {d.get('bozo_exception')}")
+
     items = []
 
     for entry in d.entries[:max_items]:
@@ -49,28 +187,71 @@ def fetch_rss_feed(feed_url: str, max_items: int = 10) -> List[Dict]:
         )
 
         # --- Build item ---
-        items.append({
-            "title": entry.get("title", "No Title"),
-            "link": entry.get("link", ""),
-            "rss_url": entry.get("link", ""),      # required for generator
-            "published": published,
-            "summary": summary,
-            "content": content,
-            "category": category or "General",
-            "score": 0.0   # scoring module will update this later
-        })
+        items.append((entry_id(entry), Article(
+            title=entry.get("title", "No Title"),
+            link=entry.get("link", ""),
+            rss_url=entry.get("link", ""),      # required for generator
+            published=published,
+            summary=summary,
+            content=content,
+            category=category or "General",
+            score=0.0   # scoring module will update this later
+        )))
 
     return items
 
 
-def fetch_multiple_feeds(feed_list: List[str]) -> List[Dict]:
+def _safe_fetch(feed_url: str, max_items: int, state: FeedStateStore = None) -> List[Dict]:
+    try:
+        return fetch_rss_feed(feed_url, max_items=max_items, state=state)
+    except Exception as e:
+        METRICS.inc("errors_total", stage="rss_feed")
+        print(f"[RSS ERROR] Could not fetch {feed_url}: {e}")
+        return []
+
+
+def fetch_multiple_feeds(
+    feed_list: List[str],
+    max_items: int = 8,
+    max_workers: int = 8,
+    state: FeedStateStore = None
+) -> List[Dict]:
     """
-    Fetches multiple RSS feeds and returns a combined list of items.
+    Fetches multiple RSS feeds in parallel and returns a combined
+    list of items (in feed_list order).
     """
+    def fetch_one(f):
+        return _safe_fetch(f, max_items, state)
+
     all_items = []
-    for f in feed_list:
-        try:
-            all_items.extend(fetch_rss_feed(f, max_items=8))
-        except Exception as e:
-            print(f"[RSS ERROR] Could not fetch {f}: {e}")
+    if feed_list:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(feed_list))) as pool:
+            for items in pool.map(fetch_one, feed_list):
+                all_items.extend(items)
+
+    if state is not None:
+        state.save()
+
     return all_items
+
+
+def iter_multiple_feeds(
+    feed_list: List[str],
+    max_items: int = 8,
+    max_workers: int = 8,
+    state: FeedStateStore = None
+) -> Iterator[Dict]:
+    """
+    Like fetch_multiple_feeds, but yields items as soon as each
+    feed finishes (fastest feed first).
+    """
+    if not feed_list:
+        return
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(feed_list))) as pool:
+        futures = [pool.submit(_safe_fetch, f, max_items, state) for f in feed_list]
+        for fut in as_completed(futures):
+            yield from fut.result()
+
+    if state is not None:
+        state.save()
@@ -0,0 +1,284 @@
+# modules/scheduler.py
+"""
+Adaptive per-feed polling daemon.
+
+Each feed gets its own polling interval, driven by how often it
+actually publishes:
+
+- every poll is a conditional GET that returns only unseen entries
+- the feed's update rate (new entries / hour, counted before any
+  relevance filter) is an EWMA over polls
+- the next interval aims for about TARGET_NEW_PER_POLL new entries per
+  poll, backs off after empty polls (from the current interval, also
+  while the rate is still 0), and stays within
+  [MIN_INTERVAL, MAX_INTERVAL]
+- every due time gets +/- JITTER, and first polls are spread over
+  STARTUP_SPREAD, so feeds don't all fire at once
+
+New items are scraped, scored and written to the article store as
+they arrive (stories the archive index says were covered recently are
+skipped). A newsletter is emitted once EMIT_MIN_ITEMS items scoring
+at least EMIT_MIN_SCORE have arrived since the previous one.
+
+Schedule state lives in cache/schedule.json, so a restarted daemon
+keeps each feed's learned interval.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from modules.archive_index import ArchiveIndex
+from modules.article_store import ArticleStore
+from modules.cache import cache_path
+from modules.curate import DEFAULT_FEEDS, finalize_item
+from modules.dedup import NearDuplicateIndex, dedup_text
+from modules.feed_state import FeedStateStore
+from modules.generator import generate_newsletter, select_top
+from modules.metrics import METRICS
+from modules.rss_ingest import fetch_rss_feed
+from modules.scoring import run_scoring
+from modules.web_scraper import fetch_many_article_texts
+
+# Polling intervals (seconds)
+MIN_INTERVAL = 5 * 60
+MAX_INTERVAL = 6 * 3600
+DEFAULT_INTERVAL = 30 * 60
+STARTUP_SPREAD = 60
+
+TARGET_NEW_PER_POLL = 3     # aim for about this many new items per poll
+RATE_ALPHA = 0.3            # EWMA weight of the latest observation
+BACKOFF = 1.5               # interval growth after a poll with nothing new
+JITTER = 0.1                # +/- fraction applied to every interval
+
+# Newsletter emission
+EMIT_MIN_ITEMS = 8
+EMIT_MIN_SCORE = 1.0
+
+MAX_ITEMS_PER_POLL = 20
+
+
+class FeedScheduler:
+    def __init__(
+        self,
+        feeds: List[str] = None,
+        store: ArticleStore = None,
+        feed_state: FeedStateStore = None,
+        archive: ArchiveIndex = None,
+        path: str = None,
+        template_name: str = "professional",
+        tone: str = "professional",
+        length: str = "short",
+        top_n: int = 10,
+        emit_min_items: int = EMIT_MIN_ITEMS,
+        emit_min_score: float = EMIT_MIN_SCORE,
+        min_interval: float = MIN_INTERVAL,
+        max_interval: float = MAX_INTERVAL,
+        clock: Callable[[], float] = time.time,
+        seed: int = None
+    ):
+        self.feeds = list(feeds or DEFAULT_FEEDS)
+        self.store = store or ArticleStore()
+        self.feed_state = feed_state or FeedStateStore()
+        self.archive = archive
+        self.path = path or cache_path("schedule.json")
+        self.template_name = template_name
+        self.tone = tone
+        self.length = length
+        self.top_n = top_n
+        self.emit_min_items = emit_min_items
+        self.emit_min_score = emit_min_score
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.clock = clock
+        self._rng = random.Random(seed)
+        self._near_dups = NearDuplicateIndex()
+        self._data = self._load()
+
+        now = self.clock()
+        self._data.setdefault("last_emitted_at", now)
+        feeds_state = self._data.setdefault("feeds", {})
+        for feed in self.feeds:
+            if feed not in feeds_state:
+                feeds_state[feed] = {
+                    "interval": min(max(DEFAULT_INTERVAL, min_interval), max_interval),
+                    "rate": None,
+                    "last_poll": None,
+                    "next_due": now + self._rng.uniform(0, STARTUP_SPREAD),
+                    "polls": 0,
+                    "empty_polls": 0,
+                }
+
+    # ----------------------------
+    # Persistence
+    # ----------------------------
+    def _load(self) -> Dict:
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"[SCHEDULER] Could not read {self.path}: {e}")
+        return {}
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def feed_schedule(self, feed: str) -> Dict:
+        return self._data["feeds"][feed]
+
+    # ----------------------------
+    # Scheduling
+    # ----------------------------
+    def next_feed(self) -> Tuple[str, float]:
+        """
+        (feed, due time) of the feed that is due first.
+        """
+        feed = min(self.feeds, key=lambda f: self.feed_schedule(f)["next_due"])
+        return feed, self.feed_schedule(feed)["next_due"]
+
+    def update_schedule(self, feed: str, new_count: int, now: float) -> float:
+        """
+        Folds one poll into the feed's update rate and picks its next
+        due time. new_count is the number of new entries the feed
+        returned. Returns the new (un-jittered) interval in seconds.
+        """
+        sched = self.feed_schedule(feed)
+        elapsed = now - sched["last_poll"] if sched["last_poll"] else sched["interval"]
+        observed = new_count / max(elapsed / 3600, 1e-6)
+
+        # Until something has been seen, the first real observation is
+        # the estimate (empty polls alone would drag the EWMA toward 0)
+        rate = sched["rate"]
+        rate = observed if not rate else RATE_ALPHA * observed + (1 - RATE_ALPHA) * rate
+
+        # No rate yet (e.g. a 304 on the first poll): back off step by
+        # step rather than jumping to max_interval
+        target = TARGET_NEW_PER_POLL * 3600 / rate if rate > 0 else sched["interval"] * BACKOFF
+        if new_count == 0:
+            target = max(target, sched["interval"] * BACKOFF)
+        interval = min(max(target, self.min_interval), self.max_interval)
+
+        sched.update({
+            "rate": rate,
+            "interval": interval,
+            "last_poll": now,
+            "next_due": now + interval * self._rng.uniform(1 - JITTER, 1 + JITTER),
+            "polls": sched["polls"] + 1,
+            "empty_polls": sched["empty_polls"] + (new_count == 0),
+        })
+        return interval
+
+    # ----------------------------
+    # Polling
+    # ----------------------------
+    def poll(self, feed: str) -> List[Dict]:
+        """
+        Fetches the feed's unseen entries, scrapes + scores them and
+        stores them. Returns the new items.
+        """
+        try:
+            entries = fetch_rss_feed(feed, max_items=MAX_ITEMS_PER_POLL, state=self.feed_state)
+        except Exception as e:
+            METRICS.inc("errors_total", stage="scheduler_poll")
+            print(f"[SCHEDULER] Poll failed: {feed}: {e}")
+            entries = []
+
+        fresh = [
+            item for item in entries
+            if not self.store.is_unchanged(item)
+            and not (self.archive is not None and self.archive.covered(item))
+            and not self._near_dups.add(dedup_text(item))
+        ]
+
+        if fresh:
+            texts = fetch_many_article_texts([item.get("link") for item in fresh])
+            for item in fresh:
+                link = item.get("link")
+                finalize_item(item, texts.get(link) if link else None)
+            run_scoring(fresh)
+            self.store.upsert(fresh)
+
+        # Only now: a poll that fails while scraping / scoring gets the
+        # same entries again next time
+        self.feed_state.mark_seen(entries)
+        self.feed_state.save()
+        # How often the feed publishes, not how many entries survived
+        # the store / archive / near-duplicate filters
+        interval = self.update_schedule(feed, len(entries), self.clock())
+        self.save()
+
+        METRICS.inc("scheduler_polls_total", result="new" if fresh else "empty")
+        METRICS.inc("scheduler_new_items_total", len(fresh))
+        print(f"[SCHEDULER] {feed}: {len(fresh)} new, next poll in ~{interval / 60:.0f} min")
+        return fresh
+
+    # ----------------------------
+    # Emission
+    # ----------------------------
+    def pending(self) -> List[Dict]:
+        """
+        Stored items since the last newsletter that score high enough.
+        """
+        return [
+            item for item in self.store.since(self._data["last_emitted_at"])
+            if item.get("score", 0) >= self.emit_min_score
+        ]
+
+    def maybe_emit(self) -> Optional[str]:
+        """
+        Renders a newsletter when enough qualifying items are pending.
+        """
+        pool = self.pending()
+        if len(pool) < self.emit_min_items:
+            return None
+
+        html = generate_newsletter(
+            pool, template_name=self.template_name, tone=self.tone, length=self.length, top_n=self.top_n
+        )
+        self.store.upsert([a for a in pool if a.get("ai_summary")])
+        if self.archive is not None:
+            self.archive.add_newsletter(select_top(pool, self.top_n))
+
+        self._data["last_emitted_at"] = self.clock()
+        self.save()
+
+        # Near-duplicates only matter within one newsletter's items
+        self._near_dups = NearDuplicateIndex()
+        METRICS.inc("newsletters_emitted_total")
+        return html
+
+    # ----------------------------
+    # Daemon loop
+    # ----------------------------
+    def run(
+        self,
+        on_newsletter: Callable[[str], None],
+        stop: threading.Event = None,
+        max_polls: int = None
+    ):
+        """
+        Polls feeds as they come due until `stop` is set (or max_polls
+        polls have run), calling on_newsletter(html) for each emission.
+        """
+        stop = stop or threading.Event()
+        polls = 0
+
+        while not stop.is_set() and (max_polls is None or polls < max_polls):
+            feed, due = self.next_feed()
+            wait = due - self.clock()
+            if wait > 0 and stop.wait(wait):
+                break
+
+            self.poll(feed)
+            polls += 1
+
+            html = self.maybe_emit()
+            if html:
+                on_newsletter(html)
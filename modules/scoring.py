@@ -1,6 +1,11 @@
-from typing import List, Dict
+import re
+import string
+from functools import lru_cache
+from typing import List, Dict, Set, Tuple
 from datetime import datetime
 
+from modules.metrics import timed
+
 # ----------------------------
 # Category Keyword Map
 # ----------------------------
@@ -29,18 +34,146 @@ CATEGORY_KEYWORDS = {
 }
 
 
+# Points per matched keyword, by category
+CATEGORY_WEIGHTS = {cat: 1.0 for cat in CATEGORY_KEYWORDS}
+
+# User-preference boosts
+USER_CATEGORY_BOOST = 2.0   # a user topic names the article's category
+USER_TOPIC_BOOST = 1.0      # per user topic found in the text
+
+# run_scoring switches to the NumPy/SciPy path at this many items
+BATCH_SCORING_MIN_ITEMS = 200
+
+
 # ----------------------------
-# Detect Category
+# Compiled Keyword Matcher
 # ----------------------------
-def detect_category(item):
-    text = (item.get("title", "") + " " + item.get("content", "")).lower()
+class KeywordMatcher:
+    """
+    Word-level keyword matcher built once from CATEGORY_KEYWORDS.
+
+    The text is lowercased and split into words a single time; keywords
+    are then found with set lookups, so "ai" no longer matches inside
+    "said" and "model" no longer matches "remodel". A trailing plural
+    "s" is accepted ("stocks", "models", "neural networks").
+
+    match(text) returns the set of distinct keywords found.
+    """
+
+    WORD_RE = re.compile(r"[a-z0-9]+")
+
+    # punctuation -> space, so str.split() yields bare words
+    PUNCT_TABLE = str.maketrans({c: " " for c in string.punctuation + "\u2018\u2019\u201c\u201d\u2013\u2014\u2026\u2022"})
+
+    def __init__(self, category_keywords: Dict[str, List[str]], category_weights: Dict[str, float] = None):
+        self.categories = list(category_keywords)
+        self.keyword_categories: Dict[str, List[str]] = {}
+        for cat, keywords in category_keywords.items():
+            for kw in keywords:
+                kw = " ".join(self.WORD_RE.findall(kw.lower()))
+                self.keyword_categories.setdefault(kw, []).append(cat)
+
+        # points per keyword (a keyword listed under two categories counts twice)
+        weights = category_weights or {}
+        self.keyword_weight: Dict[str, float] = {
+            kw: sum(weights.get(cat, 1.0) for cat in cats)
+            for kw, cats in self.keyword_categories.items()
+        }
+
+        # single words: exact + plural form -> keyword
+        self.words: Dict[str, str] = {}
+        # phrases: (keyword, words, padded phrase, padded plural)
+        self.phrases: List[Tuple[str, Tuple[str, ...], str, str]] = []
+
+        for kw in self.keyword_categories:
+            parts = tuple(kw.split())
+            if len(parts) == 1:
+                self.words[kw] = kw
+                self.words.setdefault(kw + "s", kw)
+            else:
+                self.phrases.append((kw, parts[:-1], f" {kw} ", f" {kw}s "))
+
+        self.word_keys = frozenset(self.words)
+
+    def match(self, text: str) -> Set[str]:
+        words = text.lower().translate(self.PUNCT_TABLE).split()
+        vocab = set(words)
+
+        found = {self.words[w] for w in vocab & self.word_keys}
+
+        joined = None
+        for kw, leading, phrase, plural in self.phrases:
+            # cheap pre-check before scanning the joined text
+            if not vocab.issuperset(leading):
+                continue
+            if joined is None:
+                joined = " " + " ".join(words) + " "
+            if phrase in joined or plural in joined:
+                found.add(kw)
+
+        return found
 
-    for cat, keywords in CATEGORY_KEYWORDS.items():
-        for kw in keywords:
-            if kw in text:
+    def categorize(self, keywords: Set[str]) -> str:
+        """
+        First category (in CATEGORY_KEYWORDS order) with a hit.
+        """
+        hit = {cat for kw in keywords for cat in self.keyword_categories[kw]}
+        for cat in self.categories:
+            if cat in hit:
                 return cat
+        return "General"
 
-    return "General"
+    def analyze(self, text: str) -> Tuple[str, float]:
+        """
+        (category, weighted keyword hits) in one pass over text.
+        """
+        found = self.match(text)
+        hits = sum(self.keyword_weight[kw] for kw in found)
+        return self.categorize(found), hits
+
+
+KEYWORD_MATCHER = KeywordMatcher(CATEGORY_KEYWORDS, CATEGORY_WEIGHTS)
+
+
+def _item_text(item: Dict) -> str:
+    return (item.get("title") or "") + " " + (item.get("content") or "")
+
+
+@lru_cache(maxsize=64)
+def topic_matcher(topics: Tuple[str, ...]) -> KeywordMatcher:
+    """
+    Matcher over the user's topics (cached per topic list).
+    """
+    return KeywordMatcher({"topics": [t for t in topics if t and t.strip()]})
+
+
+def recency_boost(pub) -> float:
+    """
+    Up to +2.0 for today's articles, fading to 0 over 30 days.
+    """
+    if not isinstance(pub, datetime):
+        return 0.0
+    if pub.tzinfo:
+        pub = pub.replace(tzinfo=None)
+    age_days = (datetime.utcnow() - pub).days
+    return max(0.0, 1.0 - (age_days / 30.0)) * 2.0
+
+
+def user_topic_boost(item: Dict, category: str, user_topics: List[str]) -> float:
+    if not user_topics:
+        return 0.0
+    boost = 0.0
+    if category.lower() in {t.strip().lower() for t in user_topics if t}:
+        boost += USER_CATEGORY_BOOST
+    boost += USER_TOPIC_BOOST * len(topic_matcher(tuple(user_topics)).match(_item_text(item)))
+    return boost
+
+
+# ----------------------------
+# Detect Category
+# ----------------------------
+def detect_category(item):
+    return KEYWORD_MATCHER.analyze(_item_text(item))[0]
 
 
 # ----------------------------
@@ -48,29 +181,18 @@ def detect_category(item):
 # ----------------------------
 def compute_simple_score(item: Dict, user_topics: List[str] = None) -> float:
 
-    # auto-category detection
-    item["category"] = detect_category(item)
-
-    text = (item.get("title", "") + " " + item.get("content", "")).lower()
-    score = 0.0
+    # auto-category detection + keyword scoring in one pass
+    category, hits = KEYWORD_MATCHER.analyze(_item_text(item))
+    item["category"] = category
 
     # category keyword scoring
-    for cat, kw_list in CATEGORY_KEYWORDS.items():
-        for kw in kw_list:
-            if kw in text:
-                score += 1.0
+    score = float(hits)
 
     # recency boost
-    pub = item.get("published")
-    if pub:
-        try:
-            if hasattr(pub, "tzinfo") and pub.tzinfo:
-                pub = pub.replace(tzinfo=None)
-            age_days = (datetime.utcnow() - pub).days
-            recency_factor = max(0.0, 1.0 - (age_days / 30.0))
-            score += recency_factor * 2.0
-        except:
-            pass
+    score += recency_boost(item.get("published"))
+
+    # user preference boost
+    score += user_topic_boost(item, category, user_topics)
 
     return round(score, 3)
 
@@ -78,9 +200,20 @@ def compute_simple_score(item: Dict, user_topics: List[str] = None) -> float:
 # ----------------------------
 # Main Scoring Function
 # ----------------------------
-def run_scoring(items: List[Dict], user_topics: List[str] = None) -> List[Dict]:
+@timed("scoring")
+def run_scoring(items: List[Dict], user_topics: List[str] = None, top_k: int = None) -> List[Dict]:
+    """
+    Scores + categorizes items in place and returns them best-first
+    (only the best top_k when given). Large pools go through the
+    vectorized NumPy/SciPy path when it is installed.
+    """
+    if len(items) >= BATCH_SCORING_MIN_ITEMS:
+        from modules.batch_scoring import batch_scoring_available, score_batch
+        if batch_scoring_available():
+            return score_batch(items, user_topics, top_k)
+
     for it in items:
         it["score"] = compute_simple_score(it, user_topics)
 
     items.sort(key=lambda x: x.get("score", 0), reverse=True)
-    return items
+    return items[:top_k] if top_k else items
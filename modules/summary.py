@@ -1,31 +1,125 @@
 # modules/summary.py
 
-from modules.utils import get_llm
+import os
+import re
+import json
+import math
+import threading
+from functools import lru_cache
+from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
 
-def summarize_article(title, content, tone="professional", length="short"):
+from modules.cache import SQLiteCache, content_hash
+from modules.compress import compress_text
+from modules.metrics import timed
+from modules.utils import get_llm, invoke_with_limits, DEFAULT_MODEL, DEFAULT_TEMPERATURE, GEMINI_RPM
+
+# Only this much article text goes into the prompt
+MAX_CONTENT_CHARS = 3000
+
+# Token budget for the article text in a prompt: the most informative
+# sentences are picked to fit (see modules/compress.py). 0 = send the
+# first MAX_CONTENT_CHARS characters instead.
+CONTENT_TOKEN_BUDGET = int(os.getenv("CONTENT_TOKEN_BUDGET", 350))
+
+# Summary cache settings
+SUMMARY_CACHE_TTL = float(os.getenv("SUMMARY_CACHE_TTL", 7 * 24 * 3600))
+SUMMARY_CACHE_MAX_BYTES = int(os.getenv("SUMMARY_CACHE_MAX_BYTES", 20_000_000))
+
+# Batch mode: rough chars-per-token ratio and prompt budget
+CHARS_PER_TOKEN = 4
+BATCH_TOKEN_BUDGET = 6000
+MAX_BATCH_SIZE = 8
+
+# Concurrent LLM requests in summarize_articles and the streaming
+# pipeline. Requests in flight = rate x latency, so filling GEMINI_RPM
+# takes RPM / 60 * seconds-per-request workers (8 at the default 60 RPM);
+# extra workers would only wait in the rate limiter.
+LLM_LATENCY_ESTIMATE = 8.0      # seconds per summary request, conservative
+MAX_SUMMARY_WORKERS = 16
+
+
+def default_summary_workers(rpm: int = GEMINI_RPM) -> int:
+    if rpm <= 0:
+        return MAX_SUMMARY_WORKERS
+    return max(1, min(MAX_SUMMARY_WORKERS, math.ceil(rpm / 60 * LLM_LATENCY_ESTIMATE)))
+
+
+SUMMARY_WORKERS = int(os.getenv("SUMMARY_WORKERS", 0)) or default_summary_workers()
+
+LENGTH_MAP = {
+    "short": "Write 3 bullet points.",
+    "medium": "Write 5 concise bullet points.",
+    "long": "Write 7 detailed bullet points."
+}
+
+
+# ----------------------------------------------------
+# Summary cache
+# ----------------------------------------------------
+_summary_cache = None
+_summary_cache_lock = threading.Lock()
+
+
+def get_summary_cache() -> SQLiteCache:
     """
-    Direct Gemini summarization without LangChain.
-    Avoids all 'models' attribute errors.
+    Shared on-disk cache of LLM summaries, created on first use.
     """
+    global _summary_cache
+    with _summary_cache_lock:
+        if _summary_cache is None:
+            _summary_cache = SQLiteCache(
+                "summary_cache.sqlite3",
+                ttl=SUMMARY_CACHE_TTL,
+                max_bytes=SUMMARY_CACHE_MAX_BYTES
+            )
+        return _summary_cache
+
 
-    llm = get_llm()
+def summary_cache_stats() -> dict:
+    return get_summary_cache().stats()
 
-    length_map = {
-        "short": "Write 3 bullet points.",
-        "medium": "Write 5 concise bullet points.",
-        "long": "Write 7 detailed bullet points."
-    }
 
-    prompt = f"""
+@lru_cache(maxsize=512)
+def prompt_content(content: str, title: str = "") -> str:
+    """
+    The part of an article's text that goes into a prompt.
+    """
+    content = content or ""
+    if CONTENT_TOKEN_BUDGET > 0:
+        return compress_text(content, CONTENT_TOKEN_BUDGET, title=title)
+    return content[:MAX_CONTENT_CHARS]
+
+
+def summary_cache_key(title, content, tone, length, model, temperature) -> str:
+    """
+    Everything that changes the prompt or the model output:
+    hash of the prompt text, tone, length, model name, temperature.
+    """
+    text_hash = content_hash(f"{title}\n{prompt_content(content or '', title or '')}")
+    return content_hash(json.dumps([text_hash, tone, length, model, temperature]))
+
+
+def _llm_key_parts(llm):
+    if llm is None:
+        return DEFAULT_MODEL, DEFAULT_TEMPERATURE
+    return (
+        getattr(llm, "model_name", DEFAULT_MODEL),
+        getattr(llm, "temperature", DEFAULT_TEMPERATURE)
+    )
+
+
+def build_prompt(title, content, tone="professional", length="short"):
+    return f"""
 You are an expert newsletter writer.
 
 Write a summary in a {tone} tone.
-{length_map.get(length, "Write 3 bullet points.")}
+{LENGTH_MAP.get(length, "Write 3 bullet points.")}
 
 Title: {title}
 
 Content:
-{content[:3000]}
+{prompt_content(content or "", title or "")}
 
 Format:
 - Bullet points ONLY
@@ -33,4 +127,202 @@ Format:
 - No conclusion
 """
 
-    return llm.invoke(prompt)
\ No newline at end of file
+
+@timed("summarize_item")
+def summarize_article(title, content, tone="professional", length="short", llm=None, use_cache=True):
+    """
+    Direct Gemini summarization without LangChain.
+    Avoids all 'models' attribute errors.
+
+    Summaries are cached by (content hash, tone, length, model,
+    temperature), so repeated runs over the same article cost
+    no LLM call.
+    """
+    key = summary_cache_key(title, content, tone, length, *_llm_key_parts(llm))
+    if use_cache:
+        cached = get_summary_cache().get(key)
+        if cached is not None:
+            return cached
+
+    llm = llm or get_llm()
+    summary = invoke_with_limits(llm, build_prompt(title, content, tone, length))
+
+    if use_cache and summary:
+        get_summary_cache().set(key, summary)
+
+    return summary
+
+
+# ----------------------------------------------------
+# Batch summarization (several articles, one LLM call)
+# ----------------------------------------------------
+BATCH_HEADER_RE = re.compile(r"^\s*=+\s*ARTICLE\s+(\d+)\s*=+\s*$", re.IGNORECASE | re.MULTILINE)
+BULLET_RE = re.compile(r"^\s*[-*\u2022]\s+\S", re.MULTILINE)
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def plan_batches(articles: List[Dict], token_budget: int = BATCH_TOKEN_BUDGET,
+                 max_batch_size: int = MAX_BATCH_SIZE) -> List[List[int]]:
+    """
+    Greedily groups article indexes so each batch prompt stays
+    within token_budget (estimated from the prompt text).
+    """
+    batches, current, used = [], [], 0
+
+    for i, art in enumerate(articles):
+        cost = estimate_tokens(
+            f"{art.get('title', '')}\n{prompt_content(art.get('content') or '', art.get('title') or '')}"
+        ) + 20  # per-article delimiters
+
+        if current and (used + cost > token_budget or len(current) >= max_batch_size):
+            batches.append(current)
+            current, used = [], 0
+
+        current.append(i)
+        used += cost
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def build_batch_prompt(articles: List[Dict], tone="professional", length="short"):
+    sections = "\n".join(
+        f"""
+### ARTICLE {n} ###
+Title: {art.get("title", "")}
+
+Content:
+{prompt_content(art.get("content") or "", art.get("title") or "")}
+"""
+        for n, art in enumerate(articles, start=1)
+    )
+
+    return f"""
+You are an expert newsletter writer.
+
+Summarize each of the {len(articles)} articles below separately.
+Write each summary in a {tone} tone.
+{LENGTH_MAP.get(length, "Write 3 bullet points.")}
+
+{sections}
+
+Format:
+- For every article, first a line "=== ARTICLE <number> ===" (same numbers as above)
+- Then that article's bullet points ONLY
+- No intro text
+- No conclusion
+"""
+
+
+def parse_batch_response(text: str, count: int) -> Dict[int, str]:
+    """
+    Splits a batch response into {article_index: bullets}.
+    Sections that are missing, duplicated or contain no bullet
+    points are left out so the caller can retry them one by one.
+    """
+    parts = BATCH_HEADER_RE.split(text or "")
+    found: Dict[int, str] = {}
+    duplicated = set()
+
+    # parts = [preamble, num, body, num, body, ...]
+    for num, body in zip(parts[1::2], parts[2::2]):
+        idx = int(num) - 1
+        body = body.strip()
+        if not 0 <= idx < count or not BULLET_RE.search(body):
+            continue
+        if idx in found:
+            duplicated.add(idx)
+        found[idx] = body
+
+    for idx in duplicated:
+        found.pop(idx, None)
+    return found
+
+
+@timed("llm_request")
+def summarize_batch(articles: List[Dict], tone="professional", length="short", llm=None, use_cache=True) -> List[str]:
+    """
+    Summarizes several articles with one LLM call (does not read
+    the cache, only fills it). Articles whose section can't be
+    parsed fall back to summarize_article().
+    """
+    llm = llm or get_llm()
+    model, temperature = _llm_key_parts(llm)
+
+    if len(articles) == 1:
+        art = articles[0]
+        title, content = art.get("title", ""), art.get("content") or ""
+        summary = invoke_with_limits(llm, build_prompt(title, content, tone, length))
+        if use_cache and summary:
+            get_summary_cache().set(summary_cache_key(title, content, tone, length, model, temperature), summary)
+        return [summary]
+
+    try:
+        response = invoke_with_limits(llm, build_batch_prompt(articles, tone, length))
+    except Exception as e:
+        print(f"Batch summarization failed ({len(articles)} articles), retrying one by one:", e)
+        response = ""
+
+    parsed = parse_batch_response(response, len(articles))
+    results = []
+
+    for i, art in enumerate(articles):
+        title, content = art.get("title", ""), art.get("content") or ""
+
+        if i in parsed:
+            summary = parsed[i]
+            if use_cache:
+                key = summary_cache_key(title, content, tone, length, model, temperature)
+                get_summary_cache().set(key, summary)
+        else:
+            summary = summarize_article(title, content, tone, length, llm, use_cache)
+
+        results.append(summary)
+
+    return results
+
+
+@timed("summarize")
+def summarize_articles(articles: List[Dict], tone="professional", length="short", llm=None,
+                       batch=False, token_budget: int = BATCH_TOKEN_BUDGET, use_cache=True,
+                       max_workers: int = SUMMARY_WORKERS) -> List[str]:
+    """
+    Summaries for a list of articles, in the same order.
+    Cached summaries are reused; with batch=True the rest are packed
+    into as few LLM calls as token_budget allows. Requests run on up
+    to max_workers threads sharing one client and the rate limiter.
+    """
+    results: List[str] = [None] * len(articles)
+    pending: List[int] = []
+    key_parts = _llm_key_parts(llm)
+
+    for i, art in enumerate(articles):
+        cached = None
+        if use_cache:
+            key = summary_cache_key(art.get("title", ""), art.get("content") or "", tone, length, *key_parts)
+            cached = get_summary_cache().get(key)
+        if cached is not None:
+            results[i] = cached
+        else:
+            pending.append(i)
+
+    if not pending:
+        return results
+
+    llm = llm or get_llm()
+    todo = [articles[i] for i in pending]
+    groups = plan_batches(todo, token_budget) if batch else [[j] for j in range(len(todo))]
+
+    def run(group):
+        return summarize_batch([todo[j] for j in group], tone, length, llm, use_cache)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(groups)))) as pool:
+        for group, summaries in zip(groups, pool.map(run, groups)):
+            for j, summary in zip(group, summaries):
+                results[pending[j]] = summary
+
+    return results
@@ -1,27 +1,63 @@
 # modules/utils.py
 
 import os
+import time
+import random
+import threading
 from dotenv import load_dotenv
 load_dotenv()
 
-import google.generativeai as genai
+from modules.metrics import METRICS
 
-# Load API Key
-API_KEY = os.getenv("GEMINI_API_KEY")
 
-if not API_KEY:
-    print("⚠️ Warning: GEMINI_API_KEY missing in .env")
+DEFAULT_MODEL = "gemini-2.5-flash"
+DEFAULT_TEMPERATURE = 0.4
 
-# Configure Gemini
-genai.configure(api_key=API_KEY)
+# Gemini quota (0 disables a limit)
+GEMINI_RPM = int(os.getenv("GEMINI_RPM", 60))
+GEMINI_TPM = int(os.getenv("GEMINI_TPM", 250_000))
+
+# Retry policy for 429 / 5xx
+MAX_RETRIES = 4
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+# ----------------------------------------------------
+# Gemini SDK, imported and configured on first use
+# ----------------------------------------------------
+# google.generativeai takes ~1s to import; cache hits, rendering and
+# the UI's first paint shouldn't pay for it.
+_genai = None
+_genai_lock = threading.Lock()
+
+
+def get_genai():
+    """
+    The google.generativeai module, configured with GEMINI_API_KEY.
+    """
+    global _genai
+    with _genai_lock:
+        if _genai is None:
+            api_key = os.getenv("GEMINI_API_KEY")
+
+            if not api_key:
+                print("⚠️ Warning: GEMINI_API_KEY missing in .env")
+
+            import google.generativeai as genai
+            genai.configure(api_key=api_key)
+            _genai = genai
+        return _genai
 
 
 # ----------------------------------------------------
 # Custom LLM Wrapper (replaces broken ChatGoogleGenerativeAI)
 # ----------------------------------------------------
 class GeminiWrapper:
-    def __init__(self, model="gemini-2.5-flash", temperature=0.4):
-        self.model = genai.GenerativeModel(model)
+    def __init__(self, model=DEFAULT_MODEL, temperature=DEFAULT_TEMPERATURE):
+        self.model_name = model
+        self.model = get_genai().GenerativeModel(model)
         self.temperature = temperature
 
     def invoke(self, prompt: str) -> str:
@@ -36,8 +72,109 @@ class GeminiWrapper:
         return response.text.strip() if response.text else ""
 
 
+# ----------------------------------------------------
+# Token-bucket rate limiter (requests + tokens per minute)
+# ----------------------------------------------------
+class RateLimiter:
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.rpm = requests_per_minute
+        self.tpm = tokens_per_minute
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._last
+        self._last = now
+        if self.rpm:
+            self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60.0)
+        if self.tpm:
+            self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60.0)
+
+    def acquire(self, tokens: int = 1):
+        """
+        Blocks until one request and `tokens` tokens are available.
+        """
+        if self.tpm:
+            tokens = min(tokens, self.tpm)
+
+        while True:
+            with self._lock:
+                self._refill()
+                need_req = 1 - self._requests if self.rpm else 0
+                need_tok = tokens - self._tokens if self.tpm else 0
+
+                if need_req <= 0 and need_tok <= 0:
+                    if self.rpm:
+                        self._requests -= 1
+                    if self.tpm:
+                        self._tokens -= tokens
+                    return
+
+                wait = max(
+                    need_req * 60.0 / self.rpm if self.rpm else 0,
+                    need_tok * 60.0 / self.tpm if self.tpm else 0,
+                    0.01
+                )
+            time.sleep(wait)
+
+
+RATE_LIMITER = RateLimiter(GEMINI_RPM, GEMINI_TPM)
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    True for rate-limit (429) and server (5xx) errors.
+    google.api_core exceptions carry the HTTP status in `.code`.
+    """
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    try:
+        return int(code) in RETRYABLE_STATUS
+    except (TypeError, ValueError):
+        return False
+
+
+def invoke_with_limits(llm, prompt: str, tokens: int = None, limiter: RateLimiter = None) -> str:
+    """
+    llm.invoke(prompt) behind the shared rate limiter, retried with
+    exponential backoff + full jitter on 429 / 5xx.
+    """
+    limiter = limiter or RATE_LIMITER
+    tokens = tokens or len(prompt) // 4 + 1
+
+    for attempt in range(MAX_RETRIES + 1):
+        limiter.acquire(tokens)
+        METRICS.inc("llm_requests_total")
+        METRICS.inc("llm_prompt_tokens_total", tokens)
+        try:
+            result = llm.invoke(prompt)
+            METRICS.inc("llm_completion_tokens_total", len(result or "") // 4)
+            return result
+        except Exception as e:
+            if attempt == MAX_RETRIES or not is_retryable(e):
+                METRICS.inc("errors_total", stage="llm")
+                raise
+            METRICS.inc("llm_retries_total")
+            delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+            print(f"LLM call failed ({e}); retry {attempt + 1}/{MAX_RETRIES} in {delay:.1f}s")
+            time.sleep(delay)
+
+
 # ----------------------------------------------------
 # Public function used by summary.py
 # ----------------------------------------------------
+_llm = None
+_llm_lock = threading.Lock()
+
+
 def get_llm():
-    return GeminiWrapper()
+    """
+    One shared GeminiWrapper (and GenerativeModel) per process.
+    """
+    global _llm
+    with _llm_lock:
+        if _llm is None:
+            _llm = GeminiWrapper()
+        return _llm
@@ -1,8 +1,21 @@
 # modules/web_scraper.py
 
-import requests
-from bs4 import BeautifulSoup
-from typing import Optional
+import os
+import time
+import threading
+from html.parser import HTMLParser
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from modules.cache import SQLiteCache
+from modules.http_client import open_stream, iter_text, read_body, header_encoding, sniff_encoding
+from modules.metrics import METRICS, timed
+from modules.parse_pool import get_parse_pool, run_parse
+
+# bs4 is only needed by the "soup" extractor; imported on first use
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
 
 # Strong realistic headers to avoid blocking
 HEADERS = {
@@ -15,15 +28,91 @@ HEADERS = {
     "Accept": "text/html,application/xhtml+xml"
 }
 
+# Concurrency limits for the scrape stage
+MAX_WORKERS = 8          # total requests in flight
+MAX_PER_HOST = 2         # requests in flight against one site
+SCRAPE_DEADLINE = 30.0   # seconds for the whole stage
+
+# Scrape cache settings
+SCRAPE_CACHE_TTL = float(os.getenv("SCRAPE_CACHE_TTL", 6 * 3600))
+SCRAPE_CACHE_MAX_BYTES = int(os.getenv("SCRAPE_CACHE_MAX_BYTES", 50_000_000))
+
+# Extracted text limits
+MAX_TEXT_CHARS = 5000    # keeps the Gemini prompt small
+MIN_TEXT_CHARS = 80      # less than this is not an article
+
+# "fast" = streaming HTMLParser extractor, "soup" = full BeautifulSoup tree
+EXTRACTOR = os.getenv("SCRAPER_EXTRACTOR", "fast")
+
+# Tags whose text is never article content
+NOISE_TAGS = ["script", "style", "nav", "footer", "header", "aside", "noscript"]
+
+# Known article containers, in priority order
+CONTAINER_SELECTORS = [
+    "#content", ".post-content", ".article-body",
+    ".entry-content", "#main-content", ".story-content"
+]
+
+# Query params that never change the page content
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "cmpid"}
+
+
+# ----------------------------------------------------------
+# SCRAPE CACHE
+# ----------------------------------------------------------
+_scrape_cache = None
+_scrape_cache_lock = threading.Lock()
+
+
+def get_scrape_cache() -> SQLiteCache:
+    """
+    Shared on-disk cache of extracted article text, created on first use.
+    """
+    global _scrape_cache
+    with _scrape_cache_lock:
+        if _scrape_cache is None:
+            _scrape_cache = SQLiteCache(
+                "scrape_cache.sqlite3",
+                ttl=SCRAPE_CACHE_TTL,
+                max_bytes=SCRAPE_CACHE_MAX_BYTES
+            )
+        return _scrape_cache
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of an article URL used as the cache key:
+    lowercase scheme/host, no default port, no fragment,
+    no tracking params, sorted query, no trailing slash.
+    """
+    parts = urlparse(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+
+    path = parts.path.rstrip("/") or "/"
+    return urlunparse((scheme, host, path, "", urlencode(query), ""))
+
 
 # ----------------------------------------------------------
 # CLEAN HTML
 # ----------------------------------------------------------
-def clean_soup(soup: BeautifulSoup):
+def clean_soup(soup: "BeautifulSoup"):
     """
     Removes noise from page so extracted text is cleaner.
     """
-    for tag in soup(["script", "style", "nav", "footer", "header", "aside", "noscript"]):
+    for tag in soup(NOISE_TAGS):
         tag.decompose()
     return soup
 
@@ -31,7 +120,7 @@ def clean_soup(soup: BeautifulSoup):
 # ----------------------------------------------------------
 # EXTRACTION LOGIC WITH MULTIPLE STRATEGIES
 # ----------------------------------------------------------
-def extract_text_from_blocks(soup: BeautifulSoup) -> str:
+def extract_text_from_blocks(soup: "BeautifulSoup") -> str:
     """
     Multi-stage extraction:
     1. <article>
@@ -48,12 +137,7 @@ def extract_text_from_blocks(soup: BeautifulSoup) -> str:
             return text
 
     # Strategy 2: common selectors
-    selectors = [
-        "#content", ".post-content", ".article-body",
-        ".entry-content", "#main-content", ".story-content"
-    ]
-
-    for sel in selectors:
+    for sel in CONTAINER_SELECTORS:
         block = soup.select_one(sel)
         if block:
             paras = block.find_all("p")
@@ -67,30 +151,317 @@ def extract_text_from_blocks(soup: BeautifulSoup) -> str:
     return text
 
 
+# ----------------------------------------------------------
+# FAST STREAMING EXTRACTION
+# ----------------------------------------------------------
+class ParagraphCollector(HTMLParser):
+    """
+    Same strategies as extract_text_from_blocks, without building a tree:
+
+    - text inside NOISE_TAGS is skipped
+    - <p> text is collected once into the first <article>, the first
+      element matching each CONTAINER_SELECTORS entry, and "all"
+    - `done` turns True as soon as the <article> strategy has won
+      (article closed with > 200 chars, or enough text for
+      MAX_TEXT_CHARS), so the caller can stop feeding the page
+    """
+
+    def __init__(self, limit: int = MAX_TEXT_CHARS):
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self.done = False
+
+        self.article: List[str] = []
+        self.containers: Dict[str, List[str]] = {sel: [] for sel in CONTAINER_SELECTORS}
+        self.all: List[str] = []
+
+        self._article_size = 0
+        self._skip: Dict[str, int] = {}                 # noise tag -> open count
+        self._article_depth = 0
+        self._article_seen = False
+        self._open_containers: Dict[str, List] = {}     # selector -> [tag, depth]
+        self._matched = set()
+        self._para: Optional[List[str]] = None
+
+    @staticmethod
+    def _selectors_for(attrs) -> List[str]:
+        found = []
+        attrs = dict(attrs)
+        el_id = attrs.get("id") or ""
+        classes = (attrs.get("class") or "").split()
+        for sel in CONTAINER_SELECTORS:
+            if (sel[0] == "#" and el_id == sel[1:]) or (sel[0] == "." and sel[1:] in classes):
+                found.append(sel)
+        return found
+
+    def handle_starttag(self, tag, attrs):
+        if tag in NOISE_TAGS:
+            self._skip[tag] = self._skip.get(tag, 0) + 1
+            return
+        if any(self._skip.values()):
+            return
+
+        if tag == "p":
+            self._end_paragraph()
+            self._para = []
+
+        if tag == "article":
+            if self._article_depth:
+                self._article_depth += 1
+            elif not self._article_seen:
+                self._article_seen = True
+                self._article_depth = 1
+
+        for state in self._open_containers.values():
+            if state[0] == tag:
+                state[1] += 1
+
+        for sel in self._selectors_for(attrs):
+            if sel not in self._matched:
+                self._matched.add(sel)
+                self._open_containers[sel] = [tag, 1]
+
+    def handle_endtag(self, tag):
+        if tag in NOISE_TAGS:
+            if self._skip.get(tag):
+                self._skip[tag] -= 1
+            return
+        if any(self._skip.values()):
+            return
+
+        if tag == "p":
+            self._end_paragraph()
+
+        for sel, state in list(self._open_containers.items()):
+            if state[0] == tag:
+                state[1] -= 1
+                if state[1] == 0:
+                    self._end_paragraph()
+                    del self._open_containers[sel]
+
+        if tag == "article" and self._article_depth:
+            self._article_depth -= 1
+            if self._article_depth == 0:
+                self._end_paragraph()
+                if self._article_size > 200:
+                    self.done = True
+
+    def handle_data(self, data):
+        if self._para is not None and not any(self._skip.values()):
+            self._para.append(data)
+
+    def _end_paragraph(self):
+        if self._para is None:
+            return
+        text = " ".join("".join(self._para).split())
+        self._para = None
+        if not text:
+            return
+
+        self.all.append(text)
+        for sel in self._open_containers:
+            self.containers[sel].append(text)
+        if self._article_depth:
+            self.article.append(text)
+            self._article_size += len(text) + 2
+            if self._article_size >= self.limit:
+                self.done = True
+
+    def result(self) -> str:
+        self._end_paragraph()
+
+        text = "\n\n".join(self.article)
+        if len(text) > 200:
+            return text
+
+        for sel in CONTAINER_SELECTORS:
+            text = "\n\n".join(self.containers[sel])
+            if len(text) > 200:
+                return text
+
+        return "\n\n".join(self.all)
+
+
+def extract_article_text(html: str, chunk_size: int = 32_768) -> str:
+    """
+    Readable article text from raw HTML ("" when there is too little).
+    """
+    return extract_from_chunks(html[i:i + chunk_size] for i in range(0, len(html), chunk_size))
+
+
+def extract_from_chunks(chunks: Iterable[str]) -> str:
+    """
+    Feeds HTML chunks (e.g. straight off the network) to the extractor
+    and stops pulling more once the result is decided.
+    """
+    if EXTRACTOR == "soup":
+        return extract_article_text_soup("".join(chunks))
+
+    collector = ParagraphCollector()
+    for chunk in chunks:
+        collector.feed(chunk)
+        if collector.done:
+            break
+
+    return _finish_text(collector.result())
+
+
+def extract_article_bytes(body: bytes, encoding: str = None) -> str:
+    """
+    extract_article_text for a raw body (parse pool entry point).
+    Decodes with `encoding`, else a BOM / <meta charset>, else UTF-8.
+    """
+    encoding = encoding or sniff_encoding(body) or "utf-8"
+    return extract_article_text(body.decode(encoding, errors="replace"))
+
+
+def extract_article_text_soup(html: str) -> str:
+    """
+    Original full-tree path (BeautifulSoup + html.parser).
+    """
+    from bs4 import BeautifulSoup
+    soup = clean_soup(BeautifulSoup(html, "html.parser"))
+    return _finish_text(extract_text_from_blocks(soup))
+
+
+def _finish_text(text: str) -> str:
+    if not text or len(text) < MIN_TEXT_CHARS:
+        return ""
+    return text[:MAX_TEXT_CHARS]
+
+
 # ----------------------------------------------------------
 # MAIN SCRAPER FUNCTION
 # ----------------------------------------------------------
-def fetch_article_text(url: str, timeout: int = 12) -> Optional[str]:
+@timed("scrape")
+def fetch_article_text(url: str, timeout: int = 12, use_cache: bool = True) -> Optional[str]:
     """
     Fetches and extracts clean readable article text.
+
+    Results are cached by normalized URL (see get_scrape_cache);
+    pages that load but have no usable text are cached as "" so
+    they are not fetched again until the entry expires.
     """
+    key = normalize_url(url)
+    if use_cache:
+        cached = get_scrape_cache().get(key)
+        if cached is not None:
+            return cached or None
+
     try:
-        r = requests.get(url, headers=HEADERS, timeout=timeout)
-        r.raise_for_status()
+        with open_stream(url, headers=HEADERS, timeout=timeout) as r:
+            r.raise_for_status()
 
-        # Handle weird encodings safely
-        r.encoding = r.apparent_encoding or "utf-8"
+            if get_parse_pool() is not None:
+                # Parse in a worker process: ship the capped raw body,
+                # get back only the text
+                body, _ = read_body(r)
+                extracted = run_parse(extract_article_bytes, body, header_encoding(r.headers))
+            else:
+                # Streamed + capped body; decoding uses the header / meta
+                # charset, and we stop downloading once the extractor has
+                # enough text
+                extracted = extract_from_chunks(iter_text(r))
 
-        soup = BeautifulSoup(r.text, "html.parser")
-        soup = clean_soup(soup)
+        if use_cache:
+            get_scrape_cache().set(key, extracted)
 
-        extracted = extract_text_from_blocks(soup)
-        if not extracted or len(extracted) < 80:
-            return None
-
-        # Limit to avoid bloating Gemini prompt
-        return extracted[:5000]
+        return extracted or None
 
     except Exception as e:
+        METRICS.inc("errors_total", stage="scrape")
         print(f"Scrape failed: {url}", e)
         return None
+
+
+# ----------------------------------------------------------
+# CONCURRENT SCRAPING
+# ----------------------------------------------------------
+class HostLimiter:
+    """
+    Caps how many requests run against the same host at once.
+    """
+
+    def __init__(self, per_host: int = MAX_PER_HOST):
+        self.per_host = per_host
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self._slots[host]
+
+
+def _interleave_by_host(urls: List[str]) -> List[str]:
+    """
+    Orders URLs round-robin across hosts so workers are not all
+    parked on the same per-host limit at once.
+    """
+    by_host: Dict[str, List[str]] = {}
+    for url in urls:
+        by_host.setdefault(urlparse(url).netloc, []).append(url)
+
+    ordered = []
+    queues = list(by_host.values())
+    while queues:
+        for q in queues:
+            ordered.append(q.pop(0))
+        queues = [q for q in queues if q]
+    return ordered
+
+
+@timed("scrape_all")
+def fetch_many_article_texts(
+    urls: List[str],
+    max_workers: int = MAX_WORKERS,
+    per_host: int = MAX_PER_HOST,
+    deadline: float = SCRAPE_DEADLINE,
+    timeout: int = 12,
+    use_cache: bool = True
+) -> Dict[str, Optional[str]]:
+    """
+    Scrapes many URLs concurrently and returns {url: text or None}.
+
+    - max_workers caps the total number of requests in flight
+    - per_host caps requests against a single host
+    - deadline bounds the whole stage; URLs still pending when it
+      expires map to None so the caller can fall back to RSS text
+    """
+    unique = _interleave_by_host(list(dict.fromkeys(u for u in urls if u)))
+    results: Dict[str, Optional[str]] = {u: None for u in unique}
+    if not unique:
+        return results
+
+    started = time.monotonic()
+    hosts = HostLimiter(per_host)
+
+    def worker(url: str) -> Optional[str]:
+        slot = hosts.slot(url)
+        remaining = deadline - (time.monotonic() - started)
+        if remaining <= 0 or not slot.acquire(timeout=remaining):
+            return None
+        try:
+            remaining = deadline - (time.monotonic() - started)
+            if remaining <= 0:
+                return None
+            return fetch_article_text(url, timeout=min(timeout, remaining), use_cache=use_cache)
+        finally:
+            slot.release()
+
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    futures = {pool.submit(worker, u): u for u in unique}
+    done, pending = wait(futures, timeout=deadline)
+
+    for fut in done:
+        results[futures[fut]] = fut.result()
+
+    if pending:
+        METRICS.inc("scrape_deadline_fallbacks_total", len(pending))
+        print(f"Scrape deadline reached: {len(pending)} article(s) fall back to RSS text")
+
+    # Don't block on stragglers; they finish in the background
+    pool.shutdown(wait=False, cancel_futures=True)
+    return results
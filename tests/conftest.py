@@ -0,0 +1,13 @@
+# tests/conftest.py
+"""
+Runs the tests offline: a throwaway cache folder, no rate limiter and
+no NewsAPI key. Set before any modules.* import reads them.
+"""
+
+import os
+import tempfile
+
+os.environ["NEWSLETTER_CACHE_DIR"] = tempfile.mkdtemp(prefix="newsletter-test-")
+os.environ["GEMINI_RPM"] = "0"
+os.environ["GEMINI_TPM"] = "0"
+os.environ["NEWSAPI_KEY"] = ""
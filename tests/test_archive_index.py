@@ -0,0 +1,78 @@
+# tests/test_archive_index.py
+"""
+ArchiveIndex.covered(), the shared get_archive() and covered-story
+filtering in incremental runs.
+"""
+
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from modules import archive_index, incremental
+from modules.archive_index import ArchiveIndex, get_archive
+from modules.article_store import ArticleStore
+
+
+def article(n: int, title: str) -> dict:
+    return {
+        "title": title,
+        "link": f"https://example.com/story/{n}",
+        "content": f"{title}. More text about it.",
+        "published": datetime.utcnow(),
+        "score": float(n),
+        "category": "Tech",
+    }
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return ArchiveIndex(str(tmp_path / "archive.sqlite3"))
+
+
+def test_covered_by_link_or_similar_title(archive):
+    archive.add_newsletter([article(1, "Chipmaker unveils faster processor for laptops")])
+
+    assert archive.covered(article(1, "Different headline entirely"), days=7)
+    # Same story re-posted under another URL
+    assert archive.covered(article(2, "Chipmaker unveils faster processor for laptops today"), days=7)
+    assert not archive.covered(article(3, "Regional bank reports quarterly earnings"), days=7)
+    assert not archive.covered(article(1, "Anything"), days=0)
+
+
+def test_get_archive_disabled_without_fts5(monkeypatch):
+    def no_fts5(*args, **kwargs):
+        raise sqlite3.OperationalError("no such module: fts5")
+
+    monkeypatch.setattr(archive_index, "_archive", None)
+    monkeypatch.setattr(archive_index, "_archive_failed", False)
+    monkeypatch.setattr(archive_index, "ArchiveIndex", no_fts5)
+
+    assert get_archive() is None
+    assert get_archive() is None
+
+
+def test_get_archive_is_shared(monkeypatch):
+    monkeypatch.setattr(archive_index, "_archive", None)
+    monkeypatch.setattr(archive_index, "_archive_failed", False)
+    assert get_archive() is get_archive()
+
+
+def test_incremental_skips_covered_stories(tmp_path, archive, monkeypatch):
+    store = ArticleStore(str(tmp_path / "articles.sqlite3"))
+    old = article(1, "Chipmaker unveils faster processor for laptops")
+    new = article(2, "Regional bank reports quarterly earnings")
+    store.upsert([old, new])
+    archive.add_newsletter([old])
+
+    rendered = []
+    monkeypatch.setattr(incremental, "refresh_store", lambda *args, **kwargs: [])
+    monkeypatch.setattr(incremental, "generate_newsletter",
+                        lambda pool, **kwargs: rendered.append(pool) or "<html/>")
+
+    incremental.generate_incremental(store=store, archive=archive, covered_days=7)
+    assert [a["link"] for a in rendered[-1]] == [new["link"]]
+
+    # Without an archive nothing is filtered
+    incremental.generate_incremental(store=store)
+    assert len(rendered[-1]) == 2
@@ -0,0 +1,44 @@
+# tests/test_fanout.py
+"""
+Fan-out segment names: every segment gets its own newsletter.
+"""
+
+import pytest
+
+from benchmarks.fake_llm import FakeGeminiWrapper
+from modules.fanout import generate_fanout, normalize_segments, segment_slug
+
+
+def items():
+    return [
+        {"title": f"Story {i}", "link": f"https://example.com/{i}", "content": f"Text {i}.",
+         "category": "AI" if i % 2 else "Tech", "score": float(i)}
+        for i in range(6)
+    ]
+
+
+@pytest.mark.parametrize("names", [
+    ["ai", "ai"],
+    ["ai news", "ai/news"],     # same file name after segment_slug
+    ["AI", "ai"],               # same file on case-insensitive file systems
+])
+def test_clashing_segment_names_are_rejected(names):
+    with pytest.raises(ValueError, match="clash"):
+        normalize_segments([{"name": n} for n in names])
+    with pytest.raises(ValueError):
+        generate_fanout([{"name": n} for n in names], items=items(), llm=FakeGeminiWrapper(latency=0))
+
+
+def test_unnamed_segments_get_distinct_names():
+    segments = normalize_segments([{}, {"tone": "casual"}, {"name": "ai news"}])
+    assert [s["name"] for s in segments] == ["segment-1", "segment-2", "ai news"]
+    assert segment_slug("ai news") == "ai_news"
+
+
+def test_one_newsletter_per_segment():
+    segments = [{"name": "ai", "categories": ["AI"]}, {"name": "tech", "categories": ["Tech"]}]
+    outputs = generate_fanout(segments, items=items(), llm=FakeGeminiWrapper(latency=0), render_workers=1)
+
+    assert list(outputs) == ["ai", "tech"]
+    assert "Story 5" in outputs["ai"] and "Story 5" not in outputs["tech"]
+    assert "Story 4" in outputs["tech"] and "Story 4" not in outputs["ai"]
@@ -0,0 +1,87 @@
+# tests/test_feed_state.py
+"""
+Seen-entry tracking and conditional requests against ETag-serving stub
+feeds: entries a run doesn't use must come back on the next run.
+"""
+
+import random
+
+import pytest
+
+from benchmarks.corpus import make_feed
+from benchmarks.stub_server import base_url, start_servers, stop_servers
+from modules.article_store import ArticleStore
+from modules.curate import curate_articles
+from modules.feed_state import FeedStateStore
+from modules.incremental import refresh_store
+from modules.rss_ingest import fetch_multiple_feeds
+
+PAGE = b"<html><body><article><p>Stub article text for the feed tests.</p></article></body></html>"
+
+
+@pytest.fixture
+def feeds():
+    xml = {name: make_feed(random.Random(n), n, 8) for n, name in enumerate("ab")}
+    servers = start_servers(1, 0, [PAGE], xml, etags=True)
+    yield [f"{base_url(servers[0])}/feed/{name}" for name in xml]
+    stop_servers(servers)
+
+
+def run(feeds, path, max_items=5):
+    # A fresh store per run, like separate processes
+    state = FeedStateStore(str(path))
+    return curate_articles(feeds, max_items=max_items, feed_state=state, covered_days=0)
+
+
+def test_entries_cut_by_max_items_come_back(feeds, tmp_path):
+    path = tmp_path / "feed_state.json"
+    got = []
+    for _ in range(4):
+        got += [item["entry_id"] for item in run(feeds, path)]
+
+    assert len(got) == len(set(got)) == 16
+
+    # Everything consumed: validators stored, next request is a 304
+    state = FeedStateStore(str(path))
+    assert all(state.conditional_args(f).get("etag") for f in feeds)
+    assert run(feeds, path) == []
+
+
+def test_entries_fetched_but_not_used_come_back(feeds, tmp_path):
+    path = tmp_path / "feed_state.json"
+
+    # A run that fetched, saved state and then crashed before mark_seen
+    state = FeedStateStore(str(path))
+    assert len(fetch_multiple_feeds(feeds, state=state)) == 16
+    assert not any(FeedStateStore(str(path)).conditional_args(f) for f in feeds)
+
+    assert len(run(feeds, path, max_items=16)) == 16
+
+
+def test_pending_entries_drop_conditional_headers(feeds, tmp_path):
+    state = FeedStateStore(str(tmp_path / "feed_state.json"))
+    items = fetch_multiple_feeds(feeds, state=state)
+
+    state.mark_seen(items[:3])
+    assert state.conditional_args(feeds[0]) == {}
+    assert state.conditional_args(feeds[1]) == {}
+
+    state.mark_seen(items)
+    assert state.conditional_args(feeds[0]).get("etag")
+    assert state.conditional_args(feeds[1]).get("etag")
+
+
+def test_incremental_runs_keep_their_own_validators(feeds, tmp_path):
+    store = ArticleStore(str(tmp_path / "articles.sqlite3"))
+    assert len(refresh_store(store, feeds, max_items=16)) == 16
+
+    # only_new runs and the daemon don't get the incremental run's 304s
+    assert not any(FeedStateStore().conditional_args(f) for f in feeds)
+    assert len(curate_articles(feeds, max_items=16, only_new=True, covered_days=0)) == 16
+
+
+def test_incremental_entries_cut_by_max_items_come_back(feeds, tmp_path):
+    store = ArticleStore(str(tmp_path / "articles.sqlite3"))
+    for _ in range(4):
+        refresh_store(store, feeds, max_items=5)
+    assert store.count() == 16
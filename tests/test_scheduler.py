@@ -0,0 +1,42 @@
+# tests/test_scheduler.py
+"""
+FeedScheduler.update_schedule: adaptive polling intervals.
+"""
+
+import pytest
+
+from modules.scheduler import BACKOFF, DEFAULT_INTERVAL, MAX_INTERVAL, TARGET_NEW_PER_POLL, FeedScheduler
+from modules.article_store import ArticleStore
+from modules.feed_state import FeedStateStore
+
+FEED = "https://example.com/feed"
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    return FeedScheduler(
+        feeds=[FEED],
+        store=ArticleStore(str(tmp_path / "articles.sqlite3")),
+        feed_state=FeedStateStore(str(tmp_path / "feed_state.json")),
+        path=str(tmp_path / "schedule.json"),
+        clock=lambda: 0.0,
+        seed=1
+    )
+
+
+def test_empty_first_poll_backs_off_from_current_interval(scheduler):
+    interval = scheduler.update_schedule(FEED, 0, now=1000.0)
+    assert interval == pytest.approx(DEFAULT_INTERVAL * BACKOFF)
+    assert interval < MAX_INTERVAL
+
+
+def test_interval_converges_to_publish_rate(scheduler):
+    # 2 entries / hour -> about TARGET_NEW_PER_POLL / 2 hours per poll,
+    # after a first poll that found nothing new (304)
+    now, interval = 0.0, scheduler.update_schedule(FEED, 0, now=0.0)
+    for _ in range(3):
+        now += interval
+        interval = scheduler.update_schedule(FEED, 2 * interval / 3600, now=now)
+
+    assert interval == pytest.approx(TARGET_NEW_PER_POLL / 2 * 3600, rel=0.05)
+    assert now < 4 * 3600
@@ -0,0 +1,47 @@
+# tests/test_scoring.py
+"""
+KeywordMatcher: word boundaries, plurals, phrases and category order.
+"""
+
+from modules.scoring import CATEGORY_KEYWORDS, KEYWORD_MATCHER, KeywordMatcher, detect_category
+
+
+def test_no_matches_inside_words():
+    assert "ai" not in KEYWORD_MATCHER.match("The chairman said profits were fair.")
+    assert "model" not in KEYWORD_MATCHER.match("They plan to remodel the kitchen.")
+    assert "goal" not in KEYWORD_MATCHER.match("Goalkeepers trained all week.")
+
+
+def test_whole_words_match():
+    assert "ai" in KEYWORD_MATCHER.match("New AI chips ship today.")
+    assert "model" in KEYWORD_MATCHER.match("The model was released.")
+
+
+def test_plural_forms_match():
+    assert "stock" in KEYWORD_MATCHER.match("Stocks fell sharply.")
+    assert "model" in KEYWORD_MATCHER.match("Open models are catching up.")
+    assert "neural network" in KEYWORD_MATCHER.match("Neural networks learn features.")
+
+
+def test_phrases_match_across_punctuation():
+    assert "machine learning" in KEYWORD_MATCHER.match("Machine-learning tools")
+    assert "artificial intelligence" in KEYWORD_MATCHER.match("artificial, intelligence")
+    assert "deep learning" in KEYWORD_MATCHER.match("DEEP\nLEARNING: a primer")
+    # phrase words must be adjacent
+    assert "machine learning" not in KEYWORD_MATCHER.match("machine tools for learning")
+
+
+def test_category_priority_follows_keyword_map_order():
+    # AI is listed before Finance, Tech before Business
+    assert detect_category({"title": "Stock market reacts to AI model", "content": ""}) == "AI"
+    assert detect_category({"title": "Startup funding for software", "content": ""}) == "Tech"
+    assert detect_category({"title": "Merger boosts stock", "content": ""}) == "Finance"
+    assert detect_category({"title": "Vaccine study", "content": ""}) == "Health"
+    assert detect_category({"title": "Weather today", "content": ""}) == "General"
+
+
+def test_categorize_uses_map_order():
+    matcher = KeywordMatcher(CATEGORY_KEYWORDS)
+    assert matcher.categories == list(CATEGORY_KEYWORDS)
+    assert matcher.categorize({"health", "football", "bitcoin"}) == "Finance"
+    assert matcher.categorize(set()) == "General"
@@ -0,0 +1,128 @@
+# tests/test_summary.py
+"""
+summarize_articles / summarize_batch against an offline LLM stand-in.
+"""
+
+import pytest
+
+from benchmarks.fake_llm import FakeGeminiWrapper
+from modules.summary import (
+    default_summary_workers,
+    estimate_tokens,
+    get_summary_cache,
+    plan_batches,
+    summarize_articles,
+    summarize_batch,
+)
+
+
+class ScriptedLLM(FakeGeminiWrapper):
+    """
+    FakeGeminiWrapper that records prompts and answers batch prompts
+    with `batch_reply` when given (single-article prompts keep the
+    normal bullets).
+    """
+
+    def __init__(self, batch_reply: str = None):
+        super().__init__(latency=0)
+        self.batch_reply = batch_reply
+        self.prompts = []
+
+    def invoke(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        reply = super().invoke(prompt)
+        if self.batch_reply is not None and "### ARTICLE" in prompt:
+            return self.batch_reply
+        return reply
+
+
+def make_articles(count: int, words: int = 40):
+    return [
+        {"title": f"Story {i}", "content": " ".join(f"word{i}x{j}" for j in range(words)) + "."}
+        for i in range(count)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    get_summary_cache().clear()
+    yield
+    get_summary_cache().clear()
+
+
+def test_results_in_input_order():
+    articles = make_articles(6)
+    llm = FakeGeminiWrapper(latency=0, jitter=0)
+    single = summarize_articles(articles, llm=llm, use_cache=False)
+    assert len(single) == 6 and all(single)
+
+    llm = FakeGeminiWrapper(latency=0.01, jitter=0.01)
+    batched = summarize_articles(articles, llm=llm, batch=True, token_budget=250,
+                                 use_cache=False, max_workers=4)
+    assert llm.calls > 1
+    # Each batch answers "article n" for its n-th article; order across
+    # batches must match the input
+    for group in plan_batches(articles, 250):
+        for n, idx in enumerate(group, start=1):
+            assert f"article {n}" in batched[idx]
+
+
+@pytest.mark.parametrize("reply", [
+    # section 2 missing
+    "=== ARTICLE 1 ===\n- one\n=== ARTICLE 3 ===\n- three",
+    # section 2 twice
+    "=== ARTICLE 1 ===\n- one\n=== ARTICLE 2 ===\n- two\n=== ARTICLE 2 ===\n- again\n=== ARTICLE 3 ===\n- three",
+    # section 2 without bullets
+    "=== ARTICLE 1 ===\n- one\n=== ARTICLE 2 ===\nno bullets here\n=== ARTICLE 3 ===\n- three",
+])
+def test_bad_section_falls_back_to_single_call(reply):
+    articles = make_articles(3)
+    llm = ScriptedLLM(batch_reply=reply)
+
+    results = summarize_batch(articles, llm=llm, use_cache=False)
+
+    assert results[0] == "- one"
+    assert results[2] == "- three"
+    # One batch call plus one single-article call for the bad section
+    assert len(llm.prompts) == 2
+    assert "### ARTICLE" not in llm.prompts[1]
+    assert "Title: Story 1" in llm.prompts[1]
+    assert results[1].startswith("- Key point about article")
+
+
+def test_batches_split_by_token_budget():
+    articles = make_articles(10, words=60)
+    per_article = estimate_tokens(" ".join(f"word0x{j}" for j in range(60))) + 20
+    budget = per_article * 3
+
+    batches = plan_batches(articles, budget)
+    assert [i for b in batches for i in b] == list(range(10))
+    assert all(len(b) <= 3 for b in batches)
+    assert len(batches) >= 4
+
+    llm = FakeGeminiWrapper(latency=0)
+    summarize_articles(articles, llm=llm, batch=True, token_budget=budget, use_cache=False)
+    assert llm.calls == len(batches)
+
+    # One large budget packs everything up to MAX_BATCH_SIZE
+    assert len(plan_batches(articles[:5], 100_000)) == 1
+
+
+def test_default_workers_follow_rpm_budget():
+    assert default_summary_workers(60) == 8
+    assert default_summary_workers(15) == 2
+    assert default_summary_workers(1) == 1
+    assert default_summary_workers(1000) == 16
+    assert default_summary_workers(0) == 16     # no RPM limit
+
+
+def test_cached_summary_makes_no_call():
+    articles = make_articles(3)
+    llm = FakeGeminiWrapper(latency=0)
+    first = summarize_articles(articles, llm=llm)
+    assert llm.calls == 3
+
+    again = FakeGeminiWrapper(latency=0)
+    assert summarize_articles(articles, llm=again) == first
+    assert summarize_articles(articles, llm=again, batch=True) == first
+    assert again.calls == 0